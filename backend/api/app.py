@@ -2,22 +2,29 @@ import os
 from contextlib import asynccontextmanager
 
 import dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 dotenv.load_dotenv()
 
-from api.routers import auth, conversations, messages
+from api.routers import auth, conversations, entities, messages
+from behavior_tree import TreePool
 from behavior_tree.build_tree import build_tree
-from clients import MilvusHybridEntityStore, get_chat_model
-from nodes import Blackboard
+from clients import (CachedChatModel, LocalHybridEntityStore,
+                     MilvusHybridEntityStore, get_chat_model)
+from logger import file_logger
+from utils import async_db, db, metrics
+from utils.auth import password_hash_pool
+from utils.conversation_summary import (HISTORY_SUMMARY_ENABLED,
+                                        ConversationSummarizer)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize LLM, vector DB, blackboard, and behavior tree; save tree image to artifacts/."""
+    """Initialize LLM, vector DB, and the behavior tree pool; save tree image to artifacts/."""
     import py_trees.display
-    from clients import DenseEmbedder, SparseEmbedder
+    from clients import (CachedDenseEmbedder, CachedSparseEmbedder,
+                         DenseEmbedder, EmbeddingCache, SparseEmbedder)
 
     llm = get_chat_model()
     milvus_url = os.getenv("MILVUS_URL", "http://127.0.0.1:1013")
@@ -25,25 +32,102 @@ async def lifespan(app: FastAPI):
     text_embedding_dim = int(os.getenv("TEXT_EMBEDDING_DIM", "1024"))
     collection_name = os.getenv("COLLECTION_NAME", "entity")
     bm25_path = os.getenv("BM25_JSON_PATH", "../data/embedder/sparse.json")
-
-    dense_embedder = DenseEmbedder(url=text_embedding_url)
-    sparse_embedder = SparseEmbedder().load(bm25_path)
-    vecdb = MilvusHybridEntityStore(
-        uri=milvus_url,
-        collection_name=collection_name,
-        dense_dim=text_embedding_dim,
-        dense_embedder=dense_embedder,
-        sparse_embedder=sparse_embedder,
+    bm25_bin_path = os.getenv("BM25_BIN_PATH", "../data/embedder/sparse.bm25")
+
+    dense_embedder = DenseEmbedder(
+        url=text_embedding_url,
+        batch_window_ms=float(os.getenv("TEXT_EMBEDDING_BATCH_WINDOW_MS", "2")),
+        max_batch_size=int(os.getenv("TEXT_EMBEDDING_MAX_BATCH_SIZE", "32")),
+        max_connections=int(os.getenv("TEXT_EMBEDDING_MAX_CONNECTIONS", "20")),
+        http2=os.getenv("TEXT_EMBEDDING_HTTP2", "false").lower() == "true",
     )
+    # The binary model is memory-mapped (no JSON parse at startup); JSON still works
+    bm25_model_path = bm25_bin_path if os.path.isdir(bm25_bin_path) else bm25_path
+    sparse_embedder = SparseEmbedder.load(bm25_model_path)
+
+    # Repeated queries/entity names skip TEI; EMBEDDING_CACHE_DIR adds a persistent tier
+    cache_size = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+    cache_dir = os.getenv("EMBEDDING_CACHE_DIR", "").strip()
+    embedding_caches = {}
+    if cache_size > 0 or cache_dir:
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        disk = lambda name: os.path.join(cache_dir, name) if cache_dir else None
+        dense_embedder = CachedDenseEmbedder(
+            dense_embedder,
+            EmbeddingCache(cache_size, disk_path=disk("dense.sqlite")),
+            model_id=os.getenv("TEXT_EMBEDDING_MODEL_ID") or None,
+        )
+        sparse_embedder = CachedSparseEmbedder(
+            sparse_embedder,
+            EmbeddingCache.for_sparse(cache_size, disk_path=disk("sparse.sqlite")),
+        )
+        embedding_caches = {
+            "dense": dense_embedder.cache,
+            "sparse": sparse_embedder.cache,
+        }
+
+    # VECTOR_STORE=local: in-process NumPy/CSR index written by seed.py (no Milvus)
+    if os.getenv("VECTOR_STORE", "milvus").lower() == "local":
+        vecdb = LocalHybridEntityStore(
+            dense_dim=text_embedding_dim,
+            dense_embedder=dense_embedder,
+            sparse_embedder=sparse_embedder,
+            path=os.getenv("LOCAL_INDEX_PATH", "../data/embedder/entity_index.npz"),
+            collection_name=collection_name,
+        )
+    else:
+        vecdb = MilvusHybridEntityStore(
+            uri=milvus_url,
+            collection_name=collection_name,
+            dense_dim=text_embedding_dim,
+            dense_embedder=dense_embedder,
+            sparse_embedder=sparse_embedder,
+        )
     vecdb.ensure_collection()
 
-    bb = Blackboard(name="api_bb")
-    tree = build_tree(bb=bb, llm=llm, vecdb=vecdb)
+    # Rolling conversation summaries need conversation.summary / summary_until
+    history_summary = HISTORY_SUMMARY_ENABLED
+    if history_summary:
+        try:
+            db.ensure_summary_columns()
+        except Exception as e:
+            history_summary = False
+            file_logger.warning(
+                f"Conversation summaries disabled, could not add columns: {type(e).__name__}: {e}"
+            )
+
+    # One namespaced blackboard + tree per in-flight request (see behavior_tree/pool.py)
+    speculative = os.getenv("TREE_SPECULATIVE_AMBIGUITY", "false").lower() == "true"
+    tree_pool = TreePool(
+        lambda bb: build_tree(
+            bb=bb,
+            llm=llm,
+            vecdb=vecdb,
+            speculative=speculative,
+            history_summary=history_summary,
+        ),
+        max_size=int(os.getenv("TREE_POOL_SIZE", "64")),
+    )
+    tree = tree_pool.warm_up(1).tree
 
     app.state.llm = llm
+    app.state.llm_cache = llm.cache if isinstance(llm, CachedChatModel) else None
     app.state.vecdb = vecdb
-    app.state.bb = bb
-    app.state.tree = tree
+    app.state.bm25_model_path = bm25_model_path
+    app.state.tree_pool = tree_pool
+    app.state.embedding_caches = embedding_caches
+    # Folds older turns into conversation.summary after each saved turn (None: disabled)
+    app.state.summarizer = ConversationSummarizer(llm) if history_summary else None
+
+    await async_db.init_pool()
+    if os.getenv("DB_ENSURE_INDEXES", "false").lower() == "true":
+        try:
+            if not db.ensure_indexes():
+                file_logger.info("Pagination indexes are being built by another worker")
+        except Exception as e:
+            # Pagination still works without them, only slower on long histories
+            file_logger.warning(f"Could not create pagination indexes: {type(e).__name__}: {e}")
 
     # Save tree to artifacts/
     artifacts_dir = os.path.join(
@@ -67,7 +151,17 @@ async def lifespan(app: FastAPI):
         pass  # graphviz/dot binary may not be installed or available
 
     yield
-    # Shutdown: nothing to tear down
+
+    if app.state.summarizer is not None:
+        await app.state.summarizer.aclose()
+    await dense_embedder.aclose()
+    for cache in embedding_caches.values():
+        cache.close()
+    if app.state.llm_cache is not None:
+        app.state.llm_cache.close()
+    await async_db.close_pool()
+    db.close_pool()
+    password_hash_pool.shutdown()
 
 
 app = FastAPI(title="Kitchen Assistant API", version="0.1.0", lifespan=lifespan)
@@ -78,6 +172,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -86,6 +181,13 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus scrape endpoint (per-node latency/token histograms, turn latency)."""
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 app.include_router(auth.router, prefix="/api")
 app.include_router(conversations.router, prefix="/api")
 app.include_router(messages.router, prefix="/api")
+app.include_router(entities.router, prefix="/api")
@@ -1,9 +1,12 @@
-from typing import Optional
+import hmac
+import os
+from typing import List, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from utils.auth import decode_access_token
-from utils.db import get_user_by_id
+from utils.auth_cache import user_exists
+from utils.db import Cursor, decode_cursor, encode_cursor
 
 security = HTTPBearer(auto_error=False)
 
@@ -24,10 +27,40 @@ def get_current_user_id(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = get_user_by_id(user_id)
-    if not user:
+    if not user_exists(user_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
     return user_id
+
+
+def parse_cursor(value: Optional[str], name: str) -> Optional[Cursor]:
+    """Decode a ``before`` / ``after`` query cursor (400 if it is not one we issued)."""
+    if not value:
+        return None
+    try:
+        return decode_cursor(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid '{name}' cursor"
+        )
+
+
+def set_next_cursor(response: Response, rows: List[dict], limit: int) -> None:
+    """X-Next-Cursor: the page's last row, when the page is full (more rows may follow)."""
+    if rows and len(rows) >= limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Admin endpoints: X-Admin-Key must match ADMIN_API_KEY (disabled when it is unset)."""
+    expected = os.getenv("ADMIN_API_KEY", "")
+    if not expected:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled"
+        )
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin key"
+        )
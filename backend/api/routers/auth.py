@@ -1,24 +1,40 @@
+import asyncio
+
 from api.schemas import (LoginRequest, SignUpRequest, TokenResponse,
                          UserResponse)
 from fastapi import APIRouter, HTTPException, status
-from utils.auth import create_access_token, hash_password, verify_password
+from utils.auth import (PasswordHashPoolBusy, ahash_password,
+                        averify_password, create_access_token)
 from utils.db import create_user, get_user_by_username
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/signup", response_model=TokenResponse)
-def signup(body: SignUpRequest):
+async def signup(body: SignUpRequest):
     """Register a new user. Returns JWT."""
-    existing = get_user_by_username(body.username)
+    existing = await asyncio.to_thread(get_user_by_username, body.username)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
-    user_id = create_user(
+    try:
+        password_hash = await ahash_password(body.password)
+    except PasswordHashPoolBusy:
+        raise _busy()
+    user_id = await asyncio.to_thread(
+        create_user,
         username=body.username,
-        password_hash=hash_password(body.password),
+        password_hash=password_hash,
         email=body.email,
     )
     if not user_id:
@@ -31,10 +47,14 @@ def signup(body: SignUpRequest):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(body: LoginRequest):
+async def login(body: LoginRequest):
     """Authenticate and return JWT."""
-    user = get_user_by_username(body.username)
-    if not user or not verify_password(body.password, user["password_hash"]):
+    user = await asyncio.to_thread(get_user_by_username, body.username)
+    try:
+        ok = bool(user) and await averify_password(body.password, user["password_hash"])
+    except PasswordHashPoolBusy:
+        raise _busy()
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
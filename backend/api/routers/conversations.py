@@ -1,8 +1,13 @@
-from api.deps import get_current_user_id
+from typing import Literal, Optional
+
+from api.deps import get_current_user_id, parse_cursor, set_next_cursor
 from api.schemas import (ConversationRatingRequest, ConversationResponse,
                          CreateConversationRequest)
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from utils.db import (create_conversation, get_conversation,
+from fastapi import (APIRouter, BackgroundTasks, Depends, HTTPException, Query,
+                     Request, Response, status)
+from utils.auth_cache import remember_conversation
+from utils.history_cache import history_cache
+from utils.db import (create_conversation, encode_cursor, get_conversation,
                       list_conversations, update_conversation_rating)
 
 router = APIRouter(prefix="/conversations", tags=["conversations"])
@@ -23,16 +28,32 @@ def _conv_to_response(row: dict) -> ConversationResponse:
         created_at=created_at,
         rating=row.get("rating"),
         rated_at=row.get("rated_at"),
+        cursor=encode_cursor(row),
     )
 
 
 @router.get("", response_model=list[ConversationResponse])
 def list_conversations_endpoint(
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     limit: int = Query(100, ge=1, le=500),
+    before: Optional[str] = Query(None, description="only conversations older than this cursor"),
+    after: Optional[str] = Query(None, description="only conversations newer than this cursor"),
+    order: Literal["desc", "asc"] = Query("desc"),
 ):
-    """Get all conversations for the current user (newest first)."""
-    rows = list_conversations(user_id=user_id, limit=limit)
+    """
+    Get the current user's conversations (newest first by default), one page at a
+    time: a full page sets X-Next-Cursor; pass it as ``before`` (``after`` with
+    order=asc) to get the next one.
+    """
+    rows = list_conversations(
+        user_id=user_id,
+        limit=limit,
+        before=parse_cursor(before, "before"),
+        after=parse_cursor(after, "after"),
+        newest_first=order == "desc",
+    )
+    set_next_cursor(response, rows, limit)
     return [_conv_to_response(row) for row in rows]
 
 
@@ -49,6 +70,8 @@ def create_conversation_endpoint(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create conversation",
         )
+    remember_conversation(user_id, conv_id)
+    history_cache.put(conv_id, [], complete=True)
     row = get_conversation(conv_id, user_id)
     if not row:
         raise HTTPException(
@@ -60,14 +83,25 @@ def create_conversation_endpoint(
 @router.get("/{conversation_id}", response_model=ConversationResponse)
 def get_conversation_endpoint(
     conversation_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user_id),
 ):
-    """Get a conversation by id (must belong to current user)."""
+    """
+    Get a conversation by id (must belong to current user). Warms its turn history
+    in the background, since a new message usually follows.
+    """
     row = get_conversation(conversation_id, user_id)
     if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
         )
+    remember_conversation(user_id, conversation_id)
+    background_tasks.add_task(
+        history_cache.warm,
+        row["id"],
+        with_summary=getattr(request.app.state, "summarizer", None) is not None,
+    )
     return _conv_to_response(row)
 
 
@@ -0,0 +1,112 @@
+import threading
+
+from api.deps import require_admin
+from api.schemas import (EntitiesRequest, EntityDeleteResponse,
+                         EntityIndexStatus, EntityUpsertResponse)
+from clients import CachedSparseEmbedder, LocalHybridEntityStore, SparseEmbedder
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from logger import file_logger
+
+router = APIRouter(
+    prefix="/admin/entities", tags=["admin"], dependencies=[Depends(require_admin)]
+)
+
+# One writer at a time: the BM25 statistics are updated in place and saved after each change
+_write_lock = threading.Lock()
+
+
+def _vecdb(request: Request):
+    vecdb = getattr(request.app.state, "vecdb", None)
+    if vecdb is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Entity store not initialized",
+        )
+    return vecdb
+
+
+def _save_bm25(request: Request, vecdb) -> None:
+    """Persist the updated BM25 model where the API loaded it from (other workers: /reload)."""
+    path = getattr(request.app.state, "bm25_model_path", None)
+    if path:
+        vecdb.sparse_embedder.save(path)
+
+
+def _status(vecdb) -> EntityIndexStatus:
+    sparse = vecdb.sparse_embedder
+    return EntityIndexStatus(
+        store=type(vecdb).__name__,
+        bm25_corpus_size=sparse.corpus_size,
+        bm25_vocabulary_size=sparse.get_vocabulary_size(),
+        entities=len(vecdb) if isinstance(vecdb, LocalHybridEntityStore) else None,
+    )
+
+
+@router.get("", response_model=EntityIndexStatus)
+def entity_index_status(request: Request):
+    """Entity store type and BM25 corpus statistics of this process."""
+    return _status(_vecdb(request))
+
+
+@router.put("", response_model=EntityUpsertResponse)
+def upsert_entities_endpoint(body: EntitiesRequest, request: Request):
+    """Add or replace entities (keyed by lowercased, whitespace-normalized text)."""
+    vecdb = _vecdb(request)
+    with _write_lock:
+        try:
+            result = vecdb.upsert_entities(body.entities)
+            _save_bm25(request, vecdb)
+        except Exception as e:
+            file_logger.error(f"Entity upsert failed: {type(e).__name__}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to upsert entities",
+            )
+    file_logger.info(f"Entity upsert: {result}")
+    return EntityUpsertResponse(**result)
+
+
+@router.post("/delete", response_model=EntityDeleteResponse)
+def delete_entities_endpoint(body: EntitiesRequest, request: Request):
+    """Delete entities by normalized text (unknown names are ignored)."""
+    vecdb = _vecdb(request)
+    with _write_lock:
+        try:
+            deleted = vecdb.delete_entities(body.entities)
+            if deleted:
+                _save_bm25(request, vecdb)
+        except Exception as e:
+            file_logger.error(f"Entity delete failed: {type(e).__name__}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to delete entities",
+            )
+    file_logger.info(f"Entity delete: {deleted} removed")
+    return EntityDeleteResponse(deleted=deleted)
+
+
+@router.post("/reload", response_model=EntityIndexStatus)
+def reload_entity_index(request: Request):
+    """
+    Re-read the saved BM25 model (and the local index file) in this process, to pick
+    up changes another worker made.
+    """
+    vecdb = _vecdb(request)
+    path = getattr(request.app.state, "bm25_model_path", None)
+    with _write_lock:
+        try:
+            if path:
+                sparse = SparseEmbedder.load(path)
+                if isinstance(vecdb.sparse_embedder, CachedSparseEmbedder):
+                    vecdb.sparse_embedder.embedder = sparse
+                else:
+                    vecdb.sparse_embedder = sparse
+            if isinstance(vecdb, LocalHybridEntityStore):
+                vecdb.ensure_collection()
+        except Exception as e:
+            file_logger.error(f"Entity index reload failed: {type(e).__name__}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to reload entity index",
+            )
+    return _status(vecdb)
@@ -1,12 +1,26 @@
-from typing import List
+import asyncio
+import json
+import os
+import time
+from typing import Any, Callable, List, Literal, Optional
 
-from api.deps import get_current_user_id
+from api.deps import get_current_user_id, parse_cursor, set_next_cursor
 from api.schemas import (AddMessageRequest, AddMessageResponse,
                          MessageRatingRequest, MessageResponse)
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from utils.db import (get_conversation, get_latest_messages,
-                      get_message_with_conversation, list_messages,
-                      update_message_rating)
+from behavior_tree import TreePoolExhausted, tick_async
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response, status)
+from fastapi.responses import StreamingResponse
+from logger import file_logger
+from utils import auth_cache
+from utils.metrics import TURN_DURATION
+from utils.db import (encode_cursor, get_message_with_conversation,
+                      list_messages, update_message_rating)
+
+# Seconds a request waits for a free behavior tree before returning 503
+TREE_ACQUIRE_TIMEOUT = float(os.getenv("TREE_ACQUIRE_TIMEOUT", "30"))
+# "async": await each node on the event loop (tick_async); "sync": py_trees tick() in a thread
+TREE_EXECUTION = os.getenv("TREE_EXECUTION", "async").strip().lower()
 
 router = APIRouter(
     prefix="/conversations/{conversation_id}/messages", tags=["messages"]
@@ -24,72 +38,205 @@ def _msg_to_response(m: dict) -> MessageResponse:
         bot_trace=m.get("bot_trace"),
         rating=m.get("rating"),
         rated_at=m.get("rated_at"),
+        cursor=encode_cursor(m) if m.get("created_at") else None,
     )
 
 
 @router.get("", response_model=List[MessageResponse])
 def list_messages_endpoint(
     conversation_id: str,
+    response: Response,
     user_id: str = Depends(get_current_user_id),
     limit: int = Query(100, ge=1, le=500),
+    before: Optional[str] = Query(None, description="only messages older than this cursor"),
+    after: Optional[str] = Query(None, description="only messages newer than this cursor"),
+    order: Literal["asc", "desc"] = Query("asc"),
 ):
-    """Load messages of a conversation (oldest first)."""
-    conv = get_conversation(conversation_id, user_id)
-    if not conv:
+    """
+    Load messages of a conversation (oldest first by default), one page at a time:
+    a full page sets X-Next-Cursor; pass it as ``after`` (``before`` with
+    order=desc, e.g. to load older history upwards) to get the next one. Polling
+    with ``after`` = the newest message seen returns only new messages.
+    """
+    if not auth_cache.owns_conversation(user_id, conversation_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
         )
-    rows = list_messages(conversation_id, limit=limit)
+    rows = list_messages(
+        conversation_id,
+        limit=limit,
+        before=parse_cursor(before, "before"),
+        after=parse_cursor(after, "after"),
+        newest_first=order == "desc",
+    )
+    set_next_cursor(response, rows, limit)
     return [_msg_to_response(m) for m in rows]
 
 
-@router.post("", response_model=AddMessageResponse)
-def add_message(
-    conversation_id: str,
-    body: AddMessageRequest,
-    request: Request,
-    user_id: str = Depends(get_current_user_id),
-):
-    """Send a user message; run the behavior tree and return user + assistant messages."""
-    conv = get_conversation(conversation_id, user_id)
-    if not conv:
+async def _tree_pool_for(request: Request, conversation_id: str, user_id: str):
+    """Check conversation ownership and return the app's tree pool (404 / 503 otherwise)."""
+    if not await auth_cache.aowns_conversation(user_id, conversation_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found"
         )
 
-    tree = getattr(request.app.state, "tree", None)
-    bb = getattr(request.app.state, "bb", None)
-    if not tree or not bb:
+    tree_pool = getattr(request.app.state, "tree_pool", None)
+    if not tree_pool:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Behavior tree not initialized",
         )
+    return tree_pool
 
-    bb.clear_for_new_question()
-    bb.conversation_id = conversation_id
-    bb.user_id = user_id
-    bb.user_question = body.content
-    tree.tick()
 
-    latest = get_latest_messages(conversation_id, limit=2)
-    if len(latest) < 2:
+async def _run_turn(
+    tree_pool,
+    conversation_id: str,
+    user_id: str,
+    content: str,
+    listener: Optional[Callable[[str, Any], None]] = None,
+    summarizer=None,
+) -> AddMessageResponse:
+    """
+    Tick a pooled tree for one user message; ``listener`` receives streaming events.
+    Once the turn is saved, ``summarizer`` (utils.conversation_summary) may fold older
+    turns into the conversation summary in the background.
+    """
+    try:
+        async with tree_pool.acquire_async(timeout=TREE_ACQUIRE_TIMEOUT) as slot:
+            slot.bb.conversation_id = conversation_id
+            slot.bb.user_id = user_id
+            slot.bb.user_question = content
+            slot.bb.listener = listener
+            started = time.perf_counter()
+            try:
+                if TREE_EXECUTION == "sync":
+                    await asyncio.to_thread(slot.tree.tick)
+                else:
+                    await tick_async(slot.tree)
+            finally:
+                slot.bb.listener = None
+                TURN_DURATION.labels(execution=TREE_EXECUTION).observe(
+                    time.perf_counter() - started
+                )
+            # Rows come back from SaveMessageNode's INSERT ... RETURNING; read them
+            # before the slot (and its blackboard) is handed to another request
+            saved = slot.bb.saved_messages
+    except TreePoolExhausted:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Assistant is busy, please retry",
+        )
+
+    if len(saved) < 2:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save or retrieve messages",
         )
-    user_msg = next((m for m in latest if m["role"] == "user"), None)
-    assistant_msg = next((m for m in latest if m["role"] == "assistant"), None)
+    user_msg = next((m for m in saved if m["role"] == "user"), None)
+    assistant_msg = next((m for m in saved if m["role"] == "assistant"), None)
     if not user_msg or not assistant_msg:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Missing user or assistant message",
         )
+    if summarizer is not None:
+        summarizer.schedule(conversation_id)
     return AddMessageResponse(
         user_message=_msg_to_response(user_msg),
         assistant_message=_msg_to_response(assistant_msg),
     )
 
 
+@router.post("", response_model=AddMessageResponse)
+async def add_message(
+    conversation_id: str,
+    body: AddMessageRequest,
+    request: Request,
+    user_id: str = Depends(get_current_user_id),
+):
+    """Send a user message; run the behavior tree and return user + assistant messages."""
+    tree_pool = await _tree_pool_for(request, conversation_id, user_id)
+    return await _run_turn(
+        tree_pool,
+        conversation_id,
+        user_id,
+        body.content,
+        summarizer=getattr(request.app.state, "summarizer", None),
+    )
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# Turns whose client went away keep running (the messages are still saved)
+_running_turns: set = set()
+
+
+@router.post("/stream")
+async def add_message_stream(
+    conversation_id: str,
+    body: AddMessageRequest,
+    request: Request,
+    user_id: str = Depends(get_current_user_id),
+):
+    """
+    Same as ``POST ""`` but as Server-Sent Events while the tree runs:
+
+    - ``trace``: bot_trace step ``{step, status}`` as each node finishes
+    - ``token``: text chunk of the assistant reply (LLM reply nodes only)
+    - ``message``: final AddMessageResponse (saved rows; replaces streamed text), or
+      ``error``: ``{status, detail}``
+    """
+    tree_pool = await _tree_pool_for(request, conversation_id, user_id)
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def listener(event: str, data: Any) -> None:
+        # nodes may run in worker threads (sync execution, BaseNode.async_update)
+        loop.call_soon_threadsafe(queue.put_nowait, (event, data))
+
+    async def turn() -> None:
+        try:
+            response = await _run_turn(
+                tree_pool,
+                conversation_id,
+                user_id,
+                body.content,
+                listener,
+                summarizer=getattr(request.app.state, "summarizer", None),
+            )
+            listener("message", response.model_dump(mode="json"))
+        except HTTPException as e:
+            listener("error", {"status": e.status_code, "detail": e.detail})
+        except Exception as e:
+            file_logger.error(
+                f"add_message_stream: turn failed for conversation {conversation_id}: "
+                f"{type(e).__name__}: {e}"
+            )
+            listener("error", {"status": 500, "detail": "Internal error"})
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    task = asyncio.create_task(turn())
+    _running_turns.add(task)
+    task.add_done_callback(_running_turns.discard)
+
+    async def events():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            yield _sse(*item)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/{message_id}/rating")
 def rate_message(
     conversation_id: str,
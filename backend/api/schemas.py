@@ -38,6 +38,8 @@ class ConversationResponse(BaseModel):
     created_at: Optional[str] = None
     rating: Optional[int] = None
     rated_at: Optional[str] = None
+    # Pagination cursor of this conversation (``before`` / ``after`` of GET /conversations)
+    cursor: Optional[str] = None
 
 
 class ConversationRatingRequest(BaseModel):
@@ -59,6 +61,8 @@ class MessageResponse(BaseModel):
     bot_trace: Optional[List[Any]] = None
     rating: Optional[int] = None
     rated_at: Optional[str] = None
+    # Pagination cursor of this message (``before`` / ``after`` of GET .../messages)
+    cursor: Optional[str] = None
 
 
 class AddMessageResponse(BaseModel):
@@ -70,3 +74,24 @@ class AddMessageResponse(BaseModel):
 
 class MessageRatingRequest(BaseModel):
     rating: int = Field(..., ge=1, le=5)
+
+
+# ---- Admin: entity index ----
+class EntitiesRequest(BaseModel):
+    entities: List[str] = Field(..., min_length=1, max_length=1000)
+
+
+class EntityUpsertResponse(BaseModel):
+    inserted: int
+    updated: int
+
+
+class EntityDeleteResponse(BaseModel):
+    deleted: int
+
+
+class EntityIndexStatus(BaseModel):
+    store: str
+    bm25_corpus_size: int
+    bm25_vocabulary_size: int
+    entities: Optional[int] = None
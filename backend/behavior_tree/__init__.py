@@ -1,5 +1,19 @@
+from .async_runner import tick_async
 from .build_tree import build_tree
+from .dependency import DependencySequence
 from .knowno_tree.build_tree import build_tree as build_knowno_tree
+from .pool import TreePool, TreePoolExhausted, TreeSlot
+from .speculation import ShadowBranch, Speculative
 
 
-__all__ = ["build_tree", "build_knowno_tree"]
+__all__ = [
+    "build_tree",
+    "build_knowno_tree",
+    "DependencySequence",
+    "ShadowBranch",
+    "Speculative",
+    "TreePool",
+    "TreePoolExhausted",
+    "TreeSlot",
+    "tick_async",
+]
@@ -0,0 +1,165 @@
+"""
+Async, single-shot tick for the request trees built in this package.
+
+py_trees ticks synchronously, so a tree blocked on the LLM holds a whole worker
+thread. ``tick_async`` walks the same tree with Sequence/Selector semantics but
+awaits each leaf's ``async_update()`` (BaseNode/LLMNode), so one event loop can
+keep many conversations in flight while they wait on the LLM, TEI, or Postgres.
+Children of a ``Parallel`` run concurrently, a ``DependencySequence`` starts
+each child as soon as the children it depends on have succeeded, and a
+``Speculative`` sequence starts its branch early (see speculation.py).
+
+Scope: one pass from the root per call (the API ticks each tree once per turn);
+leaves are not expected to return RUNNING.
+"""
+
+import asyncio
+from typing import Dict, Union
+
+import py_trees
+
+from .dependency import DependencySequence
+from .speculation import ShadowBranch, Speculative
+
+Status = py_trees.common.Status
+
+
+async def _tick_leaf(node: py_trees.behaviour.Behaviour) -> Status:
+    if node.status != Status.RUNNING:
+        node.initialise()
+    if hasattr(node, "async_update"):
+        status = await node.async_update()
+    else:
+        # Plain py_trees behaviours (no I/O) keep their synchronous update()
+        status = node.update()
+    if status != Status.RUNNING:
+        node.stop(status)
+    node.status = status
+    return status
+
+
+async def _tick_dependency_sequence(node: DependencySequence) -> Status:
+    children = list(node.children)
+    graph = node.graph
+    results: Dict[int, Status] = {}
+    running: Dict[asyncio.Task, int] = {}
+    started = set()
+    failed = False
+
+    while True:
+        if not failed:
+            for j in range(len(children)):
+                if j not in started and all(
+                    results.get(i) == Status.SUCCESS for i in graph[j]
+                ):
+                    started.add(j)
+                    running[asyncio.ensure_future(_tick_node(children[j]))] = j
+        if not running:
+            break
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            j = running.pop(task)
+            results[j] = task.result()
+            failed = failed or results[j] != Status.SUCCESS
+
+    for j in range(len(children)):
+        if results.get(j, Status.SUCCESS) != Status.SUCCESS:
+            return results[j]
+    return Status.SUCCESS
+
+
+async def _tick_parallel(node: py_trees.composites.Parallel) -> Status:
+    statuses = await asyncio.gather(*(_tick_node(c) for c in node.children))
+    if any(s == Status.FAILURE for s in statuses):
+        return Status.FAILURE
+    policy = node.policy
+    if isinstance(policy, py_trees.common.ParallelPolicy.SuccessOnOne):
+        ok = any(s == Status.SUCCESS for s in statuses)
+    elif isinstance(policy, py_trees.common.ParallelPolicy.SuccessOnSelected):
+        ok = all(c.status == Status.SUCCESS for c in policy.children)
+    else:
+        ok = all(s == Status.SUCCESS for s in statuses)
+    return Status.SUCCESS if ok else Status.RUNNING
+
+
+async def _tick_sequence(node: py_trees.composites.Sequence) -> Status:
+    status = Status.SUCCESS
+    for child in node.children:
+        status = await _tick_node(child)
+        if status != Status.SUCCESS:
+            break
+    return status
+
+
+async def _tick_shadow_branch(node: ShadowBranch) -> Status:
+    """Run a ShadowBranch, committing a matching speculative run instead if one is pending."""
+    pending, node.pending = node.pending, None
+    if pending is not None:
+        task, snapshot = pending
+        status = await task
+        if node.snapshot() == snapshot:
+            node.commit()
+            return status
+        # inputs changed after the speculative start (e.g. detection rewrote them): redo
+        node.stop(Status.INVALID)
+
+    node.prepare(node.snapshot())
+    status = await _tick_sequence(node)
+    node.commit()
+    return status
+
+
+async def _tick_speculative(node: Speculative) -> Status:
+    branch = node.branch
+    snapshot = branch.snapshot()
+    branch.prepare(snapshot)
+    task = asyncio.ensure_future(_tick_sequence(branch))
+    branch.pending = (task, snapshot)
+    try:
+        status = await _tick_sequence(node)
+    finally:
+        if branch.pending is not None:
+            # the walk never reached the branch: drop the speculative run
+            branch.pending = None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            branch.stop(Status.INVALID)
+            node.misses += 1
+        else:
+            node.hits += 1
+    return status
+
+
+async def _tick_node(node: py_trees.behaviour.Behaviour) -> Status:
+    if isinstance(node, DependencySequence):
+        status = await _tick_dependency_sequence(node)
+    elif isinstance(node, Speculative):
+        status = await _tick_speculative(node)
+    elif isinstance(node, ShadowBranch):
+        status = await _tick_shadow_branch(node)
+    elif isinstance(node, py_trees.composites.Parallel):
+        status = await _tick_parallel(node)
+    elif isinstance(node, py_trees.composites.Sequence):
+        status = await _tick_sequence(node)
+    elif isinstance(node, py_trees.composites.Selector):
+        status = Status.FAILURE
+        for child in node.children:
+            status = await _tick_node(child)
+            if status != Status.FAILURE:
+                break
+    elif isinstance(node, py_trees.composites.Composite):
+        raise TypeError(
+            f"tick_async does not support composite {type(node).__name__} ({node.name})"
+        )
+    else:
+        return await _tick_leaf(node)
+    node.status = status
+    return status
+
+
+async def tick_async(
+    tree: Union[py_trees.trees.BehaviourTree, py_trees.behaviour.Behaviour],
+) -> Status:
+    """Tick ``tree`` (or a subtree root) once; returns the root status."""
+    root = tree.root if isinstance(tree, py_trees.trees.BehaviourTree) else tree
+    return await _tick_node(root)
@@ -10,6 +10,8 @@ from nodes import (AmbiguityClassifierNode, AmbiguityDetectorNode,
 from nodes.action_executor import ActionExecutor
 from nodes.perform_action_node import PerformActionNode
 
+from .speculation import ShadowBranch, Speculative, shadow_blackboard
+
 
 def build_tree(
     bb: Blackboard,
@@ -17,6 +19,8 @@ def build_tree(
     vecdb: MilvusHybridEntityStore,
     *,
     action_executor: Optional[ActionExecutor] = None,
+    speculative: bool = False,
+    history_summary: bool = False,
 ) -> py_trees.trees.BehaviourTree:
     """
     Build the main behaviour tree.
@@ -28,6 +32,15 @@ def build_tree(
     Flow: vector search runs once after standalone request, before ambiguity detection,
     so retrieved entities inform CLEAR vs AMBIGUOUS; the same ``current_related_entities``
     list is reused on both branches (classifier + repair on ambiguous path).
+
+    ``speculative=True`` starts the ambiguous path (classifier + repair) on a shadow
+    blackboard alongside ambiguity detection under ``tick_async`` and keeps it only when
+    the turn is ambiguous (behavior_tree/speculation.py); more LLM tokens, shorter
+    ambiguous turns.
+
+    ``history_summary=True`` loads the conversation's rolling summary with the lines
+    after it (utils/conversation_summary.py), so history windows are "summary + recent
+    lines"; the caller keeps the summary up to date.
     """
 
     # Root sequence: load history, standalone request, vector search, ambiguity, path, save
@@ -38,6 +51,7 @@ def build_tree(
         name="LoadHistory",
         bb=bb,
         top_k=30,
+        with_summary=history_summary,
     )
     root.add_child(load_history)
 
@@ -66,7 +80,6 @@ def build_tree(
         llm=llm,
         max_history_lines=16,
     )
-    root.add_child(ambiguity_detector)
 
     # Step 5: Selector (Fallback) — clear path vs ambiguous path
     path_selector = py_trees.composites.Selector(name="PathSelector", memory=False)
@@ -89,17 +102,23 @@ def build_tree(
     clear_path.add_child(perform_action)
 
     # Ambiguous path: entities already on blackboard; classify type, then repair
-    ambiguous_path = py_trees.composites.Sequence(name="AmbiguousPath", memory=True)
+    # (speculative: nodes run on a shadow blackboard, results copied back when committed)
+    if speculative:
+        branch_bb = shadow_blackboard(bb)
+        ambiguous_path = ShadowBranch(name="AmbiguousPath", bb=bb, shadow=branch_bb)
+    else:
+        branch_bb = bb
+        ambiguous_path = py_trees.composites.Sequence(name="AmbiguousPath", memory=True)
     ambiguous_classifier = AmbiguityClassifierNode(
         name="AmbiguityClassifier",
-        bb=bb,
+        bb=branch_bb,
         llm=llm,
         max_history_lines=16,
     )
     ambiguous_path.add_child(ambiguous_classifier)
     ambiguous_repair = AmbiguousRepairNode(
         name="AmbiguousRepair",
-        bb=bb,
+        bb=branch_bb,
         llm=llm,
         max_history_lines=16,
     )
@@ -109,7 +128,17 @@ def build_tree(
     path_selector.add_child(clear_path)
     path_selector.add_child(ambiguous_path)
 
-    root.add_child(path_selector)
+    if speculative:
+        root.add_child(
+            Speculative(
+                name="AmbiguityDecision",
+                branch=ambiguous_path,
+                children=[ambiguity_detector, path_selector],
+            )
+        )
+    else:
+        root.add_child(ambiguity_detector)
+        root.add_child(path_selector)
 
     # Step 6: Save user + assistant messages to DB (with bot_trace)
     save_message = SaveMessageNode(name="SaveMessage", bb=bb)
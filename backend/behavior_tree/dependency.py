@@ -0,0 +1,125 @@
+"""
+Dependency-aware sequence: children that do not touch each other's blackboard keys
+may run at the same time under ``tick_async``.
+
+Each node's dependencies come from the keys its blackboard client registered
+(BaseNode ``_client``, plus any clients attached with ``attach_blackboard_client``):
+a child waits for every earlier child that writes a key it reads or writes, or that
+reads a key it writes. Composites use the union of their descendants' keys. A child
+whose keys are unknown (no blackboard client) is a barrier, so plain py_trees
+behaviours keep strict sequence order.
+
+bot_trace is appended to through the Blackboard wrapper by every node; appends
+commute, so they only order a child before later readers of bot_trace
+(SaveMessageNode). Steps of children running concurrently are appended in
+completion order.
+
+Under the synchronous ``tree.tick()`` a DependencySequence is a plain memory
+Sequence, so sync and async execution produce the same blackboard state.
+"""
+
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+import py_trees
+
+TRACE_KEY = "bot_trace"
+
+Keys = Tuple[FrozenSet[str], FrozenSet[str]]
+
+
+def _leaf_clients(node: py_trees.behaviour.Behaviour) -> List:
+    clients = list(getattr(node, "blackboards", []) or [])
+    client = getattr(node, "_client", None)
+    if isinstance(client, py_trees.blackboard.Client):
+        clients.append(client)
+    return clients
+
+
+def _short(key: str) -> str:
+    return key.rsplit("/", 1)[-1]
+
+
+def blackboard_keys(node: py_trees.behaviour.Behaviour) -> Optional[Keys]:
+    """(reads, writes) of ``node`` and its descendants as short key names; None if unknown."""
+    if isinstance(node, py_trees.composites.Composite):
+        reads: Set[str] = set()
+        writes: Set[str] = set()
+        for child in node.children:
+            keys = blackboard_keys(child)
+            if keys is None:
+                return None
+            reads |= keys[0]
+            writes |= keys[1]
+        return frozenset(reads), frozenset(writes)
+
+    clients = _leaf_clients(node)
+    if not clients:
+        return None
+    reads = {_short(k) for c in clients for k in c.read}
+    writes = {_short(k) for c in clients for k in (c.write | c.exclusive)}
+    return frozenset(reads), frozenset(writes)
+
+
+def _appends_trace(node: py_trees.behaviour.Behaviour) -> bool:
+    return hasattr(node, "bb")
+
+
+def dependency_graph(children: List[py_trees.behaviour.Behaviour]) -> Dict[int, Set[int]]:
+    """child index -> indices of earlier children it must wait for."""
+    keys = [blackboard_keys(c) for c in children]
+    appends = [any(_appends_trace(n) for n in c.iterate()) for c in children]
+    deps: Dict[int, Set[int]] = {}
+    for j, kj in enumerate(keys):
+        deps[j] = set()
+        for i in range(j):
+            ki = keys[i]
+            if ki is None or kj is None:
+                deps[j].add(i)
+                continue
+            reads_i, writes_i = ki
+            reads_j, writes_j = kj
+            # bot_trace: appends commute; a later reader still waits for the appenders
+            writes_i = (writes_i - {TRACE_KEY}) | ({TRACE_KEY} if appends[i] else set())
+            writes_j = writes_j - {TRACE_KEY}
+            if writes_i & (reads_j | writes_j) or reads_i & writes_j:
+                deps[j].add(i)
+    return deps
+
+
+class DependencySequence(py_trees.composites.Sequence):
+    """
+    Sequence whose independent children overlap under ``tick_async``.
+
+    Status follows Sequence: SUCCESS when every child succeeds; otherwise the status
+    of the first failing child (in child order). Once a child fails no new children
+    are started, and the ones already running are awaited.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        memory: bool = True,
+        children: Optional[List[py_trees.behaviour.Behaviour]] = None,
+    ):
+        super().__init__(name=name, memory=memory, children=children)
+        self._graph: Optional[Dict[int, Set[int]]] = None
+        self._graph_for: Tuple[int, ...] = ()
+
+    @property
+    def graph(self) -> Dict[int, Set[int]]:
+        """Dependency graph over children (keys are registered at construction, so cached)."""
+        ids = tuple(id(c) for c in self.children)
+        if self._graph is None or ids != self._graph_for:
+            self._graph = dependency_graph(list(self.children))
+            self._graph_for = ids
+        return self._graph
+
+    def stages(self) -> List[List[str]]:
+        """Child names grouped by earliest start (for logging/docs)."""
+        level: Dict[int, int] = {}
+        for j in range(len(self.children)):
+            level[j] = max((level[i] + 1 for i in self.graph[j]), default=0)
+        out: List[List[str]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+        for j, child in enumerate(self.children):
+            out[level[j]].append(child.name)
+        return out
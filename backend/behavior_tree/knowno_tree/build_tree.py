@@ -13,9 +13,11 @@ from nodes_knowno import (
     KnownoAmbigTypeNode,
     KnownoAmbiguityRelatedDetectNode,
     KnownoAmbiguityResponseNode,
+    KnownoFusedReasoningNode,
     KnownoViableObjectsAvailableNode,
     KnownoViableObjectsNode,
     LoadHistoryNode,
+    QuestionSearchNode,
     SaveMessageNode,
     StandaloneQuestionNode,
     VectorSearchNode,
@@ -23,6 +25,9 @@ from nodes_knowno import (
 from nodes_knowno.action_executor import ActionExecutor
 from nodes.perform_action_node import PerformActionNode
 
+from ..dependency import DependencySequence
+from ..speculation import ShadowBranch, Speculative, shadow_blackboard
+
 
 def build_tree(
     bb: Blackboard,
@@ -30,6 +35,9 @@ def build_tree(
     vecdb: MilvusHybridEntityStore,
     *,
     action_executor: Optional[ActionExecutor] = None,
+    speculative: bool = False,
+    fused: bool = False,
+    history_summary: bool = False,
 ) -> py_trees.trees.BehaviourTree:
     """
     Build the main behaviour tree.
@@ -45,16 +53,36 @@ def build_tree(
     object exists, use KnownoAmbigDetect (query + history + viable); otherwise use
     KnownoAmbiguityRelatedDetect (same idea as ``AmbiguityDetectorNode``: query + history
     + ``current_related_entities``). Then classify type and clarify on the ambiguous branch.
+
+    The root is a DependencySequence: with ``tick_async`` a step starts as soon as the
+    steps whose blackboard keys it depends on are done, so QuestionSearch (needs only
+    the standalone request) overlaps EntitiesPredictor/EntityResolve.
+
+    ``speculative=True`` starts the ambiguous path (type + clarification) on a shadow
+    blackboard alongside ambiguity detection under ``tick_async`` and keeps it only when
+    the turn is ambiguous (behavior_tree/speculation.py); more LLM tokens, shorter
+    ambiguous turns.
+
+    ``fused=True`` replaces entity actions, viable objects, ambiguity detection and
+    type classification with one KnownoFusedReasoning call (one structured JSON
+    answer); the ambiguous path is then only the clarification response. There is no
+    separate type step left to overlap, so ``speculative`` has no effect.
+    (benchmarks/knowno_fused.py compares both variants.)
+
+    ``history_summary=True`` loads the conversation's rolling summary with the lines
+    after it (utils/conversation_summary.py), so history windows are "summary + recent
+    lines"; the caller keeps the summary up to date.
     """
 
     # Root sequence: load history, standalone request, vector search, ambiguity, path, save
-    root = py_trees.composites.Sequence(name="Root", memory=True)
+    root = DependencySequence(name="Root", memory=True)
 
     # Step 1: Load previous messages for conversation (sets turn_history)
     load_history = LoadHistoryNode(
         name="LoadHistory",
         bb=bb,
         top_k=30,
+        with_summary=history_summary,
     )
     root.add_child(load_history)
 
@@ -67,6 +95,15 @@ def build_tree(
     )
     root.add_child(standalone_question_node)
 
+    # Step 2.1: Related-entity search on the standalone request (VectorSearch fallback);
+    # independent of entity prediction, so it runs alongside it under tick_async
+    question_search_node = QuestionSearchNode(
+        name="QuestionSearch",
+        bb=bb,
+        vecdb=vecdb,
+    )
+    root.add_child(question_search_node)
+
     # Step 2.5: Generate potential entity actions for question
     entity_prediction_node = EntitiesPredictorNode(
         name="EntitiesPredictor",
@@ -93,60 +130,71 @@ def build_tree(
     )
     root.add_child(vector_search)
 
-    # Step 3.5: Generate entity actions for grounded entities
-    entity_action_generation_node = EntityActionGeneratorNode(
-        name="EntityActionGeneration",
-        bb=bb,
-        llm=llm,
-    )
-    root.add_child(entity_action_generation_node)
-
-    # Step 4: Viable objects (LLM), then route ambiguity detect by viable availability
-    viable_objects_node = KnownoViableObjectsNode(
-        name="KnownoViableObjects",
-        bb=bb,
-        llm=llm,
-        max_history_lines=16,
-    )
-    root.add_child(viable_objects_node)
-
-    ambiguity_route = py_trees.composites.Selector(
-        name="KnownoAmbiguityRoute", memory=False
-    )
-
-    with_viable = py_trees.composites.Sequence(
-        name="AmbiguityDetectWithViable", memory=True
-    )
-    with_viable.add_child(
-        KnownoViableObjectsAvailableNode(
-            name="KnownoViableObjectsAvailable",
-            bb=bb,
+    if fused:
+        # Steps 3.5-4 + type in one LLM call (entity_action, viable_objects, is_ambiguous, type)
+        root.add_child(
+            KnownoFusedReasoningNode(
+                name="KnownoFusedReasoning",
+                bb=bb,
+                llm=llm,
+                max_history_lines=16,
+            )
         )
-    )
-    with_viable.add_child(
-        KnownoAmbigDetectNode(
-            name="KnownoAmbigDetect",
+        ambiguity_route = None
+        speculative = False
+    else:
+        # Step 3.5: Generate entity actions for grounded entities
+        entity_action_generation_node = EntityActionGeneratorNode(
+            name="EntityActionGeneration",
             bb=bb,
             llm=llm,
-            max_history_lines=16,
         )
-    )
-    ambiguity_route.add_child(with_viable)
+        root.add_child(entity_action_generation_node)
 
-    without_viable = py_trees.composites.Sequence(
-        name="AmbiguityDetectRelatedOnly", memory=True
-    )
-    without_viable.add_child(
-        KnownoAmbiguityRelatedDetectNode(
-            name="KnownoAmbiguityRelatedDetect",
+        # Step 4: Viable objects (LLM), then route ambiguity detect by viable availability
+        viable_objects_node = KnownoViableObjectsNode(
+            name="KnownoViableObjects",
             bb=bb,
             llm=llm,
             max_history_lines=16,
         )
-    )
-    ambiguity_route.add_child(without_viable)
+        root.add_child(viable_objects_node)
+
+        ambiguity_route = py_trees.composites.Selector(
+            name="KnownoAmbiguityRoute", memory=False
+        )
+
+        with_viable = py_trees.composites.Sequence(
+            name="AmbiguityDetectWithViable", memory=True
+        )
+        with_viable.add_child(
+            KnownoViableObjectsAvailableNode(
+                name="KnownoViableObjectsAvailable",
+                bb=bb,
+            )
+        )
+        with_viable.add_child(
+            KnownoAmbigDetectNode(
+                name="KnownoAmbigDetect",
+                bb=bb,
+                llm=llm,
+                max_history_lines=16,
+            )
+        )
+        ambiguity_route.add_child(with_viable)
 
-    root.add_child(ambiguity_route)
+        without_viable = py_trees.composites.Sequence(
+            name="AmbiguityDetectRelatedOnly", memory=True
+        )
+        without_viable.add_child(
+            KnownoAmbiguityRelatedDetectNode(
+                name="KnownoAmbiguityRelatedDetect",
+                bb=bb,
+                llm=llm,
+                max_history_lines=16,
+            )
+        )
+        ambiguity_route.add_child(without_viable)
 
     # Step 5: Selector (Fallback) — clear path vs ambiguous path
     path_selector = py_trees.composites.Selector(name="PathSelector", memory=False)
@@ -168,18 +216,25 @@ def build_tree(
     )
     clear_path.add_child(perform_action)
 
-    # Ambiguous path: type (LLM) then clarification response
-    ambiguous_path = py_trees.composites.Sequence(name="AmbiguousPath", memory=True)
-    ambig_type = KnownoAmbigTypeNode(
-        name="KnownoAmbigType",
-        bb=bb,
-        llm=llm,
-        max_history_lines=16,
-    )
-    ambiguous_path.add_child(ambig_type)
+    # Ambiguous path: type (LLM; fused: already set) then clarification response
+    # (speculative: nodes run on a shadow blackboard, results copied back when committed)
+    if speculative:
+        branch_bb = shadow_blackboard(bb)
+        ambiguous_path = ShadowBranch(name="AmbiguousPath", bb=bb, shadow=branch_bb)
+    else:
+        branch_bb = bb
+        ambiguous_path = py_trees.composites.Sequence(name="AmbiguousPath", memory=True)
+    if not fused:
+        ambig_type = KnownoAmbigTypeNode(
+            name="KnownoAmbigType",
+            bb=branch_bb,
+            llm=llm,
+            max_history_lines=16,
+        )
+        ambiguous_path.add_child(ambig_type)
     ambiguous_repair = KnownoAmbiguityResponseNode(
         name="AmbiguousRepair",
-        bb=bb,
+        bb=branch_bb,
         llm=llm,
         max_history_lines=10,
     )
@@ -189,7 +244,18 @@ def build_tree(
     path_selector.add_child(clear_path)
     path_selector.add_child(ambiguous_path)
 
-    root.add_child(path_selector)
+    if speculative:
+        root.add_child(
+            Speculative(
+                name="AmbiguityDecision",
+                branch=ambiguous_path,
+                children=[ambiguity_route, path_selector],
+            )
+        )
+    else:
+        if ambiguity_route is not None:
+            root.add_child(ambiguity_route)
+        root.add_child(path_selector)
 
     # Step 6: Save user + assistant messages to DB (with bot_trace)
     save_message = SaveMessageNode(name="SaveMessage", bb=bb)
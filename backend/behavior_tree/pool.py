@@ -0,0 +1,130 @@
+"""
+Pool of independent (blackboard, tree) pairs so concurrent requests can tick in parallel.
+
+py_trees keeps blackboard storage in a process-wide dict, so every slot gets its own
+namespace (``/<pool name>_<i>``, so pools need distinct names); nodes built for that
+slot read and write only there.
+A slot is checked out by one request at a time and reset before it is handed out.
+"""
+
+import asyncio
+import queue
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+import py_trees
+from nodes import Blackboard
+
+TreeBuilder = Callable[[Blackboard], py_trees.trees.BehaviourTree]
+
+
+class TreePoolExhausted(RuntimeError):
+    """Raised when no slot became free within the acquire timeout."""
+
+
+@dataclass
+class TreeSlot:
+    index: int
+    bb: Blackboard
+    tree: py_trees.trees.BehaviourTree
+
+
+class TreePool:
+    """
+    Lazily grows up to ``max_size`` slots; ``acquire`` blocks until one is free.
+
+    ``builder`` receives a fresh namespaced blackboard and returns the tree for it,
+    e.g. ``lambda bb: build_tree(bb=bb, llm=llm, vecdb=vecdb)``.
+    ``blackboard_cls`` lets the knowno tree pass its own ``Blackboard`` variant.
+    """
+
+    def __init__(
+        self,
+        builder: TreeBuilder,
+        *,
+        max_size: int = 8,
+        blackboard_cls: type = Blackboard,
+        name: str = "api_bb",
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        self._builder = builder
+        self._max_size = max_size
+        self._blackboard_cls = blackboard_cls
+        self._name = name
+
+        self._idle: "queue.LifoQueue[TreeSlot]" = queue.LifoQueue()
+        self._slots: List[TreeSlot] = []
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        return len(self._slots)
+
+    def _new_slot(self) -> TreeSlot:
+        index = len(self._slots)
+        bb = self._blackboard_cls(
+            name=f"{self._name}_{index}", namespace=f"/{self._name}_{index}"
+        )
+        tree = self._builder(bb)
+        slot = TreeSlot(index=index, bb=bb, tree=tree)
+        self._slots.append(slot)
+        return slot
+
+    def warm_up(self, n: int = 1) -> TreeSlot:
+        """Build up to ``n`` slots ahead of traffic; returns the first slot (e.g. for rendering)."""
+        with self._lock:
+            while len(self._slots) < min(max(n, 1), self._max_size):
+                self._idle.put(self._new_slot())
+            return self._slots[0]
+
+    def _checkout_nowait(self) -> Optional[TreeSlot]:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._slots) < self._max_size:
+                return self._new_slot()
+        return None
+
+    def _checkout(self, timeout: Optional[float]) -> TreeSlot:
+        slot = self._checkout_nowait()
+        if slot is not None:
+            return slot
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TreePoolExhausted(
+                f"no behaviour tree free after {timeout}s (max_size={self._max_size})"
+            ) from None
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[TreeSlot]:
+        """Check out a slot with a cleared blackboard; it is returned to the pool on exit."""
+        slot = self._checkout(timeout)
+        try:
+            slot.bb.clear_for_new_question()
+            yield slot
+        finally:
+            self._idle.put(slot)
+
+    @asynccontextmanager
+    async def acquire_async(
+        self, timeout: Optional[float] = None
+    ) -> AsyncIterator[TreeSlot]:
+        """acquire() for async handlers; only waits in a thread when the pool is exhausted."""
+        slot = self._checkout_nowait()
+        if slot is None:
+            slot = await asyncio.to_thread(self._checkout, timeout)
+        try:
+            slot.bb.clear_for_new_question()
+            yield slot
+        finally:
+            self._idle.put(slot)
@@ -0,0 +1,128 @@
+"""
+Speculative execution of the ambiguous branch.
+
+The ambiguous path (type classifier + clarification) only needs the standalone
+request, history and retrieved/viable entities, not ``is_ambiguous``. With
+speculation on, ``tick_async`` starts it at the same time as ambiguity detection
+and keeps the result only if the tree actually takes that path; otherwise the
+branch is cancelled and its output discarded. That saves one or two LLM round
+trips of wall-clock time on ambiguous turns at the cost of wasted tokens on clear
+ones.
+
+- ``ShadowBranch``: a memory Sequence whose children are bound to a *shadow*
+  blackboard (child namespace). Ticking it copies the keys it reads from the real
+  blackboard into the shadow, runs the children there, then copies the keys it
+  writes (and its bot_trace steps) back. Behaves like a plain Sequence otherwise,
+  including under the synchronous ``tree.tick()``. The shadow has no streaming
+  listener, so the branch's reply is not token-streamed; its trace steps are
+  emitted on commit.
+- ``Speculative``: a memory Sequence that, under ``tick_async``, starts its
+  ``branch`` (a ShadowBranch descendant) as soon as it is ticked. When the walk
+  reaches the branch, the speculative run is committed if the branch's inputs are
+  unchanged since it started (else it is re-run); if the walk never gets there the
+  run is cancelled.
+"""
+
+import copy
+from typing import Any, Dict, FrozenSet, List, Optional
+
+import py_trees
+
+from .dependency import TRACE_KEY, blackboard_keys
+
+
+def shadow_blackboard(bb, suffix: str = "speculative"):
+    """Blackboard of the same class as ``bb`` in a child namespace of it."""
+    namespace = f"{bb.namespace or ''}/{suffix}"
+    return type(bb)(name=f"{suffix}_bb", namespace=namespace)
+
+
+class ShadowBranch(py_trees.composites.Sequence):
+    """Sequence run on ``shadow`` with its inputs/outputs copied from/to ``bb``."""
+
+    def __init__(
+        self,
+        name: str,
+        bb,
+        shadow,
+        children: Optional[List[py_trees.behaviour.Behaviour]] = None,
+    ):
+        super().__init__(name=name, memory=True, children=children)
+        self.bb = bb
+        self.shadow = shadow
+        # (task, input snapshot) of a run started by Speculative under tick_async
+        self.pending = None
+
+    def _keys(self):
+        keys = blackboard_keys(self)
+        if keys is None:
+            raise TypeError(f"ShadowBranch {self.name}: children must use blackboard keys")
+        return keys
+
+    @property
+    def inputs(self) -> FrozenSet[str]:
+        return self._keys()[0] - {TRACE_KEY}
+
+    @property
+    def outputs(self) -> FrozenSet[str]:
+        return self._keys()[1] - {TRACE_KEY}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values of the branch inputs on the real blackboard (unset keys omitted)."""
+        client = self.bb.raw_client()
+        return {
+            key: copy.deepcopy(client.get(key))
+            for key in self.inputs
+            if client.exists(key)
+        }
+
+    def prepare(self, snapshot: Dict[str, Any]) -> None:
+        """Load ``snapshot`` into the shadow blackboard and reset its outputs and trace."""
+        shadow = self.shadow.raw_client()
+        for key in self.inputs | self.outputs:
+            if key in snapshot:
+                shadow.set(key, copy.deepcopy(snapshot[key]))
+            elif shadow.exists(key):
+                shadow.unset(key)
+        shadow.set(TRACE_KEY, [])
+
+    def commit(self) -> None:
+        """Copy outputs and bot_trace steps from the shadow to the real blackboard."""
+        shadow = self.shadow.raw_client()
+        client = self.bb.raw_client()
+        for key in self.outputs:
+            if shadow.exists(key):
+                client.set(key, shadow.get(key))
+        steps = self.shadow.get_bot_trace()
+        if steps:
+            client.set(TRACE_KEY, self.bb.get_bot_trace() + steps)
+        for step in steps:
+            if "step" in step:
+                self.bb.emit("trace", step)
+
+    def tick(self):
+        if self.status != py_trees.common.Status.RUNNING:
+            self.prepare(self.snapshot())
+        for node in super().tick():
+            if node is self and self.status != py_trees.common.Status.RUNNING:
+                self.commit()
+            yield node
+
+
+class Speculative(py_trees.composites.Sequence):
+    """
+    Memory Sequence that starts ``branch`` early under ``tick_async`` (plain
+    Sequence under ``tree.tick()``). ``hits``/``misses`` count async ticks that
+    did / did not reach the branch (i.e. used or discarded the speculative run).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        branch: ShadowBranch,
+        children: Optional[List[py_trees.behaviour.Behaviour]] = None,
+    ):
+        super().__init__(name=name, memory=True, children=children)
+        self.branch = branch
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,151 @@
+"""
+Login throughput vs message-endpoint latency under mixed load, in process.
+
+    python -m benchmarks.auth_load --logins 64 --pollers 8 --duration 10
+
+``--logins`` clients call POST /api/auth/login back to back while ``--pollers``
+clients poll a stand-in for GET /conversations/{id}/messages (a sync endpoint on
+the server threadpool, like the real one, doing ``--poll-ms`` of simulated
+Postgres work). It runs twice:
+
+- inline: the previous login handler (sync endpoint verifying Argon2 on the
+  server threadpool);
+- pool: api.routers.auth.login (Argon2 on utils.auth.password_hash_pool; calls
+  beyond PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_SIZE get 503).
+
+Users are held in memory; requests go through httpx's ASGI transport, so no
+server or database is needed. Argon2 cost comes from the ARGON2_* settings.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+import dotenv
+
+dotenv.load_dotenv()
+
+import api.routers.auth as auth_router
+import httpx
+from api.schemas import LoginRequest, TokenResponse
+from fastapi import APIRouter, FastAPI, HTTPException, status
+from utils import auth
+
+from benchmarks.db_pool import _percentile
+
+USERNAME = "benchmark"
+PASSWORD = "correct horse battery staple"
+
+
+def build_app(mode: str, poll_ms: float) -> FastAPI:
+    app = FastAPI()
+    if mode == "pool":
+        app.include_router(auth_router.router, prefix="/api")
+    else:
+        legacy = APIRouter(prefix="/api/auth")
+
+        @legacy.post("/login", response_model=TokenResponse)
+        def login(body: LoginRequest):
+            user = auth_router.get_user_by_username(body.username)
+            if not user or not auth.verify_password(body.password, user["password_hash"]):
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+            return TokenResponse(access_token=auth.create_access_token(user["id"]))
+
+        app.include_router(legacy)
+
+    @app.get("/api/conversations/{conversation_id}/messages")
+    def list_messages(conversation_id: str):
+        time.sleep(poll_ms / 1000.0)
+        return []
+
+    return app
+
+
+async def run_mode(mode: str, args: argparse.Namespace) -> Dict[str, object]:
+    app = build_app(mode, args.poll_ms)
+    transport = httpx.ASGITransport(app=app)
+    statuses: Counter = Counter()
+    login_ms: List[float] = []
+    poll_ms: List[float] = []
+    deadline = time.perf_counter() + args.duration
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", timeout=None
+    ) as client:
+
+        async def login_client() -> None:
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                r = await client.post(
+                    "/api/auth/login", json={"username": USERNAME, "password": PASSWORD}
+                )
+                statuses[r.status_code] += 1
+                if r.status_code == 200:
+                    login_ms.append((time.perf_counter() - t0) * 1000.0)
+                else:
+                    await asyncio.sleep(float(r.headers.get("Retry-After", "0")) / 10)
+
+        async def poller() -> None:
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                await client.get("/api/conversations/c1/messages")
+                poll_ms.append((time.perf_counter() - t0) * 1000.0)
+                await asyncio.sleep(args.poll_interval_ms / 1000.0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(
+            *(login_client() for _ in range(args.logins)),
+            *(poller() for _ in range(args.pollers)),
+        )
+        wall = time.perf_counter() - t0
+    auth.password_hash_pool.shutdown()
+    return {
+        "logins/s": statuses[200] / wall,
+        "statuses": dict(statuses),
+        "login": login_ms,
+        "poll": poll_ms,
+    }
+
+
+def _fmt(samples: List[float]) -> str:
+    if not samples:
+        return "n=0"
+    return (
+        f"n={len(samples):<6} p50={statistics.median(samples):8.1f}ms "
+        f"p95={_percentile(samples, 0.95):8.1f}ms p99={_percentile(samples, 0.99):8.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=64, help="concurrent login clients")
+    parser.add_argument("--pollers", type=int, default=8, help="concurrent message pollers")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--poll-ms", type=float, default=2.0, help="simulated DB time per poll")
+    parser.add_argument("--poll-interval-ms", type=float, default=50.0)
+    parser.add_argument("--mode", choices=["inline", "pool"], nargs="+", default=["inline", "pool"])
+    args = parser.parse_args()
+
+    password_hash = auth.hash_password(PASSWORD)
+    users = {USERNAME: {"id": "u1", "username": USERNAME, "password_hash": password_hash}}
+    auth_router.get_user_by_username = lambda name: users.get(name)
+
+    t0 = time.perf_counter()
+    auth.verify_password(PASSWORD, password_hash)
+    print(
+        f"argon2 t={auth.ARGON2_TIME_COST} m={auth.ARGON2_MEMORY_COST}KiB "
+        f"p={auth.ARGON2_PARALLELISM}: verify {(time.perf_counter() - t0) * 1000:.1f}ms; "
+        f"pool workers={auth.PASSWORD_HASH_WORKERS} queue={auth.PASSWORD_HASH_QUEUE_SIZE}"
+    )
+    for mode in args.mode:
+        result = asyncio.run(run_mode(mode, args))
+        print(f"{mode:>6}: {result['logins/s']:.1f} logins/s, statuses {result['statuses']}")
+        print(f"{'':>8}login 200  {_fmt(result['login'])}")
+        print(f"{'':>8}messages   {_fmt(result['poll'])}")
+
+
+if __name__ == "__main__":
+    main()
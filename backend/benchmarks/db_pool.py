@@ -0,0 +1,91 @@
+"""
+Compare per-operation latency of a fresh psycopg2 connection vs the pooled
+``utils.db.connection()`` against the configured Postgres.
+
+    python -m benchmarks.db_pool --iterations 500
+
+Each iteration runs the same lookup ``get_user_by_id`` issues; the difference
+between the two p50s is the TCP + auth handshake the pool removes.
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+import dotenv
+
+dotenv.load_dotenv()
+
+from utils.db import close_pool, connection, get_connection
+
+QUERY = "SELECT id::text, username, email, created_at FROM app_user LIMIT 1"
+
+
+def _fresh() -> None:
+    conn = get_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(QUERY)
+            cur.fetchall()
+    finally:
+        conn.close()
+
+
+def _pooled() -> None:
+    with connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(QUERY)
+            cur.fetchall()
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def run(name: str, fn: Callable[[], None], iterations: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    print(
+        f"{name:<8} n={iterations} "
+        f"p50={statistics.median(samples):.3f}ms "
+        f"p95={_percentile(samples, 0.95):.3f}ms "
+        f"p99={_percentile(samples, 0.99):.3f}ms "
+        f"mean={statistics.fmean(samples):.3f}ms"
+    )
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--ops-per-request",
+        type=int,
+        default=6,
+        help="DB calls per POST /messages, to project per-request savings",
+    )
+    args = parser.parse_args()
+
+    fresh = run("fresh", _fresh, args.iterations, args.warmup)
+    pooled = run("pooled", _pooled, args.iterations, args.warmup)
+    close_pool()
+
+    saved = statistics.median(fresh) - statistics.median(pooled)
+    print(
+        f"handshake cost removed: {saved:.3f}ms per call at p50, "
+        f"~{saved * args.ops_per_request:.3f}ms per request "
+        f"({args.ops_per_request} DB calls)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+"""
+In-process stand-ins for the LLM, Milvus and Postgres, for offline benchmarks of
+the behavior trees (see benchmarks/tree_replay.py).
+
+- ``FakeChatModel``: deterministic ``invoke``/``ainvoke``/``stream``/``astream``
+  with configurable latency. It recognises which prompt template it was given and
+  answers in that prompt's output format, grounding entities through the store
+  and the ambiguous/clear decision through ``labels`` (request text -> ambiguous).
+- ``InMemoryEntityStore``: token-overlap search over an entity list with the
+  ``MilvusHybridEntityStore`` search API.
+- ``InMemoryMessageStore``: ``load_messages``/``insert_turn`` (sync + async) and the
+  rolling-summary queries kept in memory; ``install()`` patches them into utils.db /
+  utils.async_db and the nodes.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import prompts.action_prompt as action_prompt
+import prompts.ambiguity_discriminator_prompt as discriminator_prompt
+import prompts.ambiguity_prompt as ambiguity_prompt
+import prompts.answer_prompt as answer_prompt
+import prompts.conversation_summary_prompt as conversation_summary_prompt
+import prompts.entity_resolve_prompt as entity_resolve_prompt
+import prompts.knowno_ambig_classify_prompt as knowno_classify_prompt
+import prompts.knowno_ambig_detect_prompt as knowno_detect_prompt
+import prompts.knowno_ambig_type_prompt as knowno_type_prompt
+import prompts.knowno_fused_prompt as knowno_fused_prompt
+import prompts.knowno_response_prompt as knowno_response_prompt
+import prompts.knowno_viable_object_prompt as knowno_viable_prompt
+import prompts.potential_entities_predict_prompt as potential_entities_prompt
+import prompts.repair_common_sense_prompt as repair_common_sense_prompt
+import prompts.repair_preference_prompt as repair_preference_prompt
+import prompts.repair_safety_prompt as repair_safety_prompt
+import prompts.standalone_question_prompt as standalone_prompt
+from clients.milvus import SearchResultRow
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+AMBIGUITY_TYPES = ["Safety", "Common sense", "Preference"]
+
+# Template -> kind; a prompt is recognised by the template text before its first placeholder
+_TEMPLATES = {
+    "standalone": standalone_prompt.STANDALONE_REQUEST_PROMPT,
+    "potential_entities": potential_entities_prompt.POTENTIAL_ENTITIES_PROMPT,
+    "entity_resolve": entity_resolve_prompt.ENTITY_RESOLVE_PROMPT,
+    "entity_actions": action_prompt.ENTITY_ACTIONS_PROMPT,
+    "viable_objects": knowno_viable_prompt.EXTRACT_VIABLE_OBJECTS_PROMPT,
+    "knowno_detect": knowno_detect_prompt.DETECT_AMBIGUOUS_PROMPT,
+    "knowno_classify": knowno_classify_prompt.AMBIG_CLASSIFY_PROMPT,
+    "knowno_type": knowno_type_prompt.DETECT_AMBIGUITY_TYPE_PROMPT,
+    "knowno_fused": knowno_fused_prompt.KNOWNO_FUSED_PROMPT,
+    "knowno_response": knowno_response_prompt.AMBIGUITY_RESPONSE_PROMPT,
+    "ambiguity": ambiguity_prompt.AMBIGUITY_PROMPT,
+    "discriminator": discriminator_prompt.AMBIGUITY_DISCRIMINATOR_PROMPT,
+    "repair": repair_common_sense_prompt.COMMON_SENSE_REPAIR_PROMPT,
+    "repair_preference": repair_preference_prompt.PREFERENCE_REPAIR_PROMPT,
+    "repair_safety": repair_safety_prompt.SAFETY_REPAIR_PROMPT,
+    "answer": answer_prompt.ANSWER_PROMPT,
+    "conversation_summary": conversation_summary_prompt.CONVERSATION_SUMMARY_PROMPT,
+}
+_PREFIXES = sorted(
+    ((t.strip().split("{", 1)[0], kind) for kind, t in _TEMPLATES.items()),
+    key=lambda p: -len(p[0]),
+)
+# Lines that introduce the (rewritten) user request in the templates above
+_REQUEST_MARKERS = (
+    "\nUSER_REQUEST:\n",
+    "\nCURRENT_USER_REQUEST:\n",
+    "\nStandalone request:\n",
+    "Current Query: ",
+    "- Query: ",
+)
+
+
+def _request_slot(template: str):
+    """(marker, occurrence) of the request placeholder; examples may reuse the marker."""
+    for marker in _REQUEST_MARKERS:
+        pos = template.find(marker + "{")
+        if pos >= 0:
+            return marker, template.count(marker, 0, pos)
+    return None
+
+
+_REQUEST_SLOTS = {kind: _request_slot(t.lstrip()) for kind, t in _TEMPLATES.items()}
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+def _crc(text: str) -> int:
+    return zlib.crc32(text.encode("utf-8"))
+
+
+def prompt_kind(prompt: str) -> str:
+    prompt = prompt.lstrip()
+    for prefix, kind in _PREFIXES:
+        if prefix and prompt.startswith(prefix):
+            return kind
+    return "unknown"
+
+
+def _fake_summary(prompt: str, max_words: int = 60) -> str:
+    """Previous summary + the user lines of NEW_TURNS, cut to the last ``max_words`` words."""
+    previous = prompt.split("\nPREVIOUS_SUMMARY:\n", 1)[-1].split("\n\nNEW_TURNS:", 1)[0]
+    turns = prompt.split("\nNEW_TURNS:\n", 1)[-1].split("\n\nOutput:", 1)[0]
+    asked = [line[len("User: "):] for line in turns.splitlines() if line.startswith("User: ")]
+    parts = [] if previous.strip() == "(none)" else [previous.strip()]
+    if asked:
+        parts.append("The user asked: " + "; ".join(asked) + ".")
+    return " ".join(" ".join(parts).split()[-max_words:])
+
+
+def prompt_request(prompt: str, kind: Optional[str] = None) -> str:
+    """The request line the prompt was built for ("" if the template has none)."""
+    slot = _REQUEST_SLOTS.get(kind or prompt_kind(prompt))
+    if slot is None:
+        return ""
+    marker, occurrence = slot
+    start = -1
+    for _ in range(occurrence + 1):
+        start = prompt.find(marker, start + 1)
+        if start < 0:
+            return ""
+    return prompt[start + len(marker):].split("\n", 1)[0].strip()
+
+
+class InMemoryEntityStore:
+    """
+    Entity search by token overlap, with the MilvusHybridEntityStore search API.
+    ``search_latency_ms`` is added to every search / search_many call (the TEI embed
+    plus Milvus round trip of the real store).
+    """
+
+    def __init__(self, entities: Iterable[str], search_latency_ms: float = 0.0):
+        self.search_latency = max(search_latency_ms, 0.0) / 1000.0
+        self.entities = sorted({e.strip() for e in entities if e and e.strip()})
+        self._ids = {e: i for i, e in enumerate(self.entities)}
+        self._tokens = {e: set(_tokens(e)) for e in self.entities}
+        self._by_token: Dict[str, List[str]] = defaultdict(list)
+        for entity, toks in self._tokens.items():
+            for tok in toks:
+                self._by_token[tok].append(entity)
+        # head noun (last token) of every entity, used to spot mentions in requests
+        self.heads = {_tokens(e)[-1] for e in self.entities if _tokens(e)}
+
+    def _score(self, query_tokens: set, entity: str) -> float:
+        """Share of the query or of the entity name covered (whichever is larger)."""
+        toks = self._tokens[entity]
+        common = len(query_tokens & toks)
+        return max(common / len(query_tokens), common / len(toks))
+
+    def _rank(
+        self, query: str, top_k: int = 5, min_score: float = 0.0, **kwargs
+    ) -> List[SearchResultRow]:
+        q = set(_tokens(query))
+        candidates = {e for tok in q for e in self._by_token.get(tok, ())}
+        scored = []
+        for entity in candidates:
+            score = self._score(q, entity)
+            if score >= min_score:
+                scored.append((-score, entity))
+        scored.sort()
+        return [
+            SearchResultRow(id=self._ids[e], entity=e, score=-s)
+            for s, e in scored[:top_k]
+        ]
+
+    def search(self, query: str, **kwargs) -> List[SearchResultRow]:
+        time.sleep(self.search_latency)
+        return self._rank(query, **kwargs)
+
+    async def asearch(self, query: str, **kwargs) -> List[SearchResultRow]:
+        await asyncio.sleep(self.search_latency)
+        return self._rank(query, **kwargs)
+
+    def search_many(self, queries: List[str], **kwargs) -> List[List[SearchResultRow]]:
+        time.sleep(self.search_latency)
+        return [self._rank(q, **kwargs) for q in queries]
+
+    async def asearch_many(
+        self, queries: List[str], **kwargs
+    ) -> List[List[SearchResultRow]]:
+        await asyncio.sleep(self.search_latency)
+        return [self._rank(q, **kwargs) for q in queries]
+
+    def mentioned(self, request: str, limit: int = 3) -> List[str]:
+        """Entity head nouns mentioned in ``request`` (what the predictor would return)."""
+        seen: List[str] = []
+        for tok in _tokens(request):
+            if tok in self.heads and tok not in seen:
+                seen.append(tok)
+        return seen[:limit]
+
+    def related(self, request: str) -> List[str]:
+        """Entities sharing a head noun with ``request``, best match for the request first."""
+        out: List[str] = []
+        for head in self.mentioned(request):
+            for row in self._rank(head, top_k=5):
+                if row.entity not in out:
+                    out.append(row.entity)
+        q = set(_tokens(request))
+        return sorted(out, key=lambda e: -self._score(q, e))
+
+
+class FakeChatModel:
+    """
+    Deterministic chat model: same prompt -> same answer and same latency
+    (``latency_ms`` plus up to ``jitter_ms``, seeded by ``seed`` and the prompt).
+    """
+
+    model_name = "fake-chat"
+    temperature = 0.0
+
+    def __init__(
+        self,
+        store: InMemoryEntityStore,
+        labels: Optional[Dict[str, bool]] = None,
+        *,
+        latency_ms: float = 300.0,
+        jitter_ms: float = 100.0,
+        seed: int = 0,
+        reply_words: int = 0,
+    ):
+        self.store = store
+        # Pad replies shown to the user (clarifications, answers) to about this many words
+        self.reply_words = reply_words
+        self.labels = labels or {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.seed = seed
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def _delay(self, prompt: str) -> float:
+        u = random.Random(self.seed ^ _crc(prompt)).random()
+        return max(self.latency_ms + self.jitter_ms * u, 0.0) / 1000.0
+
+    def _ambiguous(self, request: str) -> bool:
+        if request in self.labels:
+            return self.labels[request]
+        return _crc(request) % 2 == 0
+
+    def _viable(self, request: str) -> List[Dict[str, str]]:
+        related = self.store.related(request)
+        keep = related[:3] if self._ambiguous(request) else related[:1]
+        return [{e: f"object for: {request}"} for e in keep]
+
+    def _pad(self, reply: str) -> str:
+        missing = self.reply_words - len(reply.split())
+        if missing <= 0:
+            return reply
+        filler = "then check the kitchen and tell me if anything else is needed".split()
+        return reply + " " + " ".join(filler[i % len(filler)] for i in range(missing))
+
+    def answer(self, prompt: str) -> str:
+        kind = prompt_kind(prompt)
+        with self._lock:
+            self.calls[kind] += 1
+        request = prompt_request(prompt, kind)
+        ambiguous = self._ambiguous(request)
+        amb_type = AMBIGUITY_TYPES[_crc(request) % len(AMBIGUITY_TYPES)]
+
+        if kind == "standalone":
+            return request
+        if kind in ("potential_entities", "entity_resolve"):
+            return json.dumps({"potential_entities": self.store.mentioned(request)})
+        if kind == "entity_actions":
+            return json.dumps(
+                {e: f"object for: {request}" for e in self.store.related(request)}
+            )
+        if kind == "viable_objects":
+            return json.dumps({"viable_objects": self._viable(request)})
+        if kind == "knowno_detect":
+            label = "Ambiguous" if ambiguous else "Unambiguous"
+            return json.dumps({"classification": label, "brief_reason": "replay label"})
+        if kind == "knowno_classify":
+            return json.dumps(
+                {
+                    "classification": "Ambiguous" if ambiguous else "Unambiguous",
+                    "ambiguity_type": amb_type if ambiguous else "None",
+                    "viable_objects": self._viable(request),
+                }
+            )
+        if kind == "knowno_fused":
+            return json.dumps(
+                {
+                    "entity_action": {
+                        e: f"object for: {request}" for e in self.store.related(request)
+                    },
+                    "viable_objects": self._viable(request),
+                    "classification": "Ambiguous" if ambiguous else "Unambiguous",
+                    "ambiguity_type": amb_type if ambiguous else "None",
+                    "brief_reason": "replay label",
+                }
+            )
+        if kind == "knowno_type":
+            return json.dumps({"ambiguity_type": amb_type})
+        if kind == "ambiguity":
+            return "AMBIGUOUS" if ambiguous else "CLEAR"
+        if kind == "discriminator":
+            return amb_type
+        if kind in ("knowno_response", "repair", "repair_preference", "repair_safety"):
+            names = [n for v in self._viable(request) for n in v] or ["one"]
+            return self._pad(f"Which one should I use: {' or '.join(names)}?")
+        if kind == "answer":
+            return self._pad(f"Here is how to {request}")
+        if kind == "conversation_summary":
+            return _fake_summary(prompt)
+        return ""
+
+    def _message(self, prompt: str, content: str, cls=AIMessage):
+        return cls(
+            content=content,
+            usage_metadata={
+                "input_tokens": len(prompt) // 4,
+                "output_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+            },
+        )
+
+    def invoke(self, prompt: str, *args, **kwargs) -> AIMessage:
+        time.sleep(self._delay(prompt))
+        return self._message(prompt, self.answer(prompt))
+
+    async def ainvoke(self, prompt: str, *args, **kwargs) -> AIMessage:
+        await asyncio.sleep(self._delay(prompt))
+        return self._message(prompt, self.answer(prompt))
+
+    def _chunks(self, prompt: str) -> List[str]:
+        words = self.answer(prompt).split(" ")
+        return [w + (" " if i < len(words) - 1 else "") for i, w in enumerate(words)]
+
+    def stream(self, prompt: str, *args, **kwargs):
+        chunks = self._chunks(prompt)
+        for chunk in chunks:
+            time.sleep(self._delay(prompt) / len(chunks))
+            yield AIMessageChunk(content=chunk)
+
+    async def astream(self, prompt: str, *args, **kwargs):
+        chunks = self._chunks(prompt)
+        for chunk in chunks:
+            await asyncio.sleep(self._delay(prompt) / len(chunks))
+            yield AIMessageChunk(content=chunk)
+
+
+class InMemoryMessageStore:
+    """Conversation messages in memory, with the utils.db / utils.async_db signatures."""
+
+    def __init__(self):
+        self._messages: Dict[str, List[dict]] = defaultdict(list)
+        # conversation_id -> (summary, summary_until)
+        self._summaries: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._last_stamp = datetime.min.replace(tzinfo=timezone.utc)
+        self._lock = threading.Lock()
+
+    def _stamp(self) -> str:
+        # Strictly increasing created_at (like clock_timestamp() per row); call under _lock
+        now = datetime.now(timezone.utc)
+        if now <= self._last_stamp:
+            now = self._last_stamp + timedelta(microseconds=1)
+        self._last_stamp = now
+        return now.isoformat()
+
+    @staticmethod
+    def _public(rows: List[dict]) -> List[dict]:
+        return [
+            {"role": m["role"], "content": m["content"], "created_at": m["created_at"]}
+            for m in rows
+        ]
+
+    def _after_summary(self, conversation_id: str) -> Tuple[Optional[str], Optional[str], List[dict]]:
+        summary, until = self._summaries.get(conversation_id, (None, None))
+        rows = self._messages.get(conversation_id, [])
+        if until is not None:
+            rows = [m for m in rows if m["created_at"] > until]
+        return summary, until, rows
+
+    def load_messages(self, conversation_id: str, top_k: int = 30) -> List[dict]:
+        with self._lock:
+            return self._public(self._messages.get(str(conversation_id), [])[-top_k:])
+
+    def load_history(
+        self, conversation_id: str, top_k: int = 30
+    ) -> Tuple[Optional[str], List[dict]]:
+        with self._lock:
+            summary, _, rows = self._after_summary(str(conversation_id))
+            return summary, self._public(rows[-top_k:] if top_k > 0 else [])
+
+    def insert_turn(
+        self,
+        conversation_id: str,
+        user_msg: str,
+        assistant_msg: str,
+        trace: Optional[List[dict]] = None,
+        *,
+        ambiguous: bool = False,
+    ) -> List[dict]:
+        with self._lock:
+            rows = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "conversation_id": str(conversation_id),
+                    "role": role,
+                    "content": content,
+                    "created_at": self._stamp(),
+                    "ambiguous": ambiguous if role == "assistant" else False,
+                    "bot_trace": trace if role == "assistant" else None,
+                    "rating": None,
+                    "rated_at": None,
+                }
+                for role, content in (("user", user_msg), ("assistant", assistant_msg))
+            ]
+            self._messages[str(conversation_id)].extend(rows)
+        return rows
+
+    async def aload_messages(self, conversation_id: str, top_k: int = 30) -> List[dict]:
+        return self.load_messages(conversation_id, top_k)
+
+    async def aload_history(
+        self, conversation_id: str, top_k: int = 30
+    ) -> Tuple[Optional[str], List[dict]]:
+        return self.load_history(conversation_id, top_k)
+
+    async def ainsert_turn(self, *args, **kwargs) -> List[dict]:
+        return self.insert_turn(*args, **kwargs)
+
+    async def aload_unsummarized(
+        self, conversation_id: str, limit: int
+    ) -> Tuple[Optional[str], Optional[str], List[dict]]:
+        with self._lock:
+            summary, until, rows = self._after_summary(str(conversation_id))
+            return summary, until, self._public(rows[:limit])
+
+    async def aupdate_conversation_summary(
+        self,
+        conversation_id: str,
+        summary: str,
+        summary_until: str,
+        previous_until: Optional[str],
+    ) -> bool:
+        with self._lock:
+            current = self._summaries.get(str(conversation_id), (None, None))[1]
+            if current != previous_until:
+                return False
+            self._summaries[str(conversation_id)] = (summary, summary_until)
+            return True
+
+    def install(self) -> None:
+        """Route utils.db / utils.async_db message I/O (and the nodes' imports) here."""
+        import nodes.load_history
+        import nodes.save_message
+        import nodes_knowno.load_history
+        import nodes_knowno.save_message
+        from utils import async_db, db
+
+        db.load_messages = self.load_messages
+        db.load_history = self.load_history
+        db.insert_turn = self.insert_turn
+        async_db.load_messages = self.aload_messages
+        async_db.load_history = self.aload_history
+        async_db.insert_turn = self.ainsert_turn
+        async_db.load_unsummarized = self.aload_unsummarized
+        async_db.update_conversation_summary = self.aupdate_conversation_summary
+        for module in (nodes.load_history, nodes_knowno.load_history):
+            module.load_messages = self.load_messages
+            module.load_history = self.load_history
+        for module in (nodes.save_message, nodes_knowno.save_message):
+            module.insert_turn = self.insert_turn
@@ -0,0 +1,161 @@
+"""
+Prompt tokens per turn over long conversations, with raw history windows vs the
+rolling conversation summary (utils/conversation_summary.py).
+
+    python -m benchmarks.history_summary --conversations 4 --turns 40
+
+AmbiK requests are replayed as ``--conversations`` conversations of ``--turns``
+turns each through the KnowNo tree (``build_knowno_tree``). It runs twice:
+
+- raw: LoadHistory puts the last 30 lines on the blackboard and every prompt
+  inlines its own 10-20 line window;
+- summary: ``history_summary=True`` plus ConversationSummarizer folds after every
+  turn (what the messages router schedules), finished before the conversation's
+  next turn like a user reading the reply would.
+
+Per bucket of turns it prints the mean LLM input tokens of the tree, and for the
+summary run the summarizer's own tokens per turn (amortized). The LLM is the
+offline FakeChatModel (tokens = characters / 4, assistant replies padded to
+``--reply-words``) and messages stay in memory.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import uuid
+from collections import defaultdict
+from typing import Dict, List
+
+import dotenv
+
+dotenv.load_dotenv()
+
+from behavior_tree import TreePool, build_knowno_tree, tick_async
+from nodes_knowno import Blackboard
+from utils.conversation_summary import ConversationSummarizer
+from utils.history_cache import history_cache
+
+from benchmarks.fakes import FakeChatModel, InMemoryEntityStore, InMemoryMessageStore
+from benchmarks.tree_replay import Turn, load_turns
+
+
+class _CountingLLM:
+    """Forwards ``ainvoke`` and adds up the input/output tokens it used."""
+
+    def __init__(self, llm):
+        self._llm = llm
+        self.tokens: Dict[str, int] = defaultdict(int)
+
+    async def ainvoke(self, prompt, *args, **kwargs):
+        response = await self._llm.ainvoke(prompt, *args, **kwargs)
+        for kind, value in (getattr(response, "usage_metadata", None) or {}).items():
+            self.tokens[kind] += value
+        return response
+
+
+async def run_mode(
+    mode: str, llm: FakeChatModel, conversations: List[List[Turn]], args: argparse.Namespace
+) -> Dict[str, Dict[int, List[float]]]:
+    """{"tree" / "summarizer": {turn index: [input tokens per conversation]}}."""
+    history_cache.clear()
+    pool = TreePool(
+        lambda bb: build_knowno_tree(
+            bb=bb, llm=llm, vecdb=llm.store, history_summary=mode == "summary"
+        ),
+        max_size=len(conversations),
+        name=f"history-{mode}",
+        blackboard_cls=Blackboard,
+    )
+    counting = _CountingLLM(llm)
+    summarizer = ConversationSummarizer(counting) if mode == "summary" else None
+    tokens: Dict[str, Dict[int, List[float]]] = {
+        "tree": defaultdict(list),
+        "summarizer": defaultdict(list),
+    }
+
+    async def conversation(turns: List[Turn]) -> None:
+        conversation_id = str(uuid.uuid4())
+        history_cache.put(conversation_id, [], complete=True)
+        for index, (request, _) in enumerate(turns):
+            async with pool.acquire_async() as slot:
+                slot.bb.conversation_id = conversation_id
+                slot.bb.user_id = "benchmark"
+                slot.bb.user_question = request
+                await tick_async(slot.tree)
+                tokens["tree"][index].append(
+                    sum(
+                        entry["timing"].get("input_tokens", 0)
+                        for entry in slot.bb.get_bot_trace()
+                        if entry.get("timing")
+                    )
+                )
+            if summarizer is not None:
+                before = counting.tokens["input_tokens"]
+                while await summarizer.update(conversation_id):
+                    pass
+                tokens["summarizer"][index].append(counting.tokens["input_tokens"] - before)
+
+    await asyncio.gather(*(conversation(turns) for turns in conversations))
+    return tokens
+
+
+def _bucket_mean(samples: Dict[int, List[float]], start: int, end: int) -> float:
+    values = [v for i in range(start, end) for v in samples.get(i, [])]
+    return statistics.mean(values) if values else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--data",
+        default=os.getenv("DATA_PATH", "../data/ambik/AmbiK_data.csv"),
+        help="AmbiK CSV (environment_short, ambiguous_task, unambiguous_direct)",
+    )
+    parser.add_argument("--conversations", type=int, default=4)
+    parser.add_argument("--turns", type=int, default=40, help="turns per conversation")
+    parser.add_argument("--bucket", type=int, default=10, help="turns per printed row")
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--reply-words", type=int, default=60, help="length of the fake assistant replies"
+    )
+    args = parser.parse_args()
+
+    needed = args.conversations * args.turns
+    entities, turns = load_turns(args.data, (needed + 1) // 2)
+    conversations = [
+        turns[i * args.turns:(i + 1) * args.turns] for i in range(args.conversations)
+    ]
+    store = InMemoryEntityStore(entities)
+    InMemoryMessageStore().install()
+    llm = FakeChatModel(
+        store,
+        labels=dict(turns),
+        latency_ms=args.latency_ms,
+        jitter_ms=0.0,
+        reply_words=args.reply_words,
+    )
+    print(
+        f"conversations={args.conversations} turns={args.turns} "
+        f"entities={len(entities)} reply_words={args.reply_words} "
+        "(mean LLM input tokens per turn)"
+    )
+
+    results = {
+        mode: asyncio.run(run_mode(mode, llm, conversations, args))
+        for mode in ("raw", "summary")
+    }
+    print(f"{'turns':>9} {'raw':>8} {'summary':>8} {'+fold':>7} {'saved':>7}")
+    for start in range(0, args.turns, args.bucket):
+        end = min(start + args.bucket, args.turns)
+        raw = _bucket_mean(results["raw"]["tree"], start, end)
+        summary = _bucket_mean(results["summary"]["tree"], start, end)
+        fold = _bucket_mean(results["summary"]["summarizer"], start, end)
+        saved = 1.0 - (summary + fold) / raw if raw else 0.0
+        print(
+            f"{start + 1:>4}-{end:<4} {raw:>8.0f} {summary:>8.0f} {fold:>7.0f} {saved:>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Compare the multi-stage KnowNo tree with its fused single-call variant
+(``build_knowno_tree(fused=True)``) on AmbiK: LLM calls, prompt/completion tokens
+and latency per turn, and how often each variant's ambiguous/clear decision
+matches the AmbiK label.
+
+    python -m benchmarks.knowno_fused --limit 100 --concurrency 1 8
+    python -m benchmarks.knowno_fused --live --limit 20 --concurrency 4
+
+By default the LLM is the offline FakeChatModel (benchmarks/fakes.py): its token
+counts are prompt/answer length / 4 and its decisions follow the labels, so the
+comparison shows the cost side only. ``--live`` uses the OpenAI model configured
+in .env (OPENAI_MODEL_NAME, no response cache) for real usage, latency and
+agreement; entity search and message storage stay in memory either way.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import dotenv
+
+dotenv.load_dotenv()
+
+from behavior_tree import TreePool, build_knowno_tree, tick_async
+from nodes_knowno import Blackboard
+
+from benchmarks.fakes import FakeChatModel, InMemoryEntityStore, InMemoryMessageStore
+from benchmarks.tree_replay import Turn, _summary, load_turns
+
+VARIANTS = ("staged", "fused")
+
+
+def _live_llm():
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model_name=os.getenv("OPENAI_MODEL_NAME", "gpt-3.5-turbo"),
+        temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.7")),
+        api_key=os.getenv("OPENAI_API_KEY", ""),
+    )
+
+
+async def run_variant(
+    pool: TreePool, turns: List[Turn], concurrency: int
+) -> Tuple[float, Dict[str, List[float]], Dict[str, List[float]]]:
+    """(wall s, per-turn stats, per-LLM-node ms) for every turn at ``concurrency``."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for turn in turns:
+        queue.put_nowait(turn)
+    stats: Dict[str, List[float]] = defaultdict(list)
+    node_ms: Dict[str, List[float]] = defaultdict(list)
+
+    async def worker() -> None:
+        while not queue.empty():
+            request, label = queue.get_nowait()
+            async with pool.acquire_async() as slot:
+                slot.bb.conversation_id = str(uuid.uuid4())
+                slot.bb.user_id = "benchmark"
+                slot.bb.user_question = request
+                t0 = time.perf_counter()
+                await tick_async(slot.tree)
+                stats["turn_ms"].append((time.perf_counter() - t0) * 1000.0)
+                stats["agree"].append(float(bool(slot.bb.is_ambiguous) == label))
+                calls = tokens_in = tokens_out = 0
+                for entry in slot.bb.get_bot_trace():
+                    timing = entry.get("timing")
+                    if not timing or "input_tokens" not in timing:
+                        continue
+                    calls += 1
+                    tokens_in += timing["input_tokens"]
+                    tokens_out += timing.get("output_tokens", 0)
+                    node_ms[timing["node"]].append(timing["elapsed_ms"])
+                stats["calls"].append(calls)
+                stats["input_tokens"].append(tokens_in)
+                stats["output_tokens"].append(tokens_out)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - t0, stats, node_ms
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--data",
+        default=os.getenv("DATA_PATH", "../data/ambik/AmbiK_data.csv"),
+        help="AmbiK CSV (environment_short, ambiguous_task, unambiguous_direct)",
+    )
+    parser.add_argument("--limit", type=int, default=100, help="AmbiK rows (0 = all)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--live", action="store_true", help="real OpenAI model from .env")
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--per-node", action="store_true", help="LLM node latencies")
+    args = parser.parse_args()
+
+    entities, turns = load_turns(args.data, args.limit)
+    store = InMemoryEntityStore(entities)
+    InMemoryMessageStore().install()
+    llm = (
+        _live_llm()
+        if args.live
+        else FakeChatModel(
+            store,
+            labels=dict(turns),
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            seed=args.seed,
+        )
+    )
+    print(
+        f"llm={'live ' + llm.model_name if args.live else 'fake'} "
+        f"turns={len(turns)} entities={len(entities)}"
+    )
+    print(
+        f"{'variant':>8} {'conc':>5} {'turns/s':>9} {'calls':>6} {'in tok':>8} "
+        f"{'out tok':>8} {'agree':>6}  end-to-end (per turn means)"
+    )
+
+    for concurrency in args.concurrency:
+        for variant in VARIANTS:
+            pool = TreePool(
+                lambda bb: build_knowno_tree(
+                    bb=bb, llm=llm, vecdb=store, fused=variant == "fused"
+                ),
+                max_size=concurrency,
+                name=f"knowno-{variant}{concurrency}",
+                blackboard_cls=Blackboard,
+            )
+            wall, stats, node_ms = asyncio.run(run_variant(pool, turns, concurrency))
+            print(
+                f"{variant:>8} {concurrency:>5} {len(turns) / wall:>9.2f} "
+                f"{statistics.mean(stats['calls']):>6.2f} "
+                f"{statistics.mean(stats['input_tokens']):>8.0f} "
+                f"{statistics.mean(stats['output_tokens']):>8.0f} "
+                f"{statistics.mean(stats['agree']):>6.1%}  {_summary(stats['turn_ms'])}"
+            )
+            if args.per_node:
+                for node, samples in sorted(
+                    node_ms.items(), key=lambda kv: -statistics.median(kv[1])
+                ):
+                    print(f"{'':>16}{node:<32} n={len(samples):<5} {_summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Compare the previous pure-Python BM25 loop with the vectorized
+``SparseEmbedder.embed`` on the AmbiK entity corpus.
+
+    python -m benchmarks.sparse_embedder --data ../data/ambik/AmbiK_data.csv
+
+The embedder is fitted on the unique ``environment_short`` entities (as seed.py
+does); each batch size embeds that many texts drawn from the entities and the
+AmbiK task instructions, and both implementations must return the same vectors.
+"""
+
+import argparse
+import math
+import os
+import random
+import statistics
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+import dotenv
+import pandas as pd
+
+dotenv.load_dotenv()
+
+from clients import SparseEmbedder
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+
+
+def legacy_embed(
+    emb: SparseEmbedder, texts: List[str], normalize: bool = False
+) -> List[Dict[int, float]]:
+    """SparseEmbedder.embed before vectorization (per-token loop over dicts)."""
+    embeddings = []
+    for text in texts:
+        tokens = emb._tokenize(text)
+        if not tokens or not emb.idf:
+            embeddings.append({})
+            continue
+
+        doc_len = len(tokens)
+        freq = defaultdict(int)
+        for t in tokens:
+            freq[t] += 1
+
+        sparse_dict = {}
+        for term, count in freq.items():
+            if term not in emb.idf:
+                continue
+            idf_val = emb.idf[term]
+            numerator = count * (emb.k1 + 1)
+            denominator = count + emb.k1 * (1 - emb.b + emb.b * doc_len / emb.avgdl)
+            weight = idf_val * (numerator / denominator)
+            idx = emb.term_to_index.get(term)
+            if idx is not None:
+                sparse_dict[idx] = weight
+
+        if normalize and sparse_dict:
+            norm = math.sqrt(sum(v**2 for v in sparse_dict.values()))
+            if norm > 0:
+                for k in sparse_dict:
+                    sparse_dict[k] /= norm
+
+        embeddings.append(sparse_dict)
+    return embeddings
+
+
+def load_corpus(csv_path: str) -> tuple[List[str], List[str]]:
+    """(unique entities, query texts) from the AmbiK CSV."""
+    df = pd.read_csv(csv_path, index_col=None)
+    entities = sorted(
+        {
+            e.strip()
+            for row in df["environment_short"].dropna().astype(str)
+            for e in row.split(",")
+            if e.strip()
+        },
+        key=str.lower,
+    )
+    queries = list(entities)
+    for col in ("ambiguous_task", "unambiguous_direct"):
+        if col in df.columns:
+            queries.extend(df[col].dropna().astype(str).tolist())
+    return entities, queries
+
+
+def _same(a: List[Dict[int, float]], b: List[Dict[int, float]]) -> bool:
+    return len(a) == len(b) and all(
+        x.keys() == y.keys() and all(math.isclose(x[k], y[k], rel_tol=1e-9) for k in x)
+        for x, y in zip(a, b)
+    )
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--data",
+        default=os.getenv("DATA_PATH", "../data/ambik/AmbiK_data.csv"),
+        help="AmbiK CSV (environment_short column)",
+    )
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--normalize", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    entities, queries = load_corpus(args.data)
+    emb = SparseEmbedder()
+    emb.fit(entities)
+    print(
+        f"corpus: {len(entities)} entities, vocabulary {emb.get_vocabulary_size()}, "
+        f"{len(queries)} query texts"
+    )
+
+    rng = random.Random(args.seed)
+    print(f"{'batch':>7} {'legacy ms':>11} {'vector ms':>11} {'speedup':>8}")
+    for size in args.batch_sizes:
+        texts = [rng.choice(queries) for _ in range(size)]
+        old = legacy_embed(emb, texts, normalize=args.normalize)
+        new = emb.embed(texts, normalize=args.normalize)
+        if not _same(old, new):
+            raise SystemExit(f"batch {size}: vectorized output differs from legacy")
+
+        t_old = _time(lambda: legacy_embed(emb, texts, args.normalize), args.repeat)
+        t_new = _time(lambda: emb.embed(texts, normalize=args.normalize), args.repeat)
+        print(f"{size:>7} {t_old:>11.3f} {t_new:>11.3f} {t_old / t_new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Replay AmbiK tasks through a behavior tree offline and report throughput and
+latency percentiles (end to end and per node).
+
+    python -m benchmarks.tree_replay --tree knowno --limit 200 --concurrency 1 8 32
+
+The LLM, Milvus and Postgres are replaced by the in-process fakes in
+benchmarks/fakes.py: the fake model sleeps ``--latency-ms`` (+ up to ``--jitter-ms``)
+per call and answers ambiguous/clear according to the AmbiK row the request came
+from (``ambiguous_task`` vs ``unambiguous_direct``); the entity store sleeps
+``--search-latency-ms`` per search. Each turn is a new conversation. Per-node numbers come from the bot_trace timing entries BaseNode
+writes.
+
+For a DependencySequence root the stages it runs under tick_async are printed
+first; "overlap" is the per-turn sum of node times minus the turn time, i.e. what
+running independent nodes side by side saved (about 0 for a serial tree).
+"""
+
+import argparse
+import asyncio
+import functools
+import os
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import dotenv
+import pandas as pd
+
+dotenv.load_dotenv()
+
+from behavior_tree import (DependencySequence, TreePool, build_knowno_tree,
+                           build_tree, tick_async)
+from nodes import Blackboard
+from nodes_knowno import Blackboard as KnownoBlackboard
+
+from benchmarks.fakes import FakeChatModel, InMemoryEntityStore, InMemoryMessageStore
+
+CONCURRENCY = [1, 8, 32]
+
+Turn = Tuple[str, bool]
+
+
+def load_turns(csv_path: str, limit: int) -> Tuple[List[str], List[Turn]]:
+    """(entities, [(request, ambiguous)]) from the AmbiK CSV; one row gives two turns."""
+    df = pd.read_csv(csv_path, index_col=None)
+    if limit:
+        df = df.head(limit)
+    entities = sorted(
+        {
+            e.strip()
+            for row in df["environment_short"].dropna().astype(str)
+            for e in row.split(",")
+            if e.strip()
+        }
+    )
+    turns: List[Turn] = []
+    for _, row in df.iterrows():
+        for col, ambiguous in (("ambiguous_task", True), ("unambiguous_direct", False)):
+            text = row.get(col)
+            if isinstance(text, str) and text.strip():
+                turns.append((" ".join(text.split()), ambiguous))
+    return entities, turns
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _summary(samples: List[float]) -> str:
+    return (
+        f"p50={statistics.median(samples):8.1f}ms "
+        f"p95={_percentile(samples, 0.95):8.1f}ms "
+        f"p99={_percentile(samples, 0.99):8.1f}ms"
+    )
+
+
+async def run_level(
+    pool: TreePool, turns: List[Turn], concurrency: int, execution: str
+) -> Tuple[float, List[float], List[float], Dict[str, List[float]], int]:
+    """
+    Run every turn with ``concurrency`` in flight;
+    (wall s, turn ms, overlap ms, node ms, ambiguous).
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    for turn in turns:
+        queue.put_nowait(turn)
+    turn_ms: List[float] = []
+    overlap_ms: List[float] = []
+    node_ms: Dict[str, List[float]] = defaultdict(list)
+    ambiguous_count = 0
+
+    async def worker() -> None:
+        nonlocal ambiguous_count
+        while not queue.empty():
+            request, _ = queue.get_nowait()
+            async with pool.acquire_async() as slot:
+                slot.bb.conversation_id = str(uuid.uuid4())
+                slot.bb.user_id = "benchmark"
+                slot.bb.user_question = request
+                t0 = time.perf_counter()
+                if execution == "sync":
+                    await asyncio.to_thread(slot.tree.tick)
+                else:
+                    await tick_async(slot.tree)
+                turn_ms.append((time.perf_counter() - t0) * 1000.0)
+                ambiguous_count += bool(slot.bb.is_ambiguous)
+                nodes_total = 0.0
+                for entry in slot.bb.get_bot_trace():
+                    timing = entry.get("timing")
+                    if timing:
+                        node_ms[timing["node"]].append(timing["elapsed_ms"])
+                        nodes_total += timing["elapsed_ms"]
+                overlap_ms.append(nodes_total - turn_ms[-1])
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - t0, turn_ms, overlap_ms, node_ms, ambiguous_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--data",
+        default=os.getenv("DATA_PATH", "../data/ambik/AmbiK_data.csv"),
+        help="AmbiK CSV (environment_short, ambiguous_task, unambiguous_direct)",
+    )
+    parser.add_argument("--tree", choices=["main", "knowno"], default="knowno")
+    parser.add_argument("--limit", type=int, default=100, help="AmbiK rows (0 = all)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY)
+    parser.add_argument("--execution", choices=["async", "sync"], default="async")
+    parser.add_argument("--speculative", action="store_true")
+    parser.add_argument(
+        "--fused", action="store_true", help="knowno tree: single-call reasoning variant"
+    )
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument(
+        "--search-latency-ms", type=float, default=30.0, help="per entity search call"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--per-node", action="store_true", help="per-node table per level")
+    args = parser.parse_args()
+
+    entities, turns = load_turns(args.data, args.limit)
+    store = InMemoryEntityStore(entities, search_latency_ms=args.search_latency_ms)
+    messages = InMemoryMessageStore()
+    messages.install()
+    llm = FakeChatModel(
+        store,
+        labels=dict(turns),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+    )
+    if args.tree == "knowno":
+        builder = functools.partial(build_knowno_tree, fused=args.fused)
+        bb_cls = KnownoBlackboard
+    else:
+        builder, bb_cls = build_tree, Blackboard
+    print(
+        f"tree={args.tree} fused={args.fused} execution={args.execution} speculative={args.speculative} "
+        f"turns={len(turns)} entities={len(entities)} "
+        f"llm={args.latency_ms:.0f}+{args.jitter_ms:.0f}ms search={args.search_latency_ms:.0f}ms"
+    )
+    make_tree = lambda bb: builder(
+        bb=bb, llm=llm, vecdb=store, speculative=args.speculative
+    )
+    root = make_tree(bb_cls()).root
+    if isinstance(root, DependencySequence):
+        print("stages:", " -> ".join(" | ".join(stage) for stage in root.stages()))
+    print(f"{'conc':>5} {'turns/s':>9} {'ambig':>6} {'overlap':>9}  end-to-end")
+
+    for concurrency in args.concurrency:
+        pool = TreePool(
+            make_tree,
+            max_size=concurrency,
+            name=f"replay{concurrency}",
+            blackboard_cls=bb_cls,
+        )
+        wall, turn_ms, overlap_ms, node_ms, ambiguous = asyncio.run(
+            run_level(pool, turns, concurrency, args.execution)
+        )
+        print(
+            f"{concurrency:>5} {len(turns) / wall:>9.2f} {ambiguous:>6} "
+            f"{statistics.median(overlap_ms):>7.1f}ms  {_summary(turn_ms)}"
+        )
+        if args.per_node or concurrency == args.concurrency[-1]:
+            for node, samples in sorted(
+                node_ms.items(), key=lambda kv: -statistics.median(kv[1])
+            ):
+                print(f"{'':>22}{node:<32} n={len(samples):<5} {_summary(samples)}")
+
+    print("llm calls by prompt (all levels):", dict(sorted(llm.calls.items())))
+
+
+if __name__ == "__main__":
+    main()
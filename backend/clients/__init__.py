@@ -1,8 +1,18 @@
+from .embedding_cache import (CachedDenseEmbedder, CachedSparseEmbedder,
+                              EmbeddingCache)
 from .llm import get_chat_model
+from .llm_cache import CachedChatModel, LLMResponseCache
+from .local_store import LocalHybridEntityStore
 from .milvus import MilvusHybridEntityStore
 from .text_embedder import DenseEmbedder, SparseEmbedder
 
 __all__ = [
+    "CachedChatModel",
+    "CachedDenseEmbedder",
+    "CachedSparseEmbedder",
+    "EmbeddingCache",
+    "LLMResponseCache",
+    "LocalHybridEntityStore",
     "DenseEmbedder",
     "SparseEmbedder",
     "get_chat_model",
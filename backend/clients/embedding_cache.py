@@ -0,0 +1,304 @@
+"""
+LRU cache (plus optional on-disk tier) in front of DenseEmbedder / SparseEmbedder.
+
+Entity names and standalone requests repeat a lot ("whisk", "get the bowl"), so the
+wrappers below answer repeated texts from memory and only send misses to TEI.
+Keys are ``model_id + normalized text``; the disk tier is a SQLite file read through
+mmap (``PRAGMA mmap_size``) so it survives restarts and can be shared by workers.
+"""
+
+import array
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from utils.metrics import EMBEDDING_CACHE_LOOKUPS
+
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes], Any]
+
+
+def _encode_dense(vec: List[float]) -> bytes:
+    return array.array("d", vec).tobytes()
+
+
+def _decode_dense(blob: bytes) -> List[float]:
+    out = array.array("d")
+    out.frombytes(blob)
+    return out.tolist()
+
+
+def _encode_sparse(vec: Dict[int, float]) -> bytes:
+    return json.dumps(vec).encode("utf-8")
+
+
+def _decode_sparse(blob: bytes) -> Dict[int, float]:
+    return {int(k): float(v) for k, v in json.loads(blob).items()}
+
+
+class _DiskTier:
+    """Key/value BLOB store in SQLite, memory-mapped for reads."""
+
+    def __init__(self, path: str, mmap_bytes: int = 256 * 1024 * 1024):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_bytes)}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM embedding WHERE key IN ({marks})", list(keys)
+            ).fetchall()
+        return {k: v for k, v in rows}
+
+    def put_many(self, items: Sequence[Tuple[str, bytes]]) -> None:
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embedding (key, value) VALUES (?, ?)", items
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    """
+    Thread-safe LRU of ``key -> vector`` with hit/miss counters (also exported as
+    embedding_cache_lookups_total, labelled by ``name``).
+
+    ``max_entries`` bounds the memory tier; with ``disk_path`` set, evicted and new
+    entries are also kept on disk and looked up there before counting a miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        *,
+        name: str = "dense",
+        disk_path: Optional[str] = None,
+        encode: Encoder = _encode_dense,
+        decode: Decoder = _decode_dense,
+    ):
+        self.name = name
+        self.max_entries = max(int(max_entries), 0)
+        self._encode = encode
+        self._decode = decode
+        self._lru: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(disk_path) if disk_path else None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_sparse(
+        cls, max_entries: int = 4096, *, disk_path: Optional[str] = None
+    ) -> "EmbeddingCache":
+        """Cache storing SparseEmbedder ``{index: weight}`` dicts."""
+        return cls(
+            max_entries,
+            name="sparse",
+            disk_path=disk_path,
+            encode=_encode_sparse,
+            decode=_decode_sparse,
+        )
+
+    @staticmethod
+    def make_key(model_id: str, text: str) -> str:
+        return hashlib.sha1(f"{model_id}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.max_entries == 0:
+            return
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Cached values for ``keys`` (missing keys are absent from the result)."""
+        found: Dict[str, Any] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    self._lru.move_to_end(key)
+                    found[key] = self._lru[key]
+        memory_hits = len(found)
+
+        disk_found: Dict[str, Any] = {}
+        if self._disk is not None:
+            rest = [k for k in dict.fromkeys(keys) if k not in found]
+            disk_found = {
+                k: self._decode(v) for k, v in self._disk.get_many(rest).items()
+            }
+
+        misses = len(set(keys)) - memory_hits - len(disk_found)
+        with self._lock:
+            for key, value in disk_found.items():
+                self._remember(key, value)
+            self.hits += memory_hits
+            self.disk_hits += len(disk_found)
+            self.misses += misses
+        for result, count in (
+            ("hit", memory_hits), ("disk_hit", len(disk_found)), ("miss", misses)
+        ):
+            if count:
+                EMBEDDING_CACHE_LOOKUPS.labels(cache=self.name, result=result).inc(count)
+        found.update(disk_found)
+        return found
+
+    def put_many(self, items: Sequence[Tuple[str, Any]]) -> None:
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value)
+        if self._disk is not None:
+            self._disk.put_many([(k, self._encode(v)) for k, v in items])
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "size": len(self._lru),
+                "max_entries": self.max_entries,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+
+class CachedDenseEmbedder:
+    """
+    DenseEmbedder with an EmbeddingCache in front: embed()/aembed() only send
+    the texts that are not cached (same signatures and return shape).
+    """
+
+    def __init__(
+        self,
+        embedder,
+        cache: Optional[EmbeddingCache] = None,
+        *,
+        model_id: Optional[str] = None,
+    ):
+        self.embedder = embedder
+        self.cache = cache if cache is not None else EmbeddingCache()
+        # TEI serves one model per URL, so the URL is a sensible default model id
+        self.model_id = model_id or getattr(embedder, "url", type(embedder).__name__)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    def _lookup(
+        self, texts: Union[str, List[str]]
+    ) -> Tuple[List[str], Dict[str, Any], List[Tuple[str, str]]]:
+        """Keys per input, cached vectors, and (key, text) pairs to embed (deduplicated)."""
+        inputs = self.embedder._inputs(texts)
+        keys = [
+            self.cache.make_key(self.model_id, self.normalize(t)) for t in inputs
+        ]
+        found = self.cache.get_many(keys)
+        missing = {k: t for k, t in zip(keys, inputs) if k not in found}
+        return keys, found, list(missing.items())
+
+    def _finish(
+        self,
+        keys: List[str],
+        found: Dict[str, Any],
+        missing: List[Tuple[str, str]],
+        vectors: List[List[float]],
+    ) -> List[List[float]]:
+        fresh = [(k, v) for (k, _), v in zip(missing, vectors)]
+        self.cache.put_many(fresh)
+        found.update(fresh)
+        return [list(found[k]) for k in keys]
+
+    def embed(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts)
+        vectors = self.embedder.embed([t for _, t in missing]) if missing else []
+        return self._finish(keys, found, missing, vectors)
+
+    async def aembed(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts)
+        vectors = await self.embedder.aembed([t for _, t in missing]) if missing else []
+        return self._finish(keys, found, missing, vectors)
+
+    def close(self) -> None:
+        self.embedder.close()
+        self.cache.close()
+
+    async def aclose(self) -> None:
+        await self.embedder.aclose()
+        self.cache.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self.embedder, name)
+
+
+class CachedSparseEmbedder:
+    """
+    SparseEmbedder with an EmbeddingCache in front of embed(); keyed on the BM25
+    token sequence, so texts that differ only in case/punctuation share an entry.
+    The model id is derived from the fitted parameters and the incremental-update
+    version, so a refit or an entity upsert never hits stale entries.
+    """
+
+    def __init__(self, embedder, cache: Optional[EmbeddingCache] = None):
+        self.embedder = embedder
+        self.cache = cache if cache is not None else EmbeddingCache.for_sparse()
+
+    @property
+    def model_id(self) -> str:
+        e = self.embedder
+        return (
+            f"bm25:{e.k1}:{e.b}:{e.epsilon}:{e.corpus_size}:{e.avgdl}:"
+            f"{e.get_vocabulary_size()}:{getattr(e, 'version', 0)}"
+        )
+
+    def embed(
+        self, texts: Union[str, List[str]], normalize: bool = False
+    ) -> Union[Dict[int, float], List[Dict[int, float]]]:
+        single_input = isinstance(texts, str)
+        inputs = [texts] if single_input else list(texts)
+
+        model_id = f"{self.model_id}:{int(bool(normalize))}"
+        keys = [
+            self.cache.make_key(model_id, " ".join(self.embedder._tokenize(t)))
+            for t in inputs
+        ]
+        found = self.cache.get_many(keys)
+        missing = {k: t for k, t in zip(keys, inputs) if k not in found}
+        if missing:
+            vectors = self.embedder.embed(list(missing.values()), normalize=normalize)
+            fresh = list(zip(missing.keys(), vectors))
+            self.cache.put_many(fresh)
+            found.update(fresh)
+
+        out = [dict(found[k]) for k in keys]
+        return out[0] if single_input else out
+
+    def __getattr__(self, name: str):
+        return getattr(self.embedder, name)
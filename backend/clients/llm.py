@@ -2,6 +2,8 @@ import os
 
 from langchain_openai import ChatOpenAI
 
+from .llm_cache import CachedChatModel, LLMResponseCache
+
 
 def get_chat_model():
     api_key = os.getenv("OPENAI_API_KEY", "")
@@ -12,6 +14,17 @@ def get_chat_model():
         model_name=model_name, temperature=temperature, api_key=api_key
     )
 
+    # Response cache; nodes opt in per call (LLMNode.cache_llm), 0 disables it
+    cache_size = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+    cache_path = os.getenv("LLM_CACHE_PATH", "").strip() or None
+    if cache_size > 0 or cache_path:
+        cache = LLMResponseCache(
+            cache_size,
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+            sqlite_path=cache_path,
+        )
+        return CachedChatModel(chat_model, cache)
+
     return chat_model
 
 
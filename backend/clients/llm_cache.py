@@ -0,0 +1,212 @@
+"""
+Response cache for the chat model returned by clients.llm.get_chat_model().
+
+Nodes whose prompt fully determines the answer they need (standalone rewrite,
+entity extraction, ambiguity classification, ...) opt in per call; a repeated
+prompt is then answered from memory (or the optional SQLite file) instead of a new
+LLM round trip. Keys are ``model name + temperature + sha256(prompt)``; entries
+expire after ``ttl_seconds``.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+
+from utils.metrics import LLM_CACHE_LOOKUPS
+
+
+class _SQLiteBackend:
+    """Shared/persistent tier: key -> (content, expires_at)."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_response ("
+            " key TEXT PRIMARY KEY, content TEXT NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, Optional[float]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, expires_at FROM llm_response WHERE key = ?", (key,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, key: str, content: str, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response (key, content, expires_at)"
+                " VALUES (?, ?, ?)",
+                (key, content, expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_response WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """
+    Thread-safe LRU of prompt key -> response content, with TTL and hit/miss
+    counters (overall and per tag, e.g. node name).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        *,
+        ttl_seconds: Optional[float] = 3600.0,
+        sqlite_path: Optional[str] = None,
+    ):
+        self.max_entries = max(int(max_entries), 0)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._lru: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._backend = _SQLiteBackend(sqlite_path) if sqlite_path else None
+
+        self.hits = 0
+        self.misses = 0
+        self._by_tag: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0}
+        )
+
+    @staticmethod
+    def make_key(model: str, temperature: Any, prompt: Any) -> str:
+        text = prompt if isinstance(prompt, str) else json.dumps(prompt, default=str)
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{temperature}:{digest}"
+
+    def _count(self, tag: Optional[str], hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+            if tag:
+                self._by_tag[tag]["hits" if hit else "misses"] += 1
+        LLM_CACHE_LOOKUPS.labels(result="hit" if hit else "miss").inc()
+
+    def _remember(self, key: str, entry: Tuple[str, Optional[float]]) -> None:
+        if self.max_entries == 0:
+            return
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, key: str, *, tag: Optional[str] = None) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if entry[1] is not None and entry[1] <= now:
+                    del self._lru[key]
+                    entry = None
+                else:
+                    self._lru.move_to_end(key)
+
+        if entry is None and self._backend is not None:
+            entry = self._backend.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                self._backend.delete(key)
+                entry = None
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, entry)
+
+        self._count(tag, entry is not None)
+        return entry[0] if entry is not None else None
+
+    def put(self, key: str, content: str) -> None:
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._remember(key, (content, expires_at))
+        if self._backend is not None:
+            self._backend.put(key, content, expires_at)
+        LLM_CACHE_LOOKUPS.labels(result="store").inc()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._lru),
+                "max_entries": self.max_entries,
+                "by_tag": {tag: dict(c) for tag, c in self._by_tag.items()},
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def close(self) -> None:
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+
+class CachedChatModel:
+    """
+    Chat model wrapper: ``invoke``/``ainvoke`` accept ``cache=True`` (off by default,
+    so callers opt in) and ``tag`` for per-node metrics; everything else is
+    delegated to the wrapped model. Cached answers come back as ``AIMessage``.
+    """
+
+    def __init__(self, llm, cache: Optional[LLMResponseCache] = None):
+        self.llm = llm
+        self.cache = cache if cache is not None else LLMResponseCache()
+        self.model = str(
+            getattr(llm, "model_name", None) or getattr(llm, "model", None) or ""
+        )
+        self.temperature = getattr(llm, "temperature", None)
+
+    def _key(self, prompt: Any) -> str:
+        return self.cache.make_key(self.model, self.temperature, prompt)
+
+    def invoke(
+        self, input: Any, *args, cache: bool = False, tag: Optional[str] = None, **kwargs
+    ):
+        if not cache:
+            return self.llm.invoke(input, *args, **kwargs)
+        key = self._key(input)
+        content = self.cache.get(key, tag=tag)
+        if content is not None:
+            return AIMessage(content=content)
+        response = self.llm.invoke(input, *args, **kwargs)
+        if isinstance(response.content, str) and response.content.strip():
+            self.cache.put(key, response.content)
+        return response
+
+    async def ainvoke(
+        self, input: Any, *args, cache: bool = False, tag: Optional[str] = None, **kwargs
+    ):
+        if not cache:
+            return await self.llm.ainvoke(input, *args, **kwargs)
+        key = self._key(input)
+        content = self.cache.get(key, tag=tag)
+        if content is not None:
+            return AIMessage(content=content)
+        response = await self.llm.ainvoke(input, *args, **kwargs)
+        if isinstance(response.content, str) and response.content.strip():
+            self.cache.put(key, response.content)
+        return response
+
+    def __getattr__(self, name: str):
+        return getattr(self.llm, name)
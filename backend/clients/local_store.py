@@ -0,0 +1,371 @@
+"""
+In-process hybrid entity index with the MilvusHybridEntityStore API.
+
+For small corpora (the AmbiK entity list is a few thousand names) a gRPC round
+trip to Milvus costs far more than the search itself. LocalHybridEntityStore keeps
+the L2-normalised dense vectors in a NumPy matrix and the BM25 vectors in a SciPy
+CSR matrix, scores every entity with two matrix products and reproduces the
+hybrid_search ranking:
+
+- each side keeps its ``rerank_k`` best candidates (sparse: positive scores only,
+  like the inverted index);
+- scores are normalised as Milvus' WeightedRanker does (COSINE: (1 + s) / 2,
+  IP: 0.5 + atan(s) / pi) and combined with the normalised weights, a side that
+  did not return an entity contributing 0;
+- a dense-only search (no BM25 terms, or sparse weight 0) returns raw cosine
+  scores, as the single-request Milvus search does.
+
+Search is exact (no HNSW), so results can differ slightly from Milvus at the
+tail. With ``path`` the index is persisted to a .npz file on every write and
+loaded by ensure_collection(). Writes build a new snapshot and swap it in, so
+searches never lock.
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from .milvus import (MilvusHybridEntityStore, SearchResultRow, SparseVec,
+                     _ensure_sparse_keys_int, _latest_by_key,
+                     _normalize_weights, normalize_entity)
+
+
+def _csr(vectors: Sequence[SparseVec], n_cols: int) -> sparse.csr_matrix:
+    indptr = [0]
+    indices: List[int] = []
+    data: List[float] = []
+    for vec in vectors:
+        for k, v in vec.items():
+            if 0 <= k < n_cols:
+                indices.append(k)
+                data.append(v)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int64), indptr),
+        shape=(len(vectors), n_cols),
+    )
+
+
+def _normalize_rows(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return m / norms
+
+
+def _top_mask(scores: np.ndarray, k: int, positive_only: bool = False) -> np.ndarray:
+    """Boolean mask of the ``k`` highest scores per row."""
+    mask = np.zeros(scores.shape, dtype=bool)
+    n = scores.shape[1]
+    if n == 0 or k <= 0:
+        return mask
+    if k >= n:
+        mask[:] = True
+    else:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        np.put_along_axis(mask, top, True, axis=1)
+    if positive_only:
+        mask &= scores > 0
+    return mask
+
+
+class _Index(NamedTuple):
+    """Immutable snapshot of the stored rows; writers publish a new one."""
+
+    entities: List[str]
+    ids: np.ndarray
+    dense: np.ndarray
+    sparse_rows: List[SparseVec]
+    matrix: sparse.csr_matrix
+
+    @classmethod
+    def build(cls, entities, ids, dense, sparse_rows) -> "_Index":
+        n_cols = max((k + 1 for vec in sparse_rows for k in vec), default=0)
+        return cls(
+            list(entities),
+            np.asarray(ids, dtype=np.int64),
+            dense,
+            list(sparse_rows),
+            _csr(sparse_rows, n_cols),
+        )
+
+
+class LocalHybridEntityStore(MilvusHybridEntityStore):
+    """MilvusHybridEntityStore without Milvus: exact dense + BM25 search in memory."""
+
+    def __init__(
+        self,
+        *,
+        dense_dim: int,
+        dense_embedder,
+        sparse_embedder,
+        path: Optional[str] = None,
+        collection_name: str = "entity",
+    ):
+        self.collection_name = collection_name
+        self.dense_dim = int(dense_dim)
+        self.dense = dense_embedder
+        self.sparse_embedder = sparse_embedder
+        self.path = path
+
+        # Searches read self._index without locking; writes are serialised here
+        self._write_lock = threading.Lock()
+        self._index = _Index.build(
+            [], [], np.zeros((0, self.dense_dim), dtype=np.float32), []
+        )
+
+    def __len__(self) -> int:
+        return len(self._index.entities)
+
+    def ensure_collection(self, **kwargs: Any) -> None:
+        """Load the persisted index from ``path`` if there is one (Milvus index options are ignored)."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        with np.load(self.path, allow_pickle=False) as f:
+            entities = [str(e) for e in f["entity"]]
+            ids = f["id"] if "id" in f.files else np.arange(len(entities))
+            dense = f["dense"].astype(np.float32)
+            matrix = sparse.csr_matrix(
+                (f["sparse_data"], f["sparse_indices"], f["sparse_indptr"]),
+                shape=tuple(f["sparse_shape"]),
+            )
+        if dense.shape[1] != self.dense_dim:
+            raise ValueError(
+                f"{self.path}: dense dim {dense.shape[1]} != configured {self.dense_dim}"
+            )
+        rows = [
+            dict(zip(matrix.indices[s:e].tolist(), matrix.data[s:e].tolist()))
+            for s, e in zip(matrix.indptr[:-1], matrix.indptr[1:])
+        ]
+        with self._write_lock:
+            self._index = _Index(
+                entities, np.asarray(ids, dtype=np.int64), dense, rows, matrix
+            )
+
+    def _embed(
+        self, entities: List[str], batch_size: int, sparse_embedder=None
+    ) -> Tuple[np.ndarray, List[SparseVec]]:
+        """(L2-normalised dense matrix, sparse vectors) for ``entities``."""
+        sparse_embedder = sparse_embedder or self.sparse_embedder
+        dense_rows: List[List[float]] = []
+        sparse_rows: List[SparseVec] = []
+        for i in range(0, len(entities), batch_size):
+            batch = entities[i : i + batch_size]
+            dense_rows.extend(self.dense.embed(list(batch)))
+            sparse_vecs = sparse_embedder.embed(list(batch))
+            if not isinstance(sparse_vecs, list):
+                sparse_vecs = [sparse_vecs] * len(batch)
+            sparse_rows.extend(sparse_vecs)
+        return self._vectors(dense_rows, sparse_rows)
+
+    def _vectors(
+        self, dense_vecs: Sequence[List[float]], sparse_vecs: Sequence[SparseVec]
+    ) -> Tuple[np.ndarray, List[SparseVec]]:
+        dense = np.asarray(dense_vecs, dtype=np.float32)
+        if dense.ndim != 2 or dense.shape[1] != self.dense_dim:
+            raise ValueError(f"dense vectors must have dim {self.dense_dim}")
+        sparse_rows = [_ensure_sparse_keys_int(sv or {}) for sv in sparse_vecs]
+        return _normalize_rows(dense), sparse_rows
+
+    def _publish(self, index: _Index) -> None:
+        self._index = index
+        if self.path:
+            self._save(index)
+
+    def _next_ids(self, n: int) -> np.ndarray:
+        ids = self._index.ids
+        start = int(ids.max()) + 1 if len(ids) else 0
+        return np.arange(start, start + n, dtype=np.int64)
+
+    def insert_entities(
+        self, entities: Sequence[str], *, batch_size: int = 256
+    ) -> None:
+        ents = [e for e in (entities or []) if isinstance(e, str) and e.strip()]
+        if not ents:
+            return
+        with self._write_lock:
+            self._append(ents, *self._embed(ents, batch_size))
+
+    def insert_vectors(
+        self,
+        entities: Sequence[str],
+        dense_vecs: Sequence[List[float]],
+        sparse_vecs: Sequence[SparseVec],
+    ) -> None:
+        """Insert already embedded entities (one row per entity, in order)."""
+        if not entities:
+            return
+        with self._write_lock:
+            self._append(list(entities), *self._vectors(dense_vecs, sparse_vecs))
+
+    def _append(
+        self, ents: List[str], dense: np.ndarray, sparse_rows: List[SparseVec]
+    ) -> None:
+        cur = self._index
+        self._publish(
+            _Index.build(
+                cur.entities + ents,
+                np.concatenate([cur.ids, self._next_ids(len(ents))]),
+                np.vstack([cur.dense, dense]),
+                cur.sparse_rows + sparse_rows,
+            )
+        )
+
+    def _positions(self, keys: Sequence[str]) -> Dict[str, List[int]]:
+        wanted = set(keys)
+        found: Dict[str, List[int]] = {}
+        for pos, entity in enumerate(self._index.entities):
+            key = normalize_entity(entity)
+            if key in wanted:
+                found.setdefault(key, []).append(pos)
+        return found
+
+    def upsert_entities(
+        self, entities: Sequence[str], *, batch_size: int = 256
+    ) -> Dict[str, int]:
+        """Insert or replace entities by normalized text; replaced rows keep their id."""
+        latest = _latest_by_key(entities)
+        if not latest:
+            return {"inserted": 0, "updated": 0}
+        with self._write_lock:
+            existing = self._positions(list(latest))
+            new = [text for key, text in latest.items() if key not in existing]
+            # Embed with the new entities counted in, but only count them into the
+            # live BM25 statistics once they are stored (a failed upsert changes nothing)
+            texts = list(latest.values())
+            dense, sparse_rows = self._embed(
+                texts, batch_size, self.sparse_embedder.with_documents(new)
+            )
+
+            cur = self._index
+            entities_out = list(cur.entities)
+            ids_out = cur.ids.copy()
+            dense_out = cur.dense.copy()
+            sparse_out = list(cur.sparse_rows)
+            drop: List[int] = []
+            appended: List[int] = []
+            for i, key in enumerate(latest):
+                positions = existing.get(key)
+                if not positions:
+                    appended.append(i)
+                    continue
+                pos, duplicates = positions[0], positions[1:]
+                entities_out[pos] = texts[i]
+                dense_out[pos] = dense[i]
+                sparse_out[pos] = sparse_rows[i]
+                drop.extend(duplicates)
+
+            dropped = set(drop)
+            keep = [p for p in range(len(entities_out)) if p not in dropped]
+            self._publish(
+                _Index.build(
+                    [entities_out[p] for p in keep] + [texts[i] for i in appended],
+                    np.concatenate([ids_out[keep], self._next_ids(len(appended))]),
+                    np.vstack([dense_out[keep], dense[appended]]),
+                    [sparse_out[p] for p in keep] + [sparse_rows[i] for i in appended],
+                )
+            )
+            self.sparse_embedder.add_documents(new)
+        return {"inserted": len(appended), "updated": len(existing)}
+
+    def delete_entities(
+        self, entities: Sequence[str], *, update_bm25: bool = True
+    ) -> int:
+        """Delete entities by normalized text and (by default) take them out of the BM25 statistics."""
+        latest = _latest_by_key(entities)
+        with self._write_lock:
+            existing = self._positions(list(latest)) if latest else {}
+            if not existing:
+                return 0
+            drop = {p for positions in existing.values() for p in positions}
+            cur = self._index
+            keep = [p for p in range(len(cur.entities)) if p not in drop]
+            self._publish(
+                _Index.build(
+                    [cur.entities[p] for p in keep],
+                    cur.ids[keep],
+                    cur.dense[keep],
+                    [cur.sparse_rows[p] for p in keep],
+                )
+            )
+            if update_bm25:
+                self.sparse_embedder.remove_documents(
+                    [latest[key] for key in existing]
+                )
+        return len(existing)
+
+    def _save(self, index: _Index) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp.npz"
+        np.savez(
+            tmp,
+            entity=np.asarray(index.entities, dtype=str),
+            id=index.ids,
+            dense=index.dense,
+            sparse_data=index.matrix.data,
+            sparse_indices=index.matrix.indices,
+            sparse_indptr=index.matrix.indptr,
+            sparse_shape=np.asarray(index.matrix.shape),
+        )
+        os.replace(tmp, self.path)
+
+    def _search_vectors_many(
+        self,
+        dense_qs: List[List[float]],
+        sparse_qs: List[SparseVec],
+        *,
+        top_k: int = 10,
+        rerank_k: Optional[int] = None,
+        dense_weight: float = 0.5,
+        sparse_weight: float = 0.5,
+        min_score: Optional[float] = None,
+        dense_search_params: Optional[Dict[str, Any]] = None,
+        sparse_search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None,
+    ) -> List[List[SearchResultRow]]:
+        top_k = int(top_k)
+        rerank_k = int(rerank_k) if rerank_k is not None else max(top_k * 4, top_k)
+        w_dense, w_sparse = _normalize_weights(dense_weight, sparse_weight)
+
+        out: List[List[SearchResultRow]] = [[] for _ in dense_qs]
+        index = self._index
+        entities, ids, dense, matrix = index.entities, index.ids, index.dense, index.matrix
+        if not dense_qs or not entities:
+            return out
+
+        q_dense = _normalize_rows(np.asarray(dense_qs, dtype=np.float32))
+        dense_scores = q_dense @ dense.T
+        sparse_scores = (_csr(sparse_qs, matrix.shape[1]) @ matrix.T).toarray()
+
+        use_sparse = np.array([w_sparse > 0 and bool(sq) for sq in sparse_qs])
+        if w_dense > 0:
+            dense_mask = _top_mask(dense_scores, rerank_k)
+        else:
+            dense_mask = np.zeros(dense_scores.shape, dtype=bool)
+        sparse_mask = _top_mask(sparse_scores, rerank_k, positive_only=True)
+        sparse_mask[~use_sparse] = False
+
+        if w_dense > 0:
+            hybrid = np.where(dense_mask, w_dense * (1.0 + dense_scores) / 2.0, 0.0)
+            hybrid += np.where(
+                sparse_mask, w_sparse * (0.5 + np.arctan(sparse_scores) / np.pi), 0.0
+            )
+        else:
+            hybrid = sparse_scores  # sparse-only: plain IP search, no ranker
+        # Dense-only queries are a plain COSINE search in Milvus (no ranker)
+        scores = np.where(use_sparse[:, None], hybrid, dense_scores)
+        scores = np.where(dense_mask | sparse_mask, scores, -np.inf)
+
+        k = min(top_k, len(entities))
+        for i, row in enumerate(scores):
+            best = np.argpartition(-row, k - 1)[:k] if k < len(row) else np.arange(len(row))
+            best = best[np.argsort(-row[best], kind="stable")]
+            out[i] = [
+                SearchResultRow(id=int(ids[j]), entity=entities[j], score=float(row[j]))
+                for j in best
+                if np.isfinite(row[j])
+                and (min_score is None or row[j] >= float(min_score))
+            ]
+        return out
@@ -31,6 +31,20 @@ def _ensure_sparse_keys_int(v: SparseVec) -> SparseVec:
     return out
 
 
+def normalize_entity(text: str) -> str:
+    """Upsert/delete key of an entity: lowercased, whitespace collapsed."""
+    return " ".join(str(text).lower().split())
+
+
+def _latest_by_key(entities: Sequence[str]) -> Dict[str, str]:
+    """normalized key -> entity text (stripped; the last spelling of a key wins)."""
+    out: Dict[str, str] = {}
+    for e in entities or []:
+        if isinstance(e, str) and e.strip():
+            out[normalize_entity(e)] = " ".join(e.split())
+    return out
+
+
 def _hit_get(hit: Any, key: str, default=None):
     if hasattr(hit, key):
         return getattr(hit, key)
@@ -126,34 +140,122 @@ class MilvusHybridEntityStore:
         self.client.load_collection(self.collection_name)
 
     def insert_entities(
-        self, entities: Sequence[str], *, batch_size: int = 256
+        self, entities: Sequence[str], *, batch_size: int = 256, sparse_embedder=None
     ) -> None:
         ents = [e for e in (entities or []) if isinstance(e, str) and e.strip()]
         if not ents:
             return
+        sparse_embedder = sparse_embedder or self.sparse_embedder
 
         for i in range(0, len(ents), batch_size):
             batch = ents[i : i + batch_size]
 
             dense_vecs = self.dense.embed(list(batch))
-            sparse_vecs = self.sparse_embedder.embed(list(batch))
+            sparse_vecs = sparse_embedder.embed(list(batch))
 
             if not isinstance(sparse_vecs, list):
                 sparse_vecs = [sparse_vecs] * len(batch)
 
-            rows: List[Dict[str, Any]] = []
-            for ent, dv, sv in zip(batch, dense_vecs, sparse_vecs):
-                sv = _ensure_sparse_keys_int(sv or {})
-                rows.append(
-                    {
-                        "entity": ent,
-                        "dense_vector": dv,
-                        "sparse_vector": sv,
-                    }
-                )
+            self.insert_vectors(batch, dense_vecs, sparse_vecs)
 
+    def insert_vectors(
+        self,
+        entities: Sequence[str],
+        dense_vecs: Sequence[List[float]],
+        sparse_vecs: Sequence[SparseVec],
+    ) -> None:
+        """Insert already embedded entities (one row per entity, in order)."""
+        rows: List[Dict[str, Any]] = []
+        for ent, dv, sv in zip(entities, dense_vecs, sparse_vecs):
+            sv = _ensure_sparse_keys_int(sv or {})
+            rows.append(
+                {
+                    "entity": ent,
+                    "dense_vector": dv,
+                    "sparse_vector": sv,
+                }
+            )
+        if rows:
             self.client.insert(collection_name=self.collection_name, data=rows)
 
+    @staticmethod
+    def _spellings(key: str, text: str) -> List[str]:
+        """Stored texts that normalize to ``key`` and are looked up by _ids_by_key."""
+        return list(dict.fromkeys([text, key, key.capitalize(), key.title(), key.upper()]))
+
+    def _ids_by_key(
+        self, latest: Dict[str, str], *, batch_size: int = 256
+    ) -> Dict[str, List[int]]:
+        """
+        Primary keys of the stored rows whose normalized entity is a key of ``latest``
+        (key -> entity text). Rows are found with ``entity in [...]`` filters on the
+        requested spelling plus the lower/capitalized/title/upper forms of the key,
+        ``batch_size`` keys per query, instead of scanning the collection; a row
+        stored in another mix of cases is not matched.
+        """
+        found: Dict[str, List[int]] = {}
+        items = list(latest.items())
+        for i in range(0, len(items), batch_size):
+            names = [
+                name
+                for key, text in items[i : i + batch_size]
+                for name in self._spellings(key, text)
+            ]
+            rows = self.client.query(
+                collection_name=self.collection_name,
+                filter="entity in {names}",
+                filter_params={"names": names},
+                output_fields=["entity"],
+            )
+            for row in rows:
+                key = normalize_entity(row.get("entity") or "")
+                if key in latest:
+                    found.setdefault(key, []).append(row["id"])
+        return found
+
+    def upsert_entities(
+        self, entities: Sequence[str], *, batch_size: int = 256
+    ) -> Dict[str, int]:
+        """
+        Insert or replace entities by normalized text (duplicate rows from earlier
+        seeds are collapsed to one). Entities are embedded with the new ones counted
+        into the BM25 statistics, which are only updated once the rows are written
+        (a failed upsert can be retried without counting them twice).
+        Returns {"inserted": n, "updated": n}.
+        """
+        latest = _latest_by_key(entities)
+        if not latest:
+            return {"inserted": 0, "updated": 0}
+        existing = self._ids_by_key(latest)
+        new = [text for key, text in latest.items() if key not in existing]
+        # Insert before deleting, so a concurrent search never misses the entity
+        self.insert_entities(
+            list(latest.values()),
+            batch_size=batch_size,
+            sparse_embedder=self.sparse_embedder.with_documents(new),
+        )
+        stale = [pk for ids in existing.values() for pk in ids]
+        if stale:
+            self.client.delete(collection_name=self.collection_name, ids=stale)
+        self.sparse_embedder.add_documents(new)
+        return {"inserted": len(new), "updated": len(existing)}
+
+    def delete_entities(
+        self, entities: Sequence[str], *, update_bm25: bool = True
+    ) -> int:
+        """Delete entities by normalized text and (by default) take them out of the BM25 statistics."""
+        latest = _latest_by_key(entities)
+        existing = self._ids_by_key(latest) if latest else {}
+        if not existing:
+            return 0
+        self.client.delete(
+            collection_name=self.collection_name,
+            ids=[pk for ids in existing.values() for pk in ids],
+        )
+        if update_bm25:
+            self.sparse_embedder.remove_documents([latest[key] for key in existing])
+        return len(existing)
+
     def search(
         self,
         query: str,
@@ -170,14 +272,178 @@ class MilvusHybridEntityStore:
         if not isinstance(query, str) or not query.strip():
             return []
 
+        dense_q = (self.dense.embed(query))[0]  # List[float]
+        sparse_q = _ensure_sparse_keys_int(self.sparse_embedder.embed(query) or {})
+
+        return self._search_vectors(
+            dense_q,
+            sparse_q,
+            top_k=top_k,
+            rerank_k=rerank_k,
+            dense_weight=dense_weight,
+            sparse_weight=sparse_weight,
+            min_score=min_score,
+            dense_search_params=dense_search_params,
+            sparse_search_params=sparse_search_params,
+            output_fields=output_fields,
+        )
+
+    async def asearch(
+        self,
+        query: str,
+        *,
+        top_k: int = 10,
+        rerank_k: Optional[int] = None,
+        dense_weight: float = 0.5,
+        sparse_weight: float = 0.5,
+        min_score: Optional[float] = None,
+        dense_search_params: Optional[Dict[str, Any]] = None,
+        sparse_search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None,
+    ) -> List[SearchResultRow]:
+        """
+        Async search(): awaits the TEI embedding; the (short) Milvus RPC runs in a
+        worker thread since MilvusClient is synchronous.
+        """
+        if not isinstance(query, str) or not query.strip():
+            return []
+
+        dense_q = (await self.dense.aembed(query))[0]
+        sparse_q = _ensure_sparse_keys_int(self.sparse_embedder.embed(query) or {})
+
+        return await asyncio.to_thread(
+            self._search_vectors,
+            dense_q,
+            sparse_q,
+            top_k=top_k,
+            rerank_k=rerank_k,
+            dense_weight=dense_weight,
+            sparse_weight=sparse_weight,
+            min_score=min_score,
+            dense_search_params=dense_search_params,
+            sparse_search_params=sparse_search_params,
+            output_fields=output_fields,
+        )
+
+    def search_many(
+        self,
+        queries: Sequence[str],
+        *,
+        top_k: int = 10,
+        rerank_k: Optional[int] = None,
+        dense_weight: float = 0.5,
+        sparse_weight: float = 0.5,
+        min_score: Optional[float] = None,
+        dense_search_params: Optional[Dict[str, Any]] = None,
+        sparse_search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None,
+    ) -> List[List[SearchResultRow]]:
+        """
+        search() for several queries: one dense embed call, one sparse pass and one
+        batched Milvus request (nq = len(queries)). Returns one result list per query,
+        in order ([] for empty queries).
+        """
+        valid = [
+            i for i, q in enumerate(queries or []) if isinstance(q, str) and q.strip()
+        ]
+        texts = [queries[i] for i in valid]
+        dense_qs = self.dense.embed(texts) if texts else []
+        sparse_qs = self._sparse_many(texts)
+
+        rows = self._search_vectors_many(
+            dense_qs,
+            sparse_qs,
+            top_k=top_k,
+            rerank_k=rerank_k,
+            dense_weight=dense_weight,
+            sparse_weight=sparse_weight,
+            min_score=min_score,
+            dense_search_params=dense_search_params,
+            sparse_search_params=sparse_search_params,
+            output_fields=output_fields,
+        )
+        return self._scatter(len(queries or []), valid, rows)
+
+    async def asearch_many(
+        self,
+        queries: Sequence[str],
+        *,
+        top_k: int = 10,
+        rerank_k: Optional[int] = None,
+        dense_weight: float = 0.5,
+        sparse_weight: float = 0.5,
+        min_score: Optional[float] = None,
+        dense_search_params: Optional[Dict[str, Any]] = None,
+        sparse_search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None,
+    ) -> List[List[SearchResultRow]]:
+        """Async search_many(): awaits TEI, runs the Milvus RPC in a worker thread."""
+        valid = [
+            i for i, q in enumerate(queries or []) if isinstance(q, str) and q.strip()
+        ]
+        texts = [queries[i] for i in valid]
+        dense_qs = (await self.dense.aembed(texts)) if texts else []
+        sparse_qs = self._sparse_many(texts)
+
+        rows = await asyncio.to_thread(
+            self._search_vectors_many,
+            dense_qs,
+            sparse_qs,
+            top_k=top_k,
+            rerank_k=rerank_k,
+            dense_weight=dense_weight,
+            sparse_weight=sparse_weight,
+            min_score=min_score,
+            dense_search_params=dense_search_params,
+            sparse_search_params=sparse_search_params,
+            output_fields=output_fields,
+        )
+        return self._scatter(len(queries or []), valid, rows)
+
+    def _sparse_many(self, texts: List[str]) -> List[SparseVec]:
+        if not texts:
+            return []
+        return [
+            _ensure_sparse_keys_int(v or {})
+            for v in self.sparse_embedder.embed(list(texts))
+        ]
+
+    @staticmethod
+    def _scatter(
+        n: int, positions: List[int], rows: List[List[SearchResultRow]]
+    ) -> List[List[SearchResultRow]]:
+        out: List[List[SearchResultRow]] = [[] for _ in range(n)]
+        for pos, r in zip(positions, rows):
+            out[pos] = r
+        return out
+
+    def _search_vectors(
+        self,
+        dense_q: List[float],
+        sparse_q: SparseVec,
+        **kwargs: Any,
+    ) -> List[SearchResultRow]:
+        return self._search_vectors_many([dense_q], [sparse_q], **kwargs)[0]
+
+    def _search_vectors_many(
+        self,
+        dense_qs: List[List[float]],
+        sparse_qs: List[SparseVec],
+        *,
+        top_k: int = 10,
+        rerank_k: Optional[int] = None,
+        dense_weight: float = 0.5,
+        sparse_weight: float = 0.5,
+        min_score: Optional[float] = None,
+        dense_search_params: Optional[Dict[str, Any]] = None,
+        sparse_search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None,
+    ) -> List[List[SearchResultRow]]:
         top_k = int(top_k)
         rerank_k = int(rerank_k) if rerank_k is not None else max(top_k * 4, top_k)
 
         w_dense, w_sparse = _normalize_weights(dense_weight, sparse_weight)
 
-        dense_q = (self.dense.embed(query))[0]  # List[float]
-        sparse_q = _ensure_sparse_keys_int(self.sparse_embedder.embed(query) or {})
-
         dense_params = dense_search_params or {
             "metric_type": "COSINE",
             "params": {"ef": 64},
@@ -188,55 +454,73 @@ class MilvusHybridEntityStore:
         }
 
         out_fields = output_fields or ["entity"]
+        out: List[List[SearchResultRow]] = [[] for _ in dense_qs]
+
+        # A query with no BM25 terms has no sparse request (dense only), so queries
+        # are grouped by which requests they need; each group is one batched RPC.
+        use_sparse = [w_sparse > 0 and bool(sq) for sq in sparse_qs]
+        for with_sparse in (True, False):
+            idx = [i for i, u in enumerate(use_sparse) if u == with_sparse]
+            if not idx:
+                continue
+
+            reqs: List[AnnSearchRequest] = []
+            weights: List[float] = []
+
+            if w_dense > 0:
+                reqs.append(
+                    AnnSearchRequest(
+                        data=[dense_qs[i] for i in idx],
+                        anns_field="dense_vector",
+                        param=dense_params,
+                        limit=rerank_k,
+                    )
+                )
+                weights.append(w_dense)
+
+            if with_sparse:
+                reqs.append(
+                    AnnSearchRequest(
+                        data=[sparse_qs[i] for i in idx],
+                        anns_field="sparse_vector",
+                        param=sparse_params,
+                        limit=rerank_k,
+                    )
+                )
+                weights.append(w_sparse)
 
-        reqs: List[AnnSearchRequest] = []
-        weights: List[float] = []
+            if not reqs:
+                continue
 
-        if w_dense > 0:
-            reqs.append(
-                AnnSearchRequest(
-                    data=[dense_q],
-                    anns_field="dense_vector",
-                    param=dense_params,
-                    limit=rerank_k,
+            if len(reqs) == 1:
+                r0 = reqs[0]
+                res = self.client.search(
+                    collection_name=self.collection_name,
+                    data=r0.data,
+                    anns_field=r0.anns_field,
+                    limit=top_k,
+                    search_params=r0.param,
+                    output_fields=out_fields,
                 )
-            )
-            weights.append(w_dense)
-
-        if w_sparse > 0 and sparse_q:
-            reqs.append(
-                AnnSearchRequest(
-                    data=[sparse_q],
-                    anns_field="sparse_vector",
-                    param=sparse_params,
-                    limit=rerank_k,
+            else:
+                ranker = WeightedRanker(*weights)
+                res = self.client.hybrid_search(
+                    collection_name=self.collection_name,
+                    reqs=reqs,
+                    ranker=ranker,
+                    limit=top_k,
+                    output_fields=out_fields,
                 )
-            )
-            weights.append(w_sparse)
 
-        if not reqs:
-            return []
+            for n, i in enumerate(idx):
+                out[i] = self._rows_from_hits(res[n], out_fields, min_score)
 
-        if len(reqs) == 1:
-            r0 = reqs[0]
-            res = self.client.search(
-                collection_name=self.collection_name,
-                data=r0.data,
-                anns_field=r0.anns_field,
-                limit=top_k,
-                search_params=r0.param,
-                output_fields=out_fields,
-            )
-        else:
-            ranker = WeightedRanker(*weights)
-            res = self.client.hybrid_search(
-                collection_name=self.collection_name,
-                reqs=reqs,
-                ranker=ranker,
-                limit=top_k,
-                output_fields=out_fields,
-            )
-        hits = res[0] if isinstance(res, list) else res  # be tolerant
+        return out
+
+    @staticmethod
+    def _rows_from_hits(
+        hits: Any, out_fields: List[str], min_score: Optional[float]
+    ) -> List[SearchResultRow]:
         out: List[SearchResultRow] = []
 
         for hit in hits:
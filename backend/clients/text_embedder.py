@@ -1,32 +1,129 @@
+import asyncio
 import json
 import math
+import os
 import re
+import threading
 from collections import defaultdict
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import httpx
+import numpy as np
 from scipy.sparse import csr_matrix
 
 
+# Characters preprocess() removes, minus the "\x00" _tokenize_many joins texts with
+_NON_WORD_OR_SEP = re.compile(r"[^\w\s\x00]")
+
+
+class _SortedTerms:
+    """
+    Term -> column lookup over a binary model's memory-mapped, sorted term table:
+    tokens are found with one ``np.searchsorted`` per batch, so nothing is copied
+    into a dict and only the pages a query touches are read.
+    """
+
+    def __init__(self, terms: np.ndarray, index: np.ndarray):
+        self.terms = terms
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def columns(self, tokens: List[str]) -> np.ndarray:
+        """Column per token (-1 = out of vocabulary)."""
+        if not len(self.terms):
+            return np.full(len(tokens), -1, dtype=np.int64)
+        if self.terms.dtype.kind == "S":
+            query = np.array([t.encode("utf-8") for t in tokens], dtype=np.bytes_)
+        else:
+            query = np.array(tokens, dtype=np.str_)
+        pos = np.searchsorted(self.terms, query)
+        pos[pos == len(self.terms)] = 0
+        found = self.terms[pos] == query
+        return np.where(found, self.index[pos], -1).astype(np.int64)
+
+
+class _PendingEmbed:
+    """One caller's inputs waiting in a coalesced /embed batch."""
+
+    __slots__ = ("inputs", "result", "error", "done")
+
+    def __init__(self, inputs: List[str]):
+        self.inputs = inputs
+        self.result: Optional[List[List[float]]] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class _AsyncBatchState:
+    """
+    Per-event-loop AsyncClient and pending batch (httpx/asyncio objects are loop-bound).
+
+    ``closer`` is a task on ``loop`` that closes the client once cancelled: by
+    aclose(), by a later call from another loop, or by asyncio.run() cancelling the
+    tasks left over when it finishes, so the client is closed while its loop runs.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, client: httpx.AsyncClient):
+        self.loop = loop
+        self.client = client
+        self.pending: List[Tuple[List[str], asyncio.Future]] = []
+        self.size = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.tasks: Set[asyncio.Task] = set()
+        self.closer: Optional[asyncio.Task] = None
+
+
 class DenseEmbedder:
-    def __init__(self, url: str, timeout: float = 30.0):
+    """
+    Client for the TEI ``/embed`` endpoint.
+
+    Keeps one long-lived, keep-alive connection pool per client (sync and async) instead
+    of opening a connection per call. With ``batch_window_ms > 0``, concurrent embed()/
+    aembed() calls arriving within that window are coalesced into one ``/embed`` request
+    (at most ``max_batch_size`` inputs per request) and the vectors are fanned back out.
+    ``http2=True`` needs the ``h2`` package (``httpx[http2]``) and a server that speaks it.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 30.0,
+        *,
+        batch_window_ms: float = 2.0,
+        max_batch_size: int = 32,
+        max_connections: int = 20,
+        http2: bool = False,
+    ):
         self.url = url.rstrip("/")
         self.timeout = timeout
+        self.batch_window = max(batch_window_ms, 0.0) / 1000.0
+        # TEI rejects requests above its --max-client-batch-size (32 by default)
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.http2 = http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
 
-    def embed(self, texts: Union[str, List[str]]) -> List[List[float]]:
-        if isinstance(texts, str):
-            inputs = [texts]
-        elif isinstance(texts, list) and all(isinstance(t, str) for t in texts):
-            inputs = texts
-        else:
-            raise TypeError("texts must be a str or List[str]")
+        self._client: Optional[httpx.Client] = None
+        self._client_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._pending: List[_PendingEmbed] = []
+        self._pending_size = 0
+        self._async: Optional[_AsyncBatchState] = None
 
-        with httpx.Client(timeout=self.timeout) as client:
-            resp = client.post(
-                f"{self.url}/embed",
-                json={"inputs": inputs},
-            )
+    @staticmethod
+    def _inputs(texts: Union[str, List[str]]) -> List[str]:
+        if isinstance(texts, str):
+            return [texts]
+        if isinstance(texts, list) and all(isinstance(t, str) for t in texts):
+            return texts
+        raise TypeError("texts must be a str or List[str]")
 
+    @staticmethod
+    def _parse(resp: httpx.Response) -> List[List[float]]:
         resp.raise_for_status()
         embeddings = resp.json()
 
@@ -35,8 +132,213 @@ class DenseEmbedder:
 
         return embeddings
 
+    def _chunks(self, inputs: List[str]) -> List[List[str]]:
+        n = self.max_batch_size
+        return [inputs[i : i + n] for i in range(0, len(inputs), n)]
+
+    @staticmethod
+    def _split(
+        sizes: List[int], embeddings: List[List[float]]
+    ) -> List[List[List[float]]]:
+        if len(embeddings) != sum(sizes):
+            raise ValueError(
+                f"TEI returned {len(embeddings)} embeddings for {sum(sizes)} inputs"
+            )
+        out, offset = [], 0
+        for n in sizes:
+            out.append(embeddings[offset : offset + n])
+            offset += n
+        return out
+
+    # ---------- sync ----------
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        timeout=self.timeout, limits=self._limits, http2=self.http2
+                    )
+        return self._client
+
+    def _post(self, inputs: List[str]) -> List[List[float]]:
+        embeddings: List[List[float]] = []
+        for chunk in self._chunks(inputs):
+            resp = self.client.post(f"{self.url}/embed", json={"inputs": chunk})
+            embeddings.extend(self._parse(resp))
+        return embeddings
+
+    def _run_batch(self, batch: List[_PendingEmbed]) -> None:
+        try:
+            embeddings = self._post([t for item in batch for t in item.inputs])
+            parts = self._split([len(item.inputs) for item in batch], embeddings)
+            for item, part in zip(batch, parts):
+                item.result = part
+        except BaseException as e:
+            for item in batch:
+                item.error = e
+        finally:
+            for item in batch:
+                item.done.set()
+
+    def embed(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        inputs = self._inputs(texts)
+        if self.batch_window <= 0 or not inputs:
+            return self._post(inputs)
+
+        item = _PendingEmbed(inputs)
+        batch: Optional[List[_PendingEmbed]] = None
+        with self._cond:
+            self._pending.append(item)
+            self._pending_size += len(inputs)
+            if len(self._pending) == 1:
+                # First caller of the window leads: wait for company, then send for everyone
+                self._cond.wait_for(
+                    lambda: self._pending_size >= self.max_batch_size,
+                    timeout=self.batch_window,
+                )
+                batch, self._pending, self._pending_size = self._pending, [], 0
+            elif self._pending_size >= self.max_batch_size:
+                self._cond.notify_all()
+
+        if batch is not None:
+            self._run_batch(batch)
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    # ---------- async ----------
+
+    def _async_state(self) -> _AsyncBatchState:
+        loop = asyncio.get_running_loop()
+        state = self._async
+        if state is None or state.loop is not loop:
+            if state is not None:
+                self._retire(state)
+            state = _AsyncBatchState(
+                loop,
+                httpx.AsyncClient(
+                    timeout=self.timeout, limits=self._limits, http2=self.http2
+                ),
+            )
+            state.closer = loop.create_task(self._aclose_when_cancelled(state))
+            self._async = state
+        return state
+
+    @staticmethod
+    async def _aclose_when_cancelled(state: _AsyncBatchState) -> None:
+        try:
+            await asyncio.Event().wait()
+        finally:
+            if state.timer is not None:
+                state.timer.cancel()
+                state.timer = None
+            if state.tasks:
+                await asyncio.gather(*state.tasks, return_exceptions=True)
+            await state.client.aclose()
+
+    @staticmethod
+    def _retire(state: _AsyncBatchState) -> None:
+        """Close the client of a loop this embedder no longer uses, on that loop."""
+        try:
+            state.loop.call_soon_threadsafe(state.closer.cancel)
+        except RuntimeError:
+            # Loop already closed; asyncio.run() cancelled the closer before that
+            pass
+
+    async def _apost(
+        self, client: httpx.AsyncClient, inputs: List[str]
+    ) -> List[List[float]]:
+        embeddings: List[List[float]] = []
+        for chunk in self._chunks(inputs):
+            resp = await client.post(f"{self.url}/embed", json={"inputs": chunk})
+            embeddings.extend(self._parse(resp))
+        return embeddings
+
+    async def _arun_batch(
+        self,
+        client: httpx.AsyncClient,
+        batch: List[Tuple[List[str], asyncio.Future]],
+    ) -> None:
+        try:
+            embeddings = await self._apost(
+                client, [t for inputs, _ in batch for t in inputs]
+            )
+            parts = self._split([len(inputs) for inputs, _ in batch], embeddings)
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), part in zip(batch, parts):
+            if not fut.done():
+                fut.set_result(part)
+
+    def _aflush(self, state: _AsyncBatchState) -> None:
+        if state.timer is not None:
+            state.timer.cancel()
+            state.timer = None
+        batch, state.pending, state.size = state.pending, [], 0
+        if not batch:
+            return
+        task = state.loop.create_task(self._arun_batch(state.client, batch))
+        state.tasks.add(task)
+        task.add_done_callback(state.tasks.discard)
+
+    async def aembed(self, texts: Union[str, List[str]]) -> List[List[float]]:
+        """Non-blocking embed() for the async pipeline."""
+        inputs = self._inputs(texts)
+        state = self._async_state()
+        if self.batch_window <= 0 or not inputs:
+            return await self._apost(state.client, inputs)
+
+        fut = state.loop.create_future()
+        state.pending.append((inputs, fut))
+        state.size += len(inputs)
+        if state.size >= self.max_batch_size:
+            self._aflush(state)
+        elif state.timer is None:
+            state.timer = state.loop.call_later(self.batch_window, self._aflush, state)
+        return await fut
+
+    def close(self) -> None:
+        """Close the sync connection pool (the async one is closed by aclose())."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        state, self._async = self._async, None
+        if state is not None and state.loop is asyncio.get_running_loop():
+            self._aflush(state)
+            state.closer.cancel()
+            await asyncio.gather(state.closer, return_exceptions=True)
+        elif state is not None:
+            self._retire(state)
+        self.close()
+
 
 class SparseEmbedder:
+    """
+    BM25 query/document weights as sparse vectors.
+
+    Scoring is vectorized: tokens map to columns through one lookup table, idf is a
+    NumPy array indexed by column, and term frequencies/weights for a whole batch are
+    computed with array ops into CSR layout (``embed_csr`` returns the ``csr_matrix``).
+    ``embed`` converts rows to the ``{index: weight}`` dicts Milvus expects only at the end.
+
+    ``add_documents``/``remove_documents`` update the corpus statistics (document
+    frequencies, size, average length): new dicts, idf and lookup arrays are built
+    aside and swapped in, so a concurrent ``embed`` sees either the old or the new
+    model, never a mix. Existing terms keep their column, new terms get new columns,
+    so vectors already stored in the index stay comparable (their weights keep the
+    idf they were written with until the entity is upserted again).
+    ``with_documents`` gives a copy with documents counted in, to embed them before
+    they are stored (and counted with ``add_documents``).
+    """
+
     def __init__(
         self,
         k1: float = 1.5,
@@ -50,9 +352,71 @@ class SparseEmbedder:
         # Learned parameters
         self.corpus_size: int = 0
         self.avgdl: float = 0.0
-        self.idf: Dict[str, float] = {}
-        self.term_to_index: Dict[str, int] = {}
-        self.term_document_frequencies: Dict[str, int] = {}
+        self._idf: Optional[Dict[str, float]] = {}
+        self._term_to_index: Optional[Dict[str, int]] = {}
+        self._term_document_frequencies: Optional[Dict[str, int]] = {}
+
+        # Memory-mapped arrays of a binary model (see load_binary); the dicts above
+        # stay None until something asks for them
+        self._mmap: Optional[Dict[str, np.ndarray]] = None
+        # (term -> column, idf by column, avgdl) used by embed: built on first use
+        # (see _arrays) or swapped in whole by add/remove_documents; the lookup is a
+        # _SortedTerms over the mmap for a binary model
+        self._vocab: Optional[
+            Tuple[Union[Dict[str, int], _SortedTerms], np.ndarray, float]
+        ] = None
+        # Serializes add/remove_documents and the first _arrays build
+        self._update_lock = threading.Lock()
+        # Bumped on every incremental update; part of CachedSparseEmbedder's model id
+        self.version = 0
+
+    def _mapped_dict(self, values: str) -> Dict[str, Any]:
+        terms = self._mmap["terms"].tolist()
+        if self._mmap["terms"].dtype.kind == "S":
+            terms = [t.decode("utf-8") for t in terms]
+        return dict(zip(terms, self._mmap[values].tolist()))
+
+    @property
+    def idf(self) -> Dict[str, float]:
+        if self._idf is None:
+            self._idf = self._mapped_dict("idf")
+        return self._idf
+
+    @idf.setter
+    def idf(self, value: Dict[str, float]) -> None:
+        self._detach()
+        self._idf = value
+        self._vocab = None
+
+    @property
+    def term_to_index(self) -> Dict[str, int]:
+        if self._term_to_index is None:
+            self._term_to_index = self._mapped_dict("index")
+        return self._term_to_index
+
+    @term_to_index.setter
+    def term_to_index(self, value: Dict[str, int]) -> None:
+        self._detach()
+        self._term_to_index = value
+        self._vocab = None
+
+    @property
+    def term_document_frequencies(self) -> Dict[str, int]:
+        if self._term_document_frequencies is None:
+            self._term_document_frequencies = self._mapped_dict("df")
+        return self._term_document_frequencies
+
+    @term_document_frequencies.setter
+    def term_document_frequencies(self, value: Dict[str, int]) -> None:
+        self._detach()
+        self._term_document_frequencies = value
+
+    def _detach(self) -> None:
+        """Materialize the dicts and drop the mmap before one of them is replaced."""
+        if self._mmap is not None:
+            for name in ("idf", "term_to_index", "term_document_frequencies"):
+                getattr(self, name)
+            self._mmap = None
 
     def preprocess(self, text: str) -> str:
         text = str(text).lower()
@@ -67,6 +431,15 @@ class SparseEmbedder:
             return []
         return cleaned.split()
 
+    def _tokenize_many(self, texts: List[str]) -> List[List[str]]:
+        """_tokenize for a batch with one lower()/regex pass over the joined texts."""
+        joined = "\x00".join(map(str, texts))
+        if len(texts) < 2 or joined.count("\x00") != len(texts) - 1:
+            return [self._tokenize(text) for text in texts]
+        # Same as preprocess(): collapsing whitespace does not change split()
+        cleaned = _NON_WORD_OR_SEP.sub("", joined.lower())
+        return [doc.split() for doc in cleaned.split("\x00")]
+
     def fit(self, corpus: List[str]):
         if not corpus:
             return
@@ -90,24 +463,196 @@ class SparseEmbedder:
             total_word_count / self.corpus_size if self.corpus_size > 0 else 1.0
         )
 
+        self.idf = self._compute_idf(term_doc_freq)
+        self.term_to_index = {term: i for i, term in enumerate(sorted(self.idf.keys()))}
+        self.term_document_frequencies = term_doc_freq
+        self._vocab = None
+
+    def _compute_idf(
+        self, term_doc_freq: Dict[str, int], corpus_size: Optional[int] = None
+    ) -> Dict[str, float]:
+        """BM25Okapi idf for every term with df > 0 (negative idf floored to epsilon * mean)."""
+        if corpus_size is None:
+            corpus_size = self.corpus_size
+        idf: Dict[str, float] = {}
         idf_sum = 0.0
         negative_idfs = []
 
         for term, df in term_doc_freq.items():
-            idf = math.log((self.corpus_size - df + 0.5) / (df + 0.5))
-            self.idf[term] = idf
-            idf_sum += idf
-            if idf < 0:
+            if df <= 0:
+                continue
+            value = math.log((corpus_size - df + 0.5) / (df + 0.5))
+            idf[term] = value
+            idf_sum += value
+            if value < 0:
                 negative_idfs.append(term)
 
-        if self.idf:
-            avg_idf = idf_sum / len(self.idf)
+        if idf:
+            avg_idf = idf_sum / len(idf)
             eps = self.epsilon * avg_idf
             for term in negative_idfs:
-                self.idf[term] = eps
+                idf[term] = eps
+        return idf
+
+    def _counted(
+        self, docs: List[str], sign: int
+    ) -> Tuple[int, float, Dict[str, int], Dict[str, int]]:
+        """(corpus_size, avgdl, term_to_index, df) with ``docs`` added (+1) or removed (-1), as new dicts."""
+        term_to_index = dict(self.term_to_index)
+        df = dict(self.term_document_frequencies)
+        next_index = max(term_to_index.values(), default=-1) + 1
+        total_words = self.avgdl * self.corpus_size
+        for tokens in self._tokenize_many(list(docs)):
+            total_words += sign * len(tokens)
+            for term in set(tokens):
+                df[term] = max(df.get(term, 0) + sign, 0)
+                if term not in term_to_index:
+                    term_to_index[term] = next_index
+                    next_index += 1
+        corpus_size = max(self.corpus_size + sign * len(docs), 0)
+        avgdl = total_words / corpus_size if corpus_size > 0 else 1.0
+        return corpus_size, avgdl, term_to_index, df
+
+    def _publish_counts(
+        self,
+        corpus_size: int,
+        avgdl: float,
+        term_to_index: Dict[str, int],
+        df: Dict[str, int],
+    ) -> None:
+        """Install new statistics; embed switches over with the single ``_vocab`` assignment."""
+        idf = self._compute_idf(df, corpus_size)
+        vocab = (*self._lookup_arrays(term_to_index, idf), avgdl)
+        self._mmap = None
+        self._term_to_index = term_to_index
+        self._term_document_frequencies = df
+        self._idf = idf
+        self.corpus_size = corpus_size
+        self.avgdl = avgdl
+        self._vocab = vocab
+
+    def _update_counts(self, docs: List[str], sign: int) -> None:
+        with self._update_lock:
+            self._publish_counts(*self._counted(docs, sign))
+            self.version += 1
+
+    def add_documents(self, docs: List[str]) -> None:
+        """Count ``docs`` into the corpus statistics; new terms get new columns."""
+        if docs:
+            self._update_counts(docs, +1)
+
+    def remove_documents(self, docs: List[str]) -> None:
+        """Take ``docs`` (previously added or fitted) out of the corpus statistics."""
+        if docs:
+            self._update_counts(docs, -1)
+
+    def with_documents(self, docs: List[str]) -> "SparseEmbedder":
+        """A copy with ``docs`` counted in (this model is unchanged), to embed them before storing."""
+        clone = SparseEmbedder(k1=self.k1, b=self.b, epsilon=self.epsilon)
+        with self._update_lock:
+            counts = self._counted(docs, +1)
+        clone._publish_counts(*counts)
+        clone.version = self.version
+        return clone
+
+    @staticmethod
+    def _lookup_arrays(
+        term_to_index: Dict[str, int], idf_by_term: Dict[str, float]
+    ) -> Tuple[Dict[str, int], np.ndarray]:
+        lookup = {t: int(i) for t, i in term_to_index.items() if t in idf_by_term}
+        idf = np.zeros(max(term_to_index.values(), default=-1) + 1, dtype=np.float64)
+        if lookup:
+            idf[list(lookup.values())] = [idf_by_term[t] for t in lookup]
+        return lookup, idf
+
+    def _arrays(self) -> Tuple[Union[Dict[str, int], _SortedTerms], np.ndarray, float]:
+        """(term -> column lookup, idf by column, avgdl) built from idf/term_to_index or the mmap."""
+        vocab = self._vocab
+        if vocab is not None:
+            return vocab
+        with self._update_lock:
+            if self._vocab is not None:
+                return self._vocab
+            if self._mmap is not None:
+                index = self._mmap["index"]
+                lookup = _SortedTerms(self._mmap["terms"], index)
+                idf = np.zeros(int(index.max()) + 1 if len(index) else 0, dtype=np.float64)
+                idf[index] = self._mmap["idf"]
+            else:
+                lookup, idf = self._lookup_arrays(self.term_to_index, self.idf)
+            self._vocab = (lookup, idf, self.avgdl)
+            return self._vocab
+
+    def _weights(
+        self, texts: List[str], normalize: bool
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """BM25 weights in CSR layout: (data, column indices, indptr, width)."""
+        lookup, idf, avgdl = self._arrays()
+        n, width = len(texts), len(idf)
+        if not lookup:
+            return (
+                np.zeros(0, dtype=np.float64),
+                np.zeros(0, dtype=np.int64),
+                np.zeros(n + 1, dtype=np.int64),
+                width,
+            )
 
-        self.term_to_index = {term: i for i, term in enumerate(sorted(self.idf.keys()))}
-        self.term_document_frequencies = term_doc_freq
+        tokenized = self._tokenize_many(texts)
+        doc_len = np.fromiter(map(len, tokenized), dtype=np.float64, count=n)
+        total = int(doc_len.sum())
+        # Column per token (-1 = out of vocabulary; still counted in doc_len)
+        if isinstance(lookup, _SortedTerms):
+            cols = lookup.columns([t for tokens in tokenized for t in tokens])
+        else:
+            cols = np.fromiter(
+                (lookup.get(t, -1) for tokens in tokenized for t in tokens),
+                dtype=np.int64,
+                count=total,
+            )
+        rows = np.repeat(np.arange(n, dtype=np.int64), doc_len.astype(np.int64))
+        known = cols >= 0
+
+        # Term frequency per (row, col); unique keys come out sorted by row, then col
+        keys, tf = np.unique(rows[known] * width + cols[known], return_counts=True)
+        rows, cols = keys // width, keys % width
+
+        tf = tf.astype(np.float64)
+        numerator = tf * (self.k1 + 1)
+        denominator = tf + self.k1 * (1 - self.b + self.b * doc_len[rows] / avgdl)
+        data = idf[cols] * (numerator / denominator)
+
+        if normalize and len(data):
+            norms = np.sqrt(np.bincount(rows, weights=data**2, minlength=n))
+            data = data / np.where(norms > 0, norms, 1.0)[rows]
+
+        indptr = np.searchsorted(rows, np.arange(n + 1))
+        return data, cols, indptr, width
+
+    def embed_csr(
+        self, texts: Union[str, List[str]], normalize: bool = False
+    ) -> csr_matrix:
+        """BM25 weights for a batch as a (len(texts) x vocabulary) CSR matrix."""
+        if isinstance(texts, str):
+            texts = [texts]
+        data, cols, indptr, width = self._weights(texts, normalize)
+        return csr_matrix((data, cols, indptr), shape=(len(texts), width))
+
+    @staticmethod
+    def csr_to_dicts(matrix: csr_matrix) -> List[Dict[int, float]]:
+        """CSR rows -> Milvus sparse vectors ({index: weight})."""
+        return SparseEmbedder._rows_to_dicts(matrix.data, matrix.indices, matrix.indptr)
+
+    @staticmethod
+    def _rows_to_dicts(
+        data: np.ndarray, cols: np.ndarray, indptr: np.ndarray
+    ) -> List[Dict[int, float]]:
+        indptr = indptr.tolist()
+        cols = cols.tolist()
+        data = data.tolist()
+        return [
+            dict(zip(cols[start:end], data[start:end]))
+            for start, end in zip(indptr[:-1], indptr[1:])
+        ]
 
     def embed(
         self, texts: Union[str, List[str]], normalize: bool = False
@@ -116,47 +661,21 @@ class SparseEmbedder:
         if single_input:
             texts = [texts]
 
-        embeddings = []
-
-        for text in texts:
-            tokens = self._tokenize(text)
-            if not tokens or not self.idf:
-                embeddings.append({})
-                continue
-
-            doc_len = len(tokens)
-            freq = defaultdict(int)
-            for t in tokens:
-                freq[t] += 1
-
-            sparse_dict = {}
-            for term, count in freq.items():
-                if term not in self.idf:
-                    continue
-                idf_val = self.idf[term]
-                numerator = count * (self.k1 + 1)
-                denominator = count + self.k1 * (
-                    1 - self.b + self.b * doc_len / self.avgdl
-                )
-                weight = idf_val * (numerator / denominator)
-                idx = self.term_to_index.get(term)
-                if idx is not None:
-                    sparse_dict[idx] = weight
-
-            if normalize and sparse_dict:
-                norm = math.sqrt(sum(v**2 for v in sparse_dict.values()))
-                if norm > 0:
-                    for k in sparse_dict:
-                        sparse_dict[k] /= norm
-
-            embeddings.append(sparse_dict)
+        # Same weights as embed_csr without building the scipy matrix (per-call overhead)
+        data, cols, indptr, _ = self._weights(texts, normalize)
+        embeddings = self._rows_to_dicts(data, cols, indptr)
 
         return embeddings[0] if single_input else embeddings
 
     def get_vocabulary_size(self) -> int:
+        if self._term_to_index is None:
+            return len(self._mmap["terms"])
         return len(self.term_to_index)
 
     def save(self, path: str):
+        """Write the model; a ``.json`` path keeps the JSON format, anything else is binary."""
+        if not path.lower().endswith(".json"):
+            return self.save_binary(path)
         data = {
             "k1": self.k1,
             "b": self.b,
@@ -172,6 +691,9 @@ class SparseEmbedder:
 
     @classmethod
     def load(cls, path: str):
+        """Load a model saved by save(): binary directory or JSON file."""
+        if os.path.isdir(path):
+            return cls.load_binary(path)
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -182,3 +704,71 @@ class SparseEmbedder:
         instance.term_to_index = data["term_to_index"]
         instance.term_document_frequencies = data["term_document_frequencies"]
         return instance
+
+    # ---------- binary format ----------
+    # A directory with meta.json (scalars) and one .npy per column, all aligned to
+    # the sorted term table: terms (UTF-8 bytes, fixed-width "S"), index (int64),
+    # idf (float64), df (int64). embed looks terms up in the mapped table with
+    # np.searchsorted (_SortedTerms). Version 1 stored the terms as unicode ("U",
+    # 4 bytes per character); it is still read.
+
+    BINARY_VERSION = 2
+
+    def save_binary(self, path: str) -> None:
+        encoded = np.array(
+            [t.encode("utf-8") for t in self.term_to_index], dtype=np.bytes_
+        )
+        # Byte order of UTF-8 is code point order, so this is also sorted(terms)
+        order = np.argsort(encoded, kind="stable")
+        terms = list(self.term_to_index)
+        terms = [terms[i] for i in order]
+        arrays = {
+            "terms": encoded[order],
+            "index": np.array(
+                [self.term_to_index[t] for t in terms], dtype=np.int64
+            ),
+            "idf": np.array([self.idf.get(t, 0.0) for t in terms], dtype=np.float64),
+            "df": np.array(
+                [self.term_document_frequencies.get(t, 0) for t in terms],
+                dtype=np.int64,
+            ),
+        }
+        os.makedirs(path, exist_ok=True)
+        for name, arr in arrays.items():
+            # New file + rename: processes that memory-mapped the old one keep reading it
+            target = os.path.join(path, f"{name}.npy")
+            np.save(f"{target}.tmp.npy", arr)
+            os.replace(f"{target}.tmp.npy", target)
+        meta = {
+            "version": self.BINARY_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "epsilon": self.epsilon,
+            "corpus_size": self.corpus_size,
+            "avgdl": self.avgdl,
+        }
+        # meta.json last: a directory without it is an incomplete save
+        meta_path = os.path.join(path, "meta.json")
+        with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    @classmethod
+    def load_binary(cls, path: str):
+        """Memory-map a binary model; dict views are built only if accessed."""
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") not in (1, cls.BINARY_VERSION):
+            raise ValueError(f"Unsupported BM25 model version: {meta.get('version')}")
+
+        instance = cls(k1=meta["k1"], b=meta["b"], epsilon=meta["epsilon"])
+        instance.corpus_size = meta["corpus_size"]
+        instance.avgdl = meta["avgdl"]
+        instance._mmap = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+            for name in ("terms", "index", "idf", "df")
+        }
+        instance._idf = None
+        instance._term_to_index = None
+        instance._term_document_frequencies = None
+        return instance
@@ -5,7 +5,7 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_ambiguity_discriminator_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 from .bot_trace_format import determine_type_line
 
@@ -13,7 +13,7 @@ from .bot_trace_format import determine_type_line
 AMBIGUITY_TYPES = ["Safety", "Common sense", "Preference"]
 
 
-class AmbiguityClassifierNode(BaseNode):
+class AmbiguityClassifierNode(LLMNode):
     """
     Classifies the type of ambiguity using an LLM. Uses **standalone_question** (pass-through copy of user request).
 
@@ -30,6 +30,8 @@ class AmbiguityClassifierNode(BaseNode):
       - FAILURE on errors (safe default)
     """
 
+    cache_llm = True
+
     def __init__(
         self,
         name: str,
@@ -65,60 +67,60 @@ class AmbiguityClassifierNode(BaseNode):
             return []
         return list(used) if isinstance(used, list) else []
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            standalone_question: Optional[str] = getattr(
-                self._client, "standalone_question", None
-            )
-            turn_history = getattr(self._client, "turn_history", None) or []
-            used_list = self._get_used_ambiguous_types()
-
-            if not standalone_question or not str(standalone_question).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
-
-            prompt = build_ambiguity_discriminator_prompt(
-                user_request=str(standalone_question),
-                turn_history=list(turn_history),
-                max_lines=self._max_history_lines,
-                used_ambiguous_types=used_list,
-            )
-
-            raw = self._llm.invoke(prompt).content.strip()
-            response = raw.split("\n")[0].strip() if raw else ""
-
-            classified = None
-            resp_lower = response.lower()
+    def build_prompt(self) -> Optional[str]:
+        standalone_question: Optional[str] = getattr(
+            self._client, "standalone_question", None
+        )
+        turn_history = getattr(self._client, "turn_history", None) or []
+        used_list = self._get_used_ambiguous_types()
+
+        if not standalone_question or not str(standalone_question).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
+
+        return build_ambiguity_discriminator_prompt(
+            user_request=str(standalone_question),
+            turn_history=turn_history,
+            max_lines=self._max_history_lines,
+            used_ambiguous_types=used_list,
+        )
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        raw = content.strip()
+        response = raw.split("\n")[0].strip() if raw else ""
+
+        classified = None
+        resp_lower = response.lower()
+        for t in AMBIGUITY_TYPES:
+            if t.lower() in resp_lower or resp_lower in t.lower():
+                classified = t
+                break
+        if not classified:
+            first = response.split()[0] if response else ""
             for t in AMBIGUITY_TYPES:
-                if t.lower() in resp_lower or resp_lower in t.lower():
+                if (
+                    t.lower().startswith(first.lower())
+                    or first.lower() in t.lower()
+                ):
                     classified = t
                     break
-            if not classified:
-                first = response.split()[0] if response else ""
-                for t in AMBIGUITY_TYPES:
-                    if (
-                        t.lower().startswith(first.lower())
-                        or first.lower() in t.lower()
-                    ):
-                        classified = t
-                        break
-            if not classified:
-                classified = "Common sense"
-
-            self._client.current_ambiguous_type = classified
-            current_used = self._get_used_ambiguous_types()
-            self._client.used_ambiguous_types = current_used + [classified]
-
-            file_logger.info(
-                f"AmbiguityClassifierNode: classified type = {classified!r}"
-            )
-            self.bb.append_bot_trace_step(determine_type_line(classified), "ok")
-            return py_trees.common.Status.SUCCESS
-
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"AmbiguityClassifierNode error: {error_msg}")
-            self._client.current_ambiguous_type = "Common sense"  # fallback
-            self.bb.append_bot_trace_step(
-                determine_type_line("Common sense"), "fail"
-            )
-            return py_trees.common.Status.FAILURE
+        if not classified:
+            classified = "Common sense"
+
+        self._client.current_ambiguous_type = classified
+        current_used = self._get_used_ambiguous_types()
+        self._client.used_ambiguous_types = current_used + [classified]
+
+        file_logger.info(
+            f"AmbiguityClassifierNode: classified type = {classified!r}"
+        )
+        self.bb.append_bot_trace_step(determine_type_line(classified), "ok")
+        return py_trees.common.Status.SUCCESS
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"AmbiguityClassifierNode error: {error_msg}")
+        self._client.current_ambiguous_type = "Common sense"  # fallback
+        self.bb.append_bot_trace_step(
+            determine_type_line("Common sense"), "fail"
+        )
+        return py_trees.common.Status.FAILURE
@@ -5,11 +5,11 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_ambiguity_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 
 
-class AmbiguityDetectorNode(BaseNode):
+class AmbiguityDetectorNode(LLMNode):
     """
     Ambiguity detection uses **standalone_question**, **turn_history**, and **current_related_entities**
     (from vector search run before this node).
@@ -26,6 +26,8 @@ class AmbiguityDetectorNode(BaseNode):
       - FAILURE only on errors.
     """
 
+    cache_llm = True
+
     def __init__(
         self,
         name: str,
@@ -51,55 +53,55 @@ class AmbiguityDetectorNode(BaseNode):
             key="is_ambiguous", access=py_trees.common.Access.WRITE
         )
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            standalone_question: Optional[str] = getattr(
-                self._client, "standalone_question", None
-            )
-            turn_history = getattr(self._client, "turn_history", None) or []
-            related = getattr(self._client, "current_related_entities", None) or []
-            related_list: list = [str(x) for x in related] if isinstance(related, list) else []
-
-            if not standalone_question or not str(standalone_question).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
-
-            prompt = build_ambiguity_prompt(
-                user_request=str(standalone_question),
-                turn_history=list(turn_history),
-                max_lines=self._max_history_lines,
-                related_entities=related_list,
-            )
+    def build_prompt(self) -> Optional[str]:
+        standalone_question: Optional[str] = getattr(
+            self._client, "standalone_question", None
+        )
+        turn_history = getattr(self._client, "turn_history", None) or []
+        related = getattr(self._client, "current_related_entities", None) or []
+        related_list: list = [str(x) for x in related] if isinstance(related, list) else []
+
+        if not standalone_question or not str(standalone_question).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
+
+        return build_ambiguity_prompt(
+            user_request=str(standalone_question),
+            turn_history=turn_history,
+            max_lines=self._max_history_lines,
+            related_entities=related_list,
+        )
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        raw = content.strip()
+        # Use first line/token only so trailing explanation does not affect routing
+        response = raw.split("\n")[0].strip().upper() if raw else ""
 
-            raw = self._llm.invoke(prompt).content.strip()
-            # Use first line/token only so trailing explanation does not affect routing
-            response = raw.split("\n")[0].strip().upper() if raw else ""
-
-            if "AMBIGUOUS" in response:
-                self._client.is_ambiguous = True
-                file_logger.info("AmbiguityDetector: Question is ambiguous")
-                self._log_trace_step(
-                    py_trees.common.Status.SUCCESS,
-                    "Ambiguous: True",
-                )
-                return py_trees.common.Status.SUCCESS
-
-            if "CLEAR" in response:
-                self._client.is_ambiguous = False
-                file_logger.info("AmbiguityDetector: Question is clear")
-                self._log_trace_step(
-                    py_trees.common.Status.SUCCESS,
-                    "Ambiguous: False",
-                )
-                return py_trees.common.Status.SUCCESS
-
-            raise ValueError(f"LLM returned unexpected output: {response[:80]!r}")
-
-        except Exception as e:
-            self._client.is_ambiguous = True  # safe fallback
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"AmbiguityDetector error: {error_msg}")
+        if "AMBIGUOUS" in response:
+            self._client.is_ambiguous = True
+            file_logger.info("AmbiguityDetector: Question is ambiguous")
             self._log_trace_step(
-                py_trees.common.Status.FAILURE,
+                py_trees.common.Status.SUCCESS,
                 "Ambiguous: True",
             )
-            return py_trees.common.Status.FAILURE
+            return py_trees.common.Status.SUCCESS
+
+        if "CLEAR" in response:
+            self._client.is_ambiguous = False
+            file_logger.info("AmbiguityDetector: Question is clear")
+            self._log_trace_step(
+                py_trees.common.Status.SUCCESS,
+                "Ambiguous: False",
+            )
+            return py_trees.common.Status.SUCCESS
+
+        raise ValueError(f"LLM returned unexpected output: {response[:80]!r}")
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        self._client.is_ambiguous = True  # safe fallback
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"AmbiguityDetector error: {error_msg}")
+        self._log_trace_step(
+            py_trees.common.Status.FAILURE,
+            "Ambiguous: True",
+        )
+        return py_trees.common.Status.FAILURE
@@ -7,12 +7,12 @@ from prompts import (build_common_sense_repair_prompt,
                      build_preference_repair_prompt,
                      build_safety_repair_prompt)
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 from .bot_trace_format import constructing_response_line
 
 
-class AmbiguousRepairNode(BaseNode):
+class AmbiguousRepairNode(LLMNode):
     """
     Produces a **clarifying** assistant message for the ambiguous path (ask the user back).
 
@@ -33,6 +33,8 @@ class AmbiguousRepairNode(BaseNode):
       - FAILURE on errors (safe default)
     """
 
+    stream_llm = True
+
     def __init__(
         self,
         name: str,
@@ -62,64 +64,55 @@ class AmbiguousRepairNode(BaseNode):
         )
         self._client.register_key(key="answer", access=py_trees.common.Access.WRITE)
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            standalone_question: Optional[str] = getattr(
-                self._client, "standalone_question", None
-            )
-            turn_history = getattr(self._client, "turn_history", None) or []
-            ambiguous_type: Optional[str] = (
-                getattr(self._client, "current_ambiguous_type", None) or "Common sense"
-            )
-            related = getattr(self._client, "current_related_entities", None) or []
-            related_list: List[str] = list(related) if isinstance(related, list) else []
-
-            if not standalone_question or not str(standalone_question).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
-
-            t = ambiguous_type.strip()
-            t_lower = t.lower()
-
-            if "safety" in t_lower:
-                prompt = build_safety_repair_prompt(
-                    user_request=str(standalone_question),
-                    turn_history=list(turn_history),
-                    related_entities=related_list,
-                    max_lines=self._max_history_lines,
-                )
-            elif "preference" in t_lower:
-                prompt = build_preference_repair_prompt(
-                    user_request=str(standalone_question),
-                    turn_history=list(turn_history),
-                    related_entities=related_list,
-                    max_lines=self._max_history_lines,
-                )
-            else:
-                prompt = build_common_sense_repair_prompt(
-                    user_request=str(standalone_question),
-                    turn_history=list(turn_history),
-                    related_entities=related_list,
-                    max_lines=self._max_history_lines,
-                )
-
-            response = self._llm.invoke(prompt).content.strip()
-            self._client.repaired_response = response
-            self._client.answer = response
-
-            file_logger.info(
-                f"AmbiguousRepairNode: produced repair for type {ambiguous_type!r}"
-            )
-            self.bb.append_bot_trace_step(constructing_response_line(), "ok")
-            return py_trees.common.Status.SUCCESS
-
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"AmbiguousRepairNode error: {error_msg}")
-            fallback = (
-                "I need a bit more detail to help you safely. "
-                "Could you clarify what you're trying to do?"
-            )
-            self._client.repaired_response = fallback
-            self._client.answer = fallback
-            self.bb.append_bot_trace_step(constructing_response_line(), "fail")
-            return py_trees.common.Status.FAILURE
+    def build_prompt(self) -> Optional[str]:
+        standalone_question: Optional[str] = getattr(
+            self._client, "standalone_question", None
+        )
+        turn_history = getattr(self._client, "turn_history", None) or []
+        ambiguous_type: Optional[str] = (
+            getattr(self._client, "current_ambiguous_type", None) or "Common sense"
+        )
+        related = getattr(self._client, "current_related_entities", None) or []
+        related_list: List[str] = list(related) if isinstance(related, list) else []
+
+        if not standalone_question or not str(standalone_question).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
+
+        t_lower = ambiguous_type.strip().lower()
+
+        if "safety" in t_lower:
+            build = build_safety_repair_prompt
+        elif "preference" in t_lower:
+            build = build_preference_repair_prompt
+        else:
+            build = build_common_sense_repair_prompt
+        return build(
+            user_request=str(standalone_question),
+            turn_history=turn_history,
+            related_entities=related_list,
+            max_lines=self._max_history_lines,
+        )
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        response = content.strip()
+        self._client.repaired_response = response
+        self._client.answer = response
+
+        ambiguous_type = getattr(self._client, "current_ambiguous_type", None)
+        file_logger.info(
+            f"AmbiguousRepairNode: produced repair for type {ambiguous_type!r}"
+        )
+        self.bb.append_bot_trace_step(constructing_response_line(), "ok")
+        return py_trees.common.Status.SUCCESS
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"AmbiguousRepairNode error: {error_msg}")
+        fallback = (
+            "I need a bit more detail to help you safely. "
+            "Could you clarify what you're trying to do?"
+        )
+        self._client.repaired_response = fallback
+        self._client.answer = fallback
+        self.bb.append_bot_trace_step(constructing_response_line(), "fail")
+        return py_trees.common.Status.FAILURE
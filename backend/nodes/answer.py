@@ -5,11 +5,11 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_answer_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 
 
-class AnswerNode(BaseNode):
+class AnswerNode(LLMNode):
     """
     Reads:
       - standalone_question (pass-through copy of user request)
@@ -46,48 +46,49 @@ class AnswerNode(BaseNode):
         )
         self._client.register_key(key="answer", access=py_trees.common.Access.WRITE)
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            standalone_question: Optional[str] = getattr(
-                self._client, "standalone_question", None
-            )
-            turn_history = getattr(self._client, "turn_history", None) or []
-            related_entities = (
-                getattr(self._client, "current_related_entities", None) or []
-            )
+    def build_prompt(self) -> Optional[str]:
+        standalone_question: Optional[str] = getattr(
+            self._client, "standalone_question", None
+        )
+        turn_history = getattr(self._client, "turn_history", None) or []
+        related_entities = (
+            getattr(self._client, "current_related_entities", None) or []
+        )
 
-            if not standalone_question or not str(standalone_question).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
+        if not standalone_question or not str(standalone_question).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
 
-            # Convert related_entities to list of strings
-            if related_entities and isinstance(related_entities, list):
-                entity_list = [str(entity) for entity in related_entities if entity]
-            else:
-                entity_list = []
+        # Convert related_entities to list of strings
+        if related_entities and isinstance(related_entities, list):
+            entity_list = [str(entity) for entity in related_entities if entity]
+        else:
+            entity_list = []
 
-            prompt = build_answer_prompt(
-                user_request=str(standalone_question),
-                related_entities=entity_list,
-                turn_history=list(turn_history) if turn_history else None,
-                max_history_lines=self._max_history_lines,
-            )
+        return build_answer_prompt(
+            user_request=str(standalone_question),
+            related_entities=entity_list,
+            turn_history=turn_history or None,
+            max_history_lines=self._max_history_lines,
+        )
 
-            response = self._llm.invoke(prompt).content.strip()
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        response = content.strip()
 
-            if not response:
-                raise ValueError("LLM returned empty answer")
+        if not response:
+            raise ValueError("LLM returned empty answer")
 
-            # Store the answer in blackboard
-            self._client.answer = response
-            file_logger.info(
-                f"AnswerNode: Generated answer for request: {standalone_question[:50]}..."
-            )
-            self._log_trace(py_trees.common.Status.SUCCESS)
-            return py_trees.common.Status.SUCCESS
+        # Store the answer in blackboard
+        self._client.answer = response
+        standalone_question = getattr(self._client, "standalone_question", None) or ""
+        file_logger.info(
+            f"AnswerNode: Generated answer for request: {standalone_question[:50]}..."
+        )
+        self._log_trace(py_trees.common.Status.SUCCESS)
+        return py_trees.common.Status.SUCCESS
 
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"AnswerNode error: {error_msg}")
-            self._client.answer = ""  # safe fallback
-            self._log_trace(py_trees.common.Status.FAILURE)
-            return py_trees.common.Status.FAILURE
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"AnswerNode error: {error_msg}")
+        self._client.answer = ""  # safe fallback
+        self._log_trace(py_trees.common.Status.FAILURE)
+        return py_trees.common.Status.FAILURE
@@ -5,11 +5,11 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_standalone_question_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 
 
-class StandaloneQuestionNode(BaseNode):
+class StandaloneQuestionNode(LLMNode):
     """
     Rewrites USER_REQUEST into a **standalone request** (one line) using the LLM + turn_history.
 
@@ -26,6 +26,8 @@ class StandaloneQuestionNode(BaseNode):
       - FAILURE on errors (sets standalone_question = user_question)
     """
 
+    cache_llm = True
+
     def __init__(
         self,
         name: str,
@@ -47,32 +49,33 @@ class StandaloneQuestionNode(BaseNode):
             key="standalone_question", access=py_trees.common.Access.WRITE
         )
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            user_question: Optional[str] = getattr(self._client, "user_question", None)
-            turn_history = getattr(self._client, "turn_history", None) or []
-
-            if not user_question or not str(user_question).strip():
-                raise ValueError("blackboard.user_question is missing/empty")
-
-            prompt = build_standalone_question_prompt(
-                user_request=str(user_question),
-                turn_history=list(turn_history),
-                max_history_lines=self._max_history_lines,
-            )
-
-            response = self._llm.invoke(prompt).content.strip()
-            standalone = response if response else str(user_question).strip()
-            self._client.standalone_question = standalone
-
-            file_logger.info(
-                f"StandaloneQuestionNode: standalone request: {standalone[:80]!r}"
-            )
-            return py_trees.common.Status.SUCCESS
-
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"StandaloneQuestionNode error: {error_msg}")
-            user_question = getattr(self._client, "user_question", None) or ""
-            self._client.standalone_question = str(user_question).strip()
-            return py_trees.common.Status.FAILURE
+    def build_prompt(self) -> Optional[str]:
+        user_question: Optional[str] = getattr(self._client, "user_question", None)
+        turn_history = getattr(self._client, "turn_history", None) or []
+
+        if not user_question or not str(user_question).strip():
+            raise ValueError("blackboard.user_question is missing/empty")
+
+        return build_standalone_question_prompt(
+            user_request=str(user_question),
+            turn_history=turn_history,
+            max_history_lines=self._max_history_lines,
+        )
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        user_question = getattr(self._client, "user_question", None) or ""
+        response = content.strip()
+        standalone = response if response else str(user_question).strip()
+        self._client.standalone_question = standalone
+
+        file_logger.info(
+            f"StandaloneQuestionNode: standalone request: {standalone[:80]!r}"
+        )
+        return py_trees.common.Status.SUCCESS
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"StandaloneQuestionNode error: {error_msg}")
+        user_question = getattr(self._client, "user_question", None) or ""
+        self._client.standalone_question = str(user_question).strip()
+        return py_trees.common.Status.FAILURE
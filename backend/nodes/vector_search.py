@@ -9,6 +9,8 @@ from .base import BaseNode
 from .black_board import Blackboard
 from .bot_trace_format import retrieving_entities_context, searching_entities_line
 
+SEARCH_KWARGS = dict(top_k=5, dense_weight=0.4, sparse_weight=0.6, min_score=0.6)
+
 
 class VectorSearchNode(BaseNode):
     """
@@ -44,14 +46,39 @@ class VectorSearchNode(BaseNode):
             key="current_related_entities", access=py_trees.common.Access.WRITE
         )
 
+    def _query(self) -> str:
+        standalone_question: Optional[str] = getattr(
+            self._client, "standalone_question", None
+        )
+
+        if not standalone_question or not str(standalone_question).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
+        return str(standalone_question)
+
+    def _set_results(self, search_results: list) -> py_trees.common.Status:
+        related_entities = [result.entity for result in search_results]
+
+        self._client.current_related_entities = related_entities
+        file_logger.info(
+            f"VectorSearchNode: Found {len(related_entities)} related entities"
+        )
+        n = len(related_entities)
+        # self.bb.append_bot_trace_step(retrieving_entities_context(), "ok")
+        self.bb.append_bot_trace_step(searching_entities_line(n), "ok")
+        return py_trees.common.Status.SUCCESS
+
+    def _handle_error(self, e: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(e).__name__}: {e}"
+        file_logger.error(f"VectorSearchNode error: {error_msg}")
+        self._client.current_related_entities = []  # safe fallback; routing continues
+        self.bb.append_bot_trace_step(retrieving_entities_context(), "ok")
+        self.bb.append_bot_trace_step(searching_entities_line(0), "fail")
+        # SUCCESS so root sequence continues to ambiguity + paths (same as old OptionalEntities fallback)
+        return py_trees.common.Status.SUCCESS
+
     def update(self) -> py_trees.common.Status:
         try:
-            standalone_question: Optional[str] = getattr(
-                self._client, "standalone_question", None
-            )
-
-            if not standalone_question or not str(standalone_question).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
+            query = self._query()
 
             # Use search_sync which handles async internally with asyncio.run()
             # Suppress RuntimeWarning about coroutines - search_sync properly handles async
@@ -61,30 +88,17 @@ class VectorSearchNode(BaseNode):
                     message=".*coroutine.*was never awaited.*",
                     category=RuntimeWarning,
                 )
-                search_results = self._vecdb.search(
-                    query=str(standalone_question),
-                    top_k=5,
-                    dense_weight=0.4,
-                    sparse_weight=0.6,
-                    min_score=0.6,
-                )
+                search_results = self._vecdb.search(query=query, **SEARCH_KWARGS)
 
-            related_entities = [result.entity for result in search_results]
+            return self._set_results(search_results)
 
-            self._client.current_related_entities = related_entities
-            file_logger.info(
-                f"VectorSearchNode: Found {len(related_entities)} related entities"
-            )
-            n = len(related_entities)
-            # self.bb.append_bot_trace_step(retrieving_entities_context(), "ok")
-            self.bb.append_bot_trace_step(searching_entities_line(n), "ok")
-            return py_trees.common.Status.SUCCESS
+        except Exception as e:
+            return self._handle_error(e)
 
+    async def async_update(self) -> py_trees.common.Status:
+        try:
+            query = self._query()
+            search_results = await self._vecdb.asearch(query=query, **SEARCH_KWARGS)
+            return self._set_results(search_results)
         except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"VectorSearchNode error: {error_msg}")
-            self._client.current_related_entities = []  # safe fallback; routing continues
-            self.bb.append_bot_trace_step(retrieving_entities_context(), "ok")
-            self.bb.append_bot_trace_step(searching_entities_line(0), "fail")
-            # SUCCESS so root sequence continues to ambiguity + paths (same as old OptionalEntities fallback)
-            return py_trees.common.Status.SUCCESS
+            return self._handle_error(e)
@@ -7,10 +7,12 @@ from .knowno_ambiguity_related_detect import KnownoAmbiguityRelatedDetectNode
 from .knowno_ambiguity_response import KnownoAmbiguityResponseNode
 from .knowno_ambiguity_rule import KnownoAmbiguityRuleNode
 from .knowno_ambiguous_classifier import KnownoAmbiguousClassifierNode
+from .knowno_fused_reasoning import KnownoFusedReasoningNode
 from .knowno_viable_objects import KnownoViableObjectsNode
 from .knowno_viable_objects_gate import KnownoViableObjectsAvailableNode
 from .load_history import LoadHistoryNode
 from .perform_action_node import PerformActionNode
+from .question_search import QuestionSearchNode
 from .entities_predictor import EntitiesPredictorNode
 from .entity_resolve import EntityResolveNode
 from .save_message import SaveMessageNode
@@ -27,10 +29,12 @@ __all__ = [
     "KnownoAmbiguityResponseNode",
     "KnownoAmbiguityRuleNode",
     "KnownoAmbiguousClassifierNode",
+    "KnownoFusedReasoningNode",
     "KnownoViableObjectsAvailableNode",
     "KnownoViableObjectsNode",
     "LoadHistoryNode",
     "PerformActionNode",
+    "QuestionSearchNode",
     "EntitiesPredictorNode",
     "EntityResolveNode",
     "SaveMessageNode",
@@ -6,12 +6,12 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_entity_actions_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 from .bot_trace_format import determine_type_line
 
 
-class EntityActionGeneratorNode(BaseNode):
+class EntityActionGeneratorNode(LLMNode):
     """
     Generates actions for entities based on the user's request.
 
@@ -26,6 +26,8 @@ class EntityActionGeneratorNode(BaseNode):
       - FAILURE on errors (safe default)
     """
 
+    cache_llm = True
+
     def __init__(
         self,
         name: str,
@@ -56,35 +58,34 @@ class EntityActionGeneratorNode(BaseNode):
             return []
         return list(entities) if isinstance(entities, list) else []
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            standalone_question: Optional[str] = getattr(
-                self._client, "standalone_question", None
-            )
-            current_related_entities = self._get_current_related_entities()
+    def build_prompt(self) -> Optional[str]:
+        standalone_question: Optional[str] = getattr(
+            self._client, "standalone_question", None
+        )
+        current_related_entities = self._get_current_related_entities()
 
-            if not current_related_entities:
-                self._client.entity_action = []
-                return py_trees.common.Status.SUCCESS
+        if not current_related_entities:
+            self._client.entity_action = []
+            return None
 
-            if not standalone_question or not str(standalone_question).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
+        if not standalone_question or not str(standalone_question).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
 
-            prompt = build_entity_actions_prompt(
-                user_request=str(standalone_question),
-                related_entities=current_related_entities,
-            )
+        return build_entity_actions_prompt(
+            user_request=str(standalone_question),
+            related_entities=current_related_entities,
+        )
 
-            response = self._llm.invoke(prompt).content.strip()
-            parsed = json.loads(response)
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        parsed = json.loads(content.strip())
 
-            self._client.entity_action = parsed
+        self._client.entity_action = parsed
 
 
-            return py_trees.common.Status.SUCCESS
+        return py_trees.common.Status.SUCCESS
 
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"EntityActionGeneratorNode error: {error_msg}")
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"EntityActionGeneratorNode error: {error_msg}")
 
-            return py_trees.common.Status.FAILURE
+        return py_trees.common.Status.FAILURE
@@ -1,4 +1,10 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
 import py_trees
+from clients.llm_cache import CachedChatModel
+from utils.metrics import record_node
 
 from .black_board import Blackboard
 
@@ -9,13 +15,39 @@ class BaseNode(py_trees.behaviour.Behaviour):
         super().__init__(name=name)
         self.bb = bb
 
-        self._client = py_trees.blackboard.Client(name=f"{name}_client")
+        self._client = py_trees.blackboard.Client(
+            name=f"{name}_client", namespace=bb.namespace
+        )
+        self._started: Optional[float] = None
+        # LLM token usage of the current run (input_tokens / output_tokens)
+        self._usage: Dict[str, int] = {}
 
     def initialise(self) -> None:
-        pass
+        self._started = time.perf_counter()
+        self._usage = {}
 
     def terminate(self, new_status: py_trees.common.Status) -> None:
-        pass
+        """Record the run's wall time, tokens and outcome (metrics + bot_trace timing)."""
+        started, self._started = self._started, None
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        outcome = new_status.name.lower()
+        record_node(self.name, outcome, elapsed, self._usage)
+        self.bb.append_bot_trace_timing(self.name, outcome, elapsed, self._usage)
+
+    def _add_usage(self, message) -> None:
+        usage = getattr(message, "usage_metadata", None) or {}
+        for kind in ("input_tokens", "output_tokens"):
+            if usage.get(kind):
+                self._usage[kind] = self._usage.get(kind, 0) + int(usage[kind])
+
+    async def async_update(self) -> py_trees.common.Status:
+        """
+        Async counterpart of update() used by behavior_tree.async_runner.
+        Default runs update() in a worker thread; nodes doing I/O override it.
+        """
+        return await asyncio.to_thread(self.update)
 
     def _log_trace(self, status: py_trees.common.Status) -> None:
         """Legacy: append node name. Prefer _log_trace_step with a human label."""
@@ -26,3 +58,88 @@ class BaseNode(py_trees.behaviour.Behaviour):
         """Append an explainable step for the assistant message trace (UI)."""
         ok = status == py_trees.common.Status.SUCCESS
         self.bb.append_bot_trace_step(step, "ok" if ok else "fail")
+
+
+class LLMNode(BaseNode):
+    """
+    Node with a single LLM call, split so sync (``invoke``) and async (``ainvoke``)
+    ticks share the same prompt building and parsing.
+
+    Subclasses set ``self._llm`` and implement:
+      - build_prompt() -> prompt, or None when outputs were settled without the LLM
+      - handle_response(content) -> Status
+      - handle_error(exc) -> Status (exceptions from both steps land here)
+
+    ``cache_llm = True`` opts the node into the LLM response cache (clients.llm_cache)
+    for nodes whose answer depends only on the prompt.
+
+    ``stream_llm = True`` marks nodes that write the user-facing reply: while the
+    blackboard has a listener (SSE endpoint), they call ``stream``/``astream`` and emit
+    each text chunk as a "token" event; ``handle_response`` still gets the full text.
+    """
+
+    _llm = None
+    cache_llm = False
+    stream_llm = False
+
+    def _invoke_kwargs(self) -> dict:
+        if isinstance(self._llm, CachedChatModel):
+            return {"cache": self.cache_llm, "tag": type(self).__name__}
+        return {}
+
+    def _streaming(self) -> bool:
+        return self.stream_llm and self.bb.listener is not None
+
+    def _emit_chunk(self, chunk, parts: list) -> None:
+        self._add_usage(chunk)
+        text = chunk.content if isinstance(chunk.content, str) else ""
+        if text:
+            parts.append(text)
+            self.bb.emit("token", text)
+
+    def _stream(self, prompt: str) -> str:
+        parts: list = []
+        for chunk in self._llm.stream(prompt):
+            self._emit_chunk(chunk, parts)
+        return "".join(parts)
+
+    async def _astream(self, prompt: str) -> str:
+        parts: list = []
+        async for chunk in self._llm.astream(prompt):
+            self._emit_chunk(chunk, parts)
+        return "".join(parts)
+
+    def build_prompt(self) -> Optional[str]:
+        raise NotImplementedError
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        raise NotImplementedError
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        raise NotImplementedError
+
+    def update(self) -> py_trees.common.Status:
+        try:
+            prompt = self.build_prompt()
+            if prompt is None:
+                return py_trees.common.Status.SUCCESS
+            if self._streaming():
+                return self.handle_response(self._stream(prompt))
+            response = self._llm.invoke(prompt, **self._invoke_kwargs())
+            self._add_usage(response)
+            return self.handle_response(response.content)
+        except Exception as e:
+            return self.handle_error(e)
+
+    async def async_update(self) -> py_trees.common.Status:
+        try:
+            prompt = self.build_prompt()
+            if prompt is None:
+                return py_trees.common.Status.SUCCESS
+            if self._streaming():
+                return self.handle_response(await self._astream(prompt))
+            response = await self._llm.ainvoke(prompt, **self._invoke_kwargs())
+            self._add_usage(response)
+            return self.handle_response(response.content)
+        except Exception as e:
+            return self.handle_error(e)
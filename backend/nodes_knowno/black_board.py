@@ -1,6 +1,7 @@
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
 import py_trees
+from prompts.template import TurnHistory
 
 AMBIGUITY_TYPES = [
     "Safety",
@@ -10,8 +11,15 @@ AMBIGUITY_TYPES = [
 
 
 class Blackboard:
-    def __init__(self, name: str = "bt"):
-        self._client = py_trees.blackboard.Client(name=name)
+    def __init__(self, name: str = "bt", namespace: Optional[str] = None):
+        # namespace isolates this blackboard's keys from other trees in the process
+        # (py_trees storage is global); node clients reuse it via BaseNode.
+        self.namespace = namespace
+        self._client = py_trees.blackboard.Client(name=name, namespace=namespace)
+        # Optional ``listener(event, data)`` for streaming a turn (SSE endpoint); events:
+        # "trace" (bot_trace step dict) and "token" (LLM text chunk). May be called from
+        # worker threads.
+        self.listener: Optional[Callable[[str, Any], None]] = None
 
         # Standalone request line from StandaloneQuestionNode (LLM rewrite of user message + history)
         self._client.register_key(
@@ -44,6 +52,9 @@ class Blackboard:
         self._client.register_key(
             key="current_related_entities", access=py_trees.common.Access.WRITE
         )
+        self._client.register_key(
+            key="question_related_entities", access=py_trees.common.Access.WRITE
+        )
         self._client.register_key(
             key="entity_action", access=py_trees.common.Access.WRITE
         )
@@ -70,6 +81,10 @@ class Blackboard:
         )
         self._client.register_key(key="user_id", access=py_trees.common.Access.WRITE)
         self._client.register_key(key="bot_trace", access=py_trees.common.Access.WRITE)
+        # Rows written by SaveMessageNode ([user, assistant]) for the API response
+        self._client.register_key(
+            key="saved_messages", access=py_trees.common.Access.WRITE
+        )
 
     @property
     def answer(self) -> Optional[str]:
@@ -93,7 +108,9 @@ class Blackboard:
 
     @turn_history.setter
     def turn_history(self, value: List[str]) -> None:
-        self._client.turn_history = list(value or [])
+        self._client.turn_history = (
+            value if isinstance(value, TurnHistory) else TurnHistory(value or ())
+        )
 
     @property
     def user_question(self) -> Optional[str]:
@@ -164,6 +181,14 @@ class Blackboard:
     def user_id(self, value: Optional[str]) -> None:
         self._client.user_id = value
 
+    @property
+    def saved_messages(self) -> List[dict]:
+        return list(getattr(self._client, "saved_messages", []) or [])
+
+    @saved_messages.setter
+    def saved_messages(self, value: List[dict]) -> None:
+        self._client.saved_messages = list(value or [])
+
     def append_bot_trace(self, node_name: str, status: str) -> None:
         """Legacy: technical node name. Prefer append_bot_trace_step for explainable UI traces."""
         try:
@@ -179,8 +204,32 @@ class Blackboard:
             trace = list(getattr(self._client, "bot_trace", None) or [])
         except KeyError:
             trace = []
-        trace.append({"step": step.strip(), "status": status})
+        entry = {"step": step.strip(), "status": status}
+        trace.append(entry)
         self._client.bot_trace = trace
+        self.emit("trace", entry)
+
+    def append_bot_trace_timing(
+        self, node_name: str, outcome: str, seconds: float, usage: Optional[dict] = None
+    ) -> None:
+        """Append a structured timing entry ``{"timing": {...}}`` for one node run."""
+        try:
+            trace = list(getattr(self._client, "bot_trace", None) or [])
+        except KeyError:
+            trace = []
+        timing = {
+            "node": node_name,
+            "outcome": outcome,
+            "elapsed_ms": round(seconds * 1000.0, 1),
+        }
+        timing.update(usage or {})
+        trace.append({"timing": timing})
+        self._client.bot_trace = trace
+
+    def emit(self, event: str, data: Any) -> None:
+        """Forward a streaming event to ``listener`` (no-op when nobody is listening)."""
+        if self.listener is not None:
+            self.listener(event, data)
 
     def get_bot_trace(self) -> List[dict]:
         """Return current bot_trace list (for saving to DB)."""
@@ -194,11 +243,13 @@ class Blackboard:
         """Reset blackboard state for a new top-level question (e.g. after showing answer or starting fresh)."""
         self._client.user_question = None
         self._client.standalone_question = None
-        self._client.turn_history = []
+        self._client.turn_history = TurnHistory()
         self._client.is_ambiguous = None
         self._client.current_related_entities = []
+        self._client.question_related_entities = None
         self._client.answer = None
         self._client.bot_trace = []
+        self._client.saved_messages = []
         try:
             self._client.used_ambiguous_types = []
         except KeyError:
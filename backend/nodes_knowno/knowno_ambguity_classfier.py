@@ -78,7 +78,7 @@ class AmbiguityClassifierNode(BaseNode):
 
             prompt = build_ambiguity_discriminator_prompt(
                 user_request=str(standalone_question),
-                turn_history=list(turn_history),
+                turn_history=turn_history,
                 max_lines=self._max_history_lines,
                 used_ambiguous_types=used_list,
             )
@@ -5,11 +5,11 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_ambiguity_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 
 
-class KnownoAmbiguityRelatedDetectNode(BaseNode):
+class KnownoAmbiguityRelatedDetectNode(LLMNode):
     """
     Fallback ambiguity detection when viable objects are unavailable (empty or
     extraction failed). Mirrors ``nodes.ambiguous_detection.AmbiguityDetectorNode``:
@@ -26,6 +26,8 @@ class KnownoAmbiguityRelatedDetectNode(BaseNode):
     defaults to ambiguous like other knowno nodes).
     """
 
+    cache_llm = True
+
     def __init__(
         self,
         name: str,
@@ -53,64 +55,64 @@ class KnownoAmbiguityRelatedDetectNode(BaseNode):
             key="current_ambiguous_type", access=py_trees.common.Access.WRITE
         )
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            standalone_question: Optional[str] = getattr(
-                self._client, "standalone_question", None
-            )
-            turn_history = getattr(self._client, "turn_history", None) or []
-            related = getattr(self._client, "current_related_entities", None) or []
-            related_list: List[str] = (
-                [str(x) for x in related] if isinstance(related, list) else []
-            )
+    def build_prompt(self) -> Optional[str]:
+        standalone_question: Optional[str] = getattr(
+            self._client, "standalone_question", None
+        )
+        turn_history = getattr(self._client, "turn_history", None) or []
+        related = getattr(self._client, "current_related_entities", None) or []
+        related_list: List[str] = (
+            [str(x) for x in related] if isinstance(related, list) else []
+        )
 
-            if not standalone_question or not str(standalone_question).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
+        if not standalone_question or not str(standalone_question).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
 
-            prompt = build_ambiguity_prompt(
-                user_request=str(standalone_question),
-                turn_history=list(turn_history),
-                max_lines=self._max_history_lines,
-                related_entities=related_list,
+        return build_ambiguity_prompt(
+            user_request=str(standalone_question),
+            turn_history=turn_history,
+            max_lines=self._max_history_lines,
+            related_entities=related_list,
+        )
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        raw = content.strip()
+        response = raw.split("\n")[0].strip().upper() if raw else ""
+
+        if "AMBIGUOUS" in response:
+            self._client.is_ambiguous = True
+            file_logger.info(
+                "KnownoAmbiguityRelatedDetectNode: AMBIGUOUS (related path)"
             )
+            self.bb.append_bot_trace_step(
+                "Ambiguity detect (related entities): Ambiguous",
+                "ok",
+            )
+            return py_trees.common.Status.SUCCESS
 
-            raw = self._llm.invoke(prompt).content.strip()
-            response = raw.split("\n")[0].strip().upper() if raw else ""
-
-            if "AMBIGUOUS" in response:
-                self._client.is_ambiguous = True
-                file_logger.info(
-                    "KnownoAmbiguityRelatedDetectNode: AMBIGUOUS (related path)"
-                )
-                self.bb.append_bot_trace_step(
-                    "Ambiguity detect (related entities): Ambiguous",
-                    "ok",
-                )
-                return py_trees.common.Status.SUCCESS
-
-            if "CLEAR" in response:
-                self._client.is_ambiguous = False
-                self._client.current_ambiguous_type = None
-                file_logger.info(
-                    "KnownoAmbiguityRelatedDetectNode: CLEAR (related path)"
-                )
-                self.bb.append_bot_trace_step(
-                    "Ambiguity detect (related entities): Unambiguous",
-                    "ok",
-                )
-                return py_trees.common.Status.SUCCESS
-
-            raise ValueError(f"LLM returned unexpected output: {response[:80]!r}")
-
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(
-                f"KnownoAmbiguityRelatedDetectNode error: {error_msg}"
+        if "CLEAR" in response:
+            self._client.is_ambiguous = False
+            self._client.current_ambiguous_type = None
+            file_logger.info(
+                "KnownoAmbiguityRelatedDetectNode: CLEAR (related path)"
             )
-            self._client.is_ambiguous = True
-            self._client.current_ambiguous_type = "Common sense"
             self.bb.append_bot_trace_step(
-                "Ambiguity detect (related entities): error, default ambiguous",
-                "fail",
+                "Ambiguity detect (related entities): Unambiguous",
+                "ok",
             )
             return py_trees.common.Status.SUCCESS
+
+        raise ValueError(f"LLM returned unexpected output: {response[:80]!r}")
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(
+            f"KnownoAmbiguityRelatedDetectNode error: {error_msg}"
+        )
+        self._client.is_ambiguous = True
+        self._client.current_ambiguous_type = "Common sense"
+        self.bb.append_bot_trace_step(
+            "Ambiguity detect (related entities): error, default ambiguous",
+            "fail",
+        )
+        return py_trees.common.Status.SUCCESS
@@ -5,11 +5,11 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts.knowno_response_prompt import build_knowno_response_prompt
 
-from nodes.base import BaseNode
+from nodes.base import LLMNode
 from nodes.black_board import Blackboard
 
 
-class KnownoAmbiguityResponseNode(BaseNode):
+class KnownoAmbiguityResponseNode(LLMNode):
     """
     Ambiguous branch: assistant clarification using knowno_response_prompt.
 
@@ -22,6 +22,8 @@ class KnownoAmbiguityResponseNode(BaseNode):
       - answer
     """
 
+    stream_llm = True
+
     def __init__(
         self,
         name: str,
@@ -47,34 +49,35 @@ class KnownoAmbiguityResponseNode(BaseNode):
         )
         self._client.register_key(key="answer", access=py_trees.common.Access.WRITE)
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            sq: Optional[str] = getattr(self._client, "standalone_question", None)
-            turn_history = getattr(self._client, "turn_history", None) or []
-            amb_type = getattr(self._client, "current_ambiguous_type", None) or "None"
-            viable = getattr(self._client, "viable_objects", None) or []
+    def build_prompt(self) -> Optional[str]:
+        sq: Optional[str] = getattr(self._client, "standalone_question", None)
+        turn_history = getattr(self._client, "turn_history", None) or []
+        amb_type = getattr(self._client, "current_ambiguous_type", None) or "None"
+        viable = getattr(self._client, "viable_objects", None) or []
+
+        if not sq or not str(sq).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
 
-            if not sq or not str(sq).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
+        viable_list: List[dict] = list(viable) if isinstance(viable, list) else []
+        return build_knowno_response_prompt(
+            query=str(sq),
+            ambiguity_type=str(amb_type),
+            viable_objects=viable_list,
+            turn_history=turn_history,
+            max_history_lines=self._max_history_lines,
+        )
 
-            viable_list: List[dict] = list(viable) if isinstance(viable, list) else []
-            prompt = build_knowno_response_prompt(
-                query=str(sq),
-                ambiguity_type=str(amb_type),
-                viable_objects=viable_list,
-                turn_history=list(turn_history),
-                max_history_lines=self._max_history_lines,
-            )
-            response = self._llm.invoke(prompt).content.strip()
-            self._client.answer = response or "Which option should I use?"
-            file_logger.info("KnownoAmbiguityResponseNode: generated clarification")
-            self.bb.append_bot_trace_step("Generated clarification question", "ok")
-            return py_trees.common.Status.SUCCESS
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        response = content.strip()
+        self._client.answer = response or "Which option should I use?"
+        file_logger.info("KnownoAmbiguityResponseNode: generated clarification")
+        self.bb.append_bot_trace_step("Generated clarification question", "ok")
+        return py_trees.common.Status.SUCCESS
 
-        except Exception as e:
-            file_logger.error(
-                f"KnownoAmbiguityResponseNode error: {type(e).__name__}: {e}"
-            )
-            self._client.answer = "Which option should I use?"
-            self.bb.append_bot_trace_step("Generated clarification question", "fail")
-            return py_trees.common.Status.SUCCESS
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        file_logger.error(
+            f"KnownoAmbiguityResponseNode error: {type(exc).__name__}: {exc}"
+        )
+        self._client.answer = "Which option should I use?"
+        self.bb.append_bot_trace_step("Generated clarification question", "fail")
+        return py_trees.common.Status.SUCCESS
@@ -5,14 +5,14 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_knowno_ambig_classify_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 
 from .llm_json import parse_llm_json_object
 from .viable_objects_util import normalize_viable_objects
 
 
-class KnownoAmbiguousClassifierNode(BaseNode):
+class KnownoAmbiguousClassifierNode(LLMNode):
     """
     Knowno ambiguity: uses vector Top-K + entity_action + query/history; sets is_ambiguous.
 
@@ -26,6 +26,8 @@ class KnownoAmbiguousClassifierNode(BaseNode):
       - knowno_viable_objects (for clarification response)
     """
 
+    cache_llm = True
+
     def __init__(
         self,
         name: str,
@@ -56,53 +58,53 @@ class KnownoAmbiguousClassifierNode(BaseNode):
             key="viable_objects", access=py_trees.common.Access.WRITE
         )
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            sq: Optional[str] = getattr(self._client, "standalone_question", None)
-            turn_history = getattr(self._client, "turn_history", None) or []
-            ea_raw = getattr(self._client, "entity_action", None) or {}
-            entity_action: Dict[str, str] = (
-                dict(ea_raw) if isinstance(ea_raw, dict) else {}
-            )
-
-            if not sq or not str(sq).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
-
-
-            prompt = build_knowno_ambig_classify_prompt(
-                query=str(sq),
-                entity_action=entity_action,
-                turn_history=list(turn_history),
-                max_history_lines=self._max_history_lines,
-            )
-            raw = self._llm.invoke(prompt).content
-            data = parse_llm_json_object(raw)
-
-            classification = str(data.get("classification", "")).strip()
-            amb_type = str(data.get("ambiguity_type", "None")).strip() or "None"
-            viable_raw = data.get("viable_objects")
-
-            is_ambiguous = "ambiguous" in classification.lower()
-            self._client.is_ambiguous = is_ambiguous
-            self._client.current_ambiguous_type = amb_type
-            self._client.viable_objects = normalize_viable_objects(
-                viable_raw, entity_action
-            )
-
-            label = "Ambiguous" if is_ambiguous else "Unambiguous"
-            file_logger.info(
-                f"KnownoAmbiguousClassifierNode: {label}, type={amb_type!r}"
-            )
-            self.bb.append_bot_trace_step(
-                f"Classification: {label} ({amb_type})", "ok"
-            )
-            return py_trees.common.Status.SUCCESS
-
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"KnownoAmbiguousClassifierNode error: {error_msg}")
-            self._client.is_ambiguous = True
-            self._client.current_ambiguous_type = "Common Sense"
-            self._client.viable_objects = []
-            self.bb.append_bot_trace_step("Knowno classification", "fail")
-            return py_trees.common.Status.SUCCESS
+    def _entity_action(self) -> Dict[str, str]:
+        ea_raw = getattr(self._client, "entity_action", None) or {}
+        return dict(ea_raw) if isinstance(ea_raw, dict) else {}
+
+    def build_prompt(self) -> Optional[str]:
+        sq: Optional[str] = getattr(self._client, "standalone_question", None)
+        turn_history = getattr(self._client, "turn_history", None) or []
+
+        if not sq or not str(sq).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
+
+
+        return build_knowno_ambig_classify_prompt(
+            query=str(sq),
+            entity_action=self._entity_action(),
+            turn_history=turn_history,
+            max_history_lines=self._max_history_lines,
+        )
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        data = parse_llm_json_object(content)
+
+        classification = str(data.get("classification", "")).strip()
+        amb_type = str(data.get("ambiguity_type", "None")).strip() or "None"
+        viable_raw = data.get("viable_objects")
+
+        is_ambiguous = "ambiguous" in classification.lower()
+        self._client.is_ambiguous = is_ambiguous
+        self._client.current_ambiguous_type = amb_type
+        self._client.viable_objects = normalize_viable_objects(
+            viable_raw, self._entity_action()
+        )
+
+        label = "Ambiguous" if is_ambiguous else "Unambiguous"
+        file_logger.info(
+            f"KnownoAmbiguousClassifierNode: {label}, type={amb_type!r}"
+        )
+        self.bb.append_bot_trace_step(
+            f"Classification: {label} ({amb_type})", "ok"
+        )
+        return py_trees.common.Status.SUCCESS
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"KnownoAmbiguousClassifierNode error: {error_msg}")
+        self._client.is_ambiguous = True
+        self._client.current_ambiguous_type = "Common Sense"
+        self._client.viable_objects = []
+        self.bb.append_bot_trace_step("Knowno classification", "fail")
+        return py_trees.common.Status.SUCCESS
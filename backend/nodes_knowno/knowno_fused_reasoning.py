@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional
+
+import py_trees
+from langchain_openai import ChatOpenAI
+from logger import file_logger
+from prompts import build_knowno_fused_prompt
+
+from .base import LLMNode
+from .black_board import Blackboard
+from .llm_json import parse_llm_json_object
+from .viable_objects_util import (normalize_knowno_ambiguity_type_label,
+                                  normalize_viable_objects)
+
+
+class KnownoFusedReasoningNode(LLMNode):
+    """
+    One LLM call in place of EntityActionGeneration, KnownoViableObjects,
+    KnownoAmbigDetect / KnownoAmbiguityRelatedDetect and KnownoAmbigType.
+
+    Reads:
+      - standalone_question, turn_history, current_related_entities
+    Writes:
+      - entity_action, viable_objects
+      - is_ambiguous, current_ambiguous_type (None when unambiguous)
+      - knowno_viable_extraction_failed (True if LLM/parse failed)
+    """
+
+    cache_llm = True
+
+    def __init__(
+        self,
+        name: str,
+        bb: Blackboard,
+        llm: ChatOpenAI,
+        max_history_lines: int = 16,
+    ):
+        super().__init__(name=name, bb=bb)
+        self._llm = llm
+        self._max_history_lines = max_history_lines
+
+        self._client.register_key(
+            key="turn_history", access=py_trees.common.Access.READ
+        )
+        self._client.register_key(
+            key="standalone_question", access=py_trees.common.Access.READ
+        )
+        self._client.register_key(
+            key="current_related_entities", access=py_trees.common.Access.READ
+        )
+        for key in (
+            "entity_action",
+            "viable_objects",
+            "knowno_viable_extraction_failed",
+            "is_ambiguous",
+            "current_ambiguous_type",
+        ):
+            self._client.register_key(key=key, access=py_trees.common.Access.WRITE)
+
+    def _related_entities(self) -> List[str]:
+        try:
+            entities = getattr(self._client, "current_related_entities", None) or []
+        except KeyError:
+            return []
+        return list(entities) if isinstance(entities, list) else []
+
+    def build_prompt(self) -> Optional[str]:
+        sq: Optional[str] = getattr(self._client, "standalone_question", None)
+        turn_history = getattr(self._client, "turn_history", None) or []
+
+        if not sq or not str(sq).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
+
+        self._client.knowno_viable_extraction_failed = False
+
+        return build_knowno_fused_prompt(
+            query=str(sq),
+            related_entities=self._related_entities(),
+            turn_history=turn_history,
+            max_history_lines=self._max_history_lines,
+        )
+
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        data = parse_llm_json_object(content)
+
+        ea_raw = data.get("entity_action")
+        entity_action: Dict[str, str] = (
+            {str(k): str(v) for k, v in ea_raw.items()}
+            if isinstance(ea_raw, dict)
+            else {}
+        )
+        viable = normalize_viable_objects(data.get("viable_objects"), entity_action)
+        classification = str(data.get("classification", "")).strip()
+        brief = str(data.get("brief_reason", "")).strip()
+
+        is_ambiguous = classification.lower().startswith("ambiguous")
+        self._client.entity_action = entity_action
+        self._client.viable_objects = viable
+        self._client.is_ambiguous = is_ambiguous
+        self._client.current_ambiguous_type = (
+            normalize_knowno_ambiguity_type_label(str(data.get("ambiguity_type", "")))
+            if is_ambiguous
+            else None
+        )
+
+        label = "Ambiguous" if is_ambiguous else "Unambiguous"
+        file_logger.info(
+            f"KnownoFusedReasoningNode: {label}, type={self._client.current_ambiguous_type!r}, "
+            f"entities={len(entity_action)}, viable={len(viable)} reason={brief!r}"
+        )
+        self.bb.append_bot_trace_step(f"Viable objects: {len(viable)}", "ok")
+        trace_msg = f"Ambiguity detect: {label}"
+        if is_ambiguous:
+            trace_msg = f"{trace_msg} ({self._client.current_ambiguous_type})"
+        elif brief:
+            trace_msg = f"{trace_msg} ({brief})"
+        self.bb.append_bot_trace_step(trace_msg, "ok")
+        return py_trees.common.Status.SUCCESS
+
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"KnownoFusedReasoningNode error: {error_msg}")
+        self._client.entity_action = {}
+        self._client.viable_objects = []
+        self._client.knowno_viable_extraction_failed = True
+        self._client.is_ambiguous = True
+        self._client.current_ambiguous_type = "Common sense"
+        self.bb.append_bot_trace_step("Knowno fused reasoning", "fail")
+        return py_trees.common.Status.SUCCESS
@@ -5,13 +5,13 @@ from langchain_openai import ChatOpenAI
 from logger import file_logger
 from prompts import build_knowno_viable_object_prompt
 
-from .base import BaseNode
+from .base import LLMNode
 from .black_board import Blackboard
 from .llm_json import parse_llm_json_object
 from .viable_objects_util import normalize_viable_objects
 
 
-class KnownoViableObjectsNode(BaseNode):
+class KnownoViableObjectsNode(LLMNode):
     """
     LLM step: extract viable object-action dicts from entity_action for the current query.
 
@@ -22,6 +22,8 @@ class KnownoViableObjectsNode(BaseNode):
       - knowno_viable_extraction_failed (bool; True if LLM/parse failed)
     """
 
+    cache_llm = True
+
     def __init__(
         self,
         name: str,
@@ -50,45 +52,45 @@ class KnownoViableObjectsNode(BaseNode):
             access=py_trees.common.Access.WRITE,
         )
 
-    def update(self) -> py_trees.common.Status:
-        try:
-            sq: Optional[str] = getattr(self._client, "standalone_question", None)
-            turn_history = getattr(self._client, "turn_history", None) or []
-            ea_raw = getattr(self._client, "entity_action", None) or {}
-            entity_action: Dict[str, str] = (
-                dict(ea_raw) if isinstance(ea_raw, dict) else {}
-            )
+    def _entity_action(self) -> Dict[str, str]:
+        ea_raw = getattr(self._client, "entity_action", None) or {}
+        return dict(ea_raw) if isinstance(ea_raw, dict) else {}
+
+    def build_prompt(self) -> Optional[str]:
+        sq: Optional[str] = getattr(self._client, "standalone_question", None)
+        turn_history = getattr(self._client, "turn_history", None) or []
 
-            if not sq or not str(sq).strip():
-                raise ValueError("blackboard.standalone_question is missing/empty")
+        if not sq or not str(sq).strip():
+            raise ValueError("blackboard.standalone_question is missing/empty")
 
-            self._client.knowno_viable_extraction_failed = False
+        self._client.knowno_viable_extraction_failed = False
+
+        return build_knowno_viable_object_prompt(
+            query=str(sq),
+            entity_action=self._entity_action(),
+            turn_history=turn_history,
+            max_history_lines=self._max_history_lines,
+        )
 
-            prompt = build_knowno_viable_object_prompt(
-                query=str(sq),
-                entity_action=entity_action,
-                turn_history=list(turn_history),
-                max_history_lines=self._max_history_lines,
-            )
-            raw = self._llm.invoke(prompt).content
-            data = parse_llm_json_object(raw)
-            viable_raw = data.get("viable_objects")
-            self._client.viable_objects = normalize_viable_objects(
-                viable_raw, entity_action
-            )
-            file_logger.info(
-                f"KnownoViableObjectsNode: count={len(self._client.viable_objects or [])}"
-            )
-            self.bb.append_bot_trace_step(
-                f"Viable objects: {len(self._client.viable_objects or [])}",
-                "ok",
-            )
-            return py_trees.common.Status.SUCCESS
+    def handle_response(self, content: str) -> py_trees.common.Status:
+        data = parse_llm_json_object(content)
+        viable_raw = data.get("viable_objects")
+        self._client.viable_objects = normalize_viable_objects(
+            viable_raw, self._entity_action()
+        )
+        file_logger.info(
+            f"KnownoViableObjectsNode: count={len(self._client.viable_objects or [])}"
+        )
+        self.bb.append_bot_trace_step(
+            f"Viable objects: {len(self._client.viable_objects or [])}",
+            "ok",
+        )
+        return py_trees.common.Status.SUCCESS
 
-        except Exception as e:
-            error_msg = f"{type(e).__name__}: {e}"
-            file_logger.error(f"KnownoViableObjectsNode error: {error_msg}")
-            self._client.viable_objects = []
-            self._client.knowno_viable_extraction_failed = True
-            self.bb.append_bot_trace_step("Viable object extraction", "fail")
-            return py_trees.common.Status.SUCCESS
+    def handle_error(self, exc: Exception) -> py_trees.common.Status:
+        error_msg = f"{type(exc).__name__}: {exc}"
+        file_logger.error(f"KnownoViableObjectsNode error: {error_msg}")
+        self._client.viable_objects = []
+        self._client.knowno_viable_extraction_failed = True
+        self.bb.append_bot_trace_step("Viable object extraction", "fail")
+        return py_trees.common.Status.SUCCESS
@@ -1,12 +1,18 @@
 """
-Load previous top-k messages for a conversation and set turn_history.
+Load previous top-k messages for a conversation and set turn_history
+(from utils.history_cache when it holds them, else from Postgres).
+With ``with_summary`` the messages are those after the conversation's rolling
+summary (utils.conversation_summary), which turn_history carries along.
 """
 
-from typing import Optional
+from typing import List, Optional
 
 import py_trees
 from logger import file_logger
-from utils.db import load_messages, messages_to_turn_history
+from prompts.template import TurnHistory
+from utils import async_db
+from utils.db import load_history, load_messages, messages_to_turn_history
+from utils.history_cache import history_cache
 
 from .base import BaseNode
 from .black_board import Blackboard
@@ -19,7 +25,8 @@ class LoadHistoryNode(BaseNode):
     Reads:
       - conversation_id
     Writes:
-      - turn_history (from DB messages)
+      - turn_history (cached lines, or DB messages which are then cached; with
+        ``with_summary``, plus the conversation summary)
     """
 
     def __init__(
@@ -27,9 +34,11 @@ class LoadHistoryNode(BaseNode):
         name: str,
         bb: Blackboard,
         top_k: int = 20,
+        with_summary: bool = False,
     ):
         super().__init__(name=name, bb=bb)
         self._top_k = top_k
+        self._with_summary = with_summary
 
         self._client.register_key(
             key="conversation_id", access=py_trees.common.Access.READ
@@ -38,23 +47,98 @@ class LoadHistoryNode(BaseNode):
             key="turn_history", access=py_trees.common.Access.WRITE
         )
 
+    def _conversation_id(self) -> Optional[str]:
+        conversation_id: Optional[str] = getattr(
+            self._client, "conversation_id", None
+        )
+        if not conversation_id or not str(conversation_id).strip():
+            return None
+        return str(conversation_id).strip()
+
+    def _set_history(
+        self,
+        conversation_id: str,
+        summary: Optional[str],
+        lines: List[str],
+        source: str,
+    ) -> None:
+        turn_history = TurnHistory(lines, summary=summary)
+        self._client.turn_history = turn_history
+        file_logger.info(
+            f"LoadHistoryNode: loaded {len(turn_history)} turns"
+            f"{' + summary' if summary else ''} for conversation {conversation_id} ({source})"
+        )
+
+    def _cache_loaded(
+        self,
+        conversation_id: str,
+        summary: Optional[str],
+        messages: list,
+        generation: int,
+    ) -> None:
+        lines = messages_to_turn_history(messages)
+        history_cache.put(
+            conversation_id,
+            lines,
+            complete=len(messages) < self._top_k,
+            summary=summary,
+            generation=generation,
+        )
+        self._set_history(conversation_id, summary, lines, "db")
+
     def update(self) -> py_trees.common.Status:
         try:
-            conversation_id: Optional[str] = getattr(
-                self._client, "conversation_id", None
-            )
-            if not conversation_id or not str(conversation_id).strip():
+            conversation_id = self._conversation_id()
+            if not conversation_id:
+                return py_trees.common.Status.SUCCESS
+
+            cached = history_cache.get(conversation_id, self._top_k)
+            if cached is not None:
+                self._set_history(conversation_id, *cached, "cache")
+                return py_trees.common.Status.SUCCESS
+
+            # Read before the query: a turn saved meanwhile keeps these rows out of the cache
+            generation = history_cache.generation(conversation_id)
+            if self._with_summary:
+                summary, messages = load_history(
+                    conversation_id=conversation_id,
+                    top_k=self._top_k,
+                )
+            else:
+                summary, messages = None, load_messages(
+                    conversation_id=conversation_id,
+                    top_k=self._top_k,
+                )
+            self._cache_loaded(conversation_id, summary, messages, generation)
+            return py_trees.common.Status.SUCCESS
+        except Exception as e:
+            file_logger.error(f"LoadHistoryNode error: {type(e).__name__}: {e}")
+            return py_trees.common.Status.FAILURE
+
+    async def async_update(self) -> py_trees.common.Status:
+        try:
+            conversation_id = self._conversation_id()
+            if not conversation_id:
+                return py_trees.common.Status.SUCCESS
+
+            cached = history_cache.get(conversation_id, self._top_k)
+            if cached is not None:
+                self._set_history(conversation_id, *cached, "cache")
                 return py_trees.common.Status.SUCCESS
 
-            messages = load_messages(
-                conversation_id=str(conversation_id).strip(),
-                top_k=self._top_k,
-            )
-            turn_history = messages_to_turn_history(messages)
-            self._client.turn_history = turn_history
-            file_logger.info(
-                f"LoadHistoryNode: loaded {len(turn_history)} turns for conversation {conversation_id}"
-            )
+            # Read before the query: a turn saved meanwhile keeps these rows out of the cache
+            generation = history_cache.generation(conversation_id)
+            if self._with_summary:
+                summary, messages = await async_db.load_history(
+                    conversation_id=conversation_id,
+                    top_k=self._top_k,
+                )
+            else:
+                summary, messages = None, await async_db.load_messages(
+                    conversation_id=conversation_id,
+                    top_k=self._top_k,
+                )
+            self._cache_loaded(conversation_id, summary, messages, generation)
             return py_trees.common.Status.SUCCESS
         except Exception as e:
             file_logger.error(f"LoadHistoryNode error: {type(e).__name__}: {e}")
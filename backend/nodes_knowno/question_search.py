@@ -0,0 +1,75 @@
+from typing import List, Optional
+
+import py_trees
+from clients import MilvusHybridEntityStore
+from logger import file_logger
+
+from .base import BaseNode
+from .black_board import Blackboard
+from .vector_search import SEARCH_KWARGS
+
+
+class QuestionSearchNode(BaseNode):
+    """
+    Related-entity search on the raw standalone request. It only needs
+    ``standalone_question``, so under the dependency-aware root it runs while
+    EntitiesPredictor/EntityResolve wait on the LLM; VectorSearchNode falls back to
+    its results when the predicted entities ground nothing.
+
+    Reads:
+      - standalone_question
+    Writes:
+      - question_related_entities (list)
+
+    Return:
+      - SUCCESS always (no trace step; an empty list on error)
+    """
+
+    def __init__(self, name: str, bb: Blackboard, vecdb: MilvusHybridEntityStore):
+        super().__init__(name=name, bb=bb)
+        self._vecdb = vecdb
+        self._client.register_key(
+            key="standalone_question", access=py_trees.common.Access.READ
+        )
+        self._client.register_key(
+            key="question_related_entities", access=py_trees.common.Access.WRITE
+        )
+
+    def _query(self) -> Optional[str]:
+        question = getattr(self._client, "standalone_question", None)
+        if not question or not str(question).strip():
+            return None
+        return str(question).strip()
+
+    def _set_results(self, results: List) -> py_trees.common.Status:
+        entities = []
+        for item in results:
+            name = getattr(item, "entity", None)
+            if name and name not in entities:
+                entities.append(name)
+        self._client.question_related_entities = entities
+        return py_trees.common.Status.SUCCESS
+
+    def _handle_error(self, e: Exception) -> py_trees.common.Status:
+        file_logger.error(f"QuestionSearchNode error: {type(e).__name__}: {e}")
+        self._client.question_related_entities = []
+        return py_trees.common.Status.SUCCESS
+
+    def update(self) -> py_trees.common.Status:
+        try:
+            query = self._query()
+            if query is None:
+                return self._set_results([])
+            return self._set_results(self._vecdb.search(query=query, **SEARCH_KWARGS))
+        except Exception as e:
+            return self._handle_error(e)
+
+    async def async_update(self) -> py_trees.common.Status:
+        try:
+            query = self._query()
+            if query is None:
+                return self._set_results([])
+            results = await self._vecdb.asearch(query=query, **SEARCH_KWARGS)
+            return self._set_results(results)
+        except Exception as e:
+            return self._handle_error(e)
@@ -1,13 +1,16 @@
 """
-Save user message and assistant message to the database.
-On error, assistant content is "Error during generation".
+Save user message and assistant message to the database (one statement via insert_turn).
+On error, assistant content is "Error during generation". The saved turn is appended
+to the conversation's utils.history_cache entry (write-through).
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import py_trees
 from logger import file_logger
-from utils.db import insert_message
+from utils import async_db
+from utils.db import insert_turn, messages_to_turn_history
+from utils.history_cache import history_cache
 
 from .base import BaseNode
 from .black_board import Blackboard
@@ -23,6 +26,8 @@ class SaveMessageNode(BaseNode):
       - answer
       - is_ambiguous
       - bot_trace (from blackboard)
+    Writes:
+      - saved_messages (inserted [user, assistant] rows, so the API needs no re-read)
     """
 
     def __init__(self, name: str, bb: Blackboard):
@@ -39,45 +44,70 @@ class SaveMessageNode(BaseNode):
             key="is_ambiguous", access=py_trees.common.Access.READ
         )
         self._client.register_key(key="bot_trace", access=py_trees.common.Access.READ)
+        self._client.register_key(
+            key="saved_messages", access=py_trees.common.Access.WRITE
+        )
+
+    def _turn(self) -> Optional[Dict[str, Any]]:
+        """Build insert_turn kwargs for this turn (None = nothing to save)."""
+        conversation_id: Optional[str] = getattr(
+            self._client, "conversation_id", None
+        )
+        if not conversation_id or not str(conversation_id).strip():
+            file_logger.warning(
+                "SaveMessageNode: conversation_id missing, skip save"
+            )
+            return None
+
+        user_question = getattr(self._client, "user_question", None) or ""
+        answer = getattr(self._client, "answer", None)
+        is_ambiguous = getattr(self._client, "is_ambiguous", None)
+        bot_trace = self.bb.get_bot_trace()
+
+        content = (
+            answer.strip() if answer and str(answer).strip() else None
+        ) or "Error during generation"
+
+        return dict(
+            conversation_id=str(conversation_id).strip(),
+            user_msg=user_question.strip() or "(empty)",
+            assistant_msg=content,
+            trace=list(bot_trace) if bot_trace else [],
+            ambiguous=bool(is_ambiguous),
+        )
+
+    def _set_saved(self, conversation_id: str, rows: List[dict]) -> py_trees.common.Status:
+        self._client.saved_messages = rows
+        if not rows:
+            file_logger.error(
+                f"SaveMessageNode: insert_turn failed for conversation {conversation_id}"
+            )
+            return py_trees.common.Status.FAILURE
+        history_cache.append(conversation_id, messages_to_turn_history(rows))
+        file_logger.info(
+            f"SaveMessageNode: saved user + assistant for conversation {conversation_id}"
+        )
+        return py_trees.common.Status.SUCCESS
 
     def update(self) -> py_trees.common.Status:
         try:
-            conversation_id: Optional[str] = getattr(
-                self._client, "conversation_id", None
-            )
-            if not conversation_id or not str(conversation_id).strip():
-                file_logger.warning(
-                    "SaveMessageNode: conversation_id missing, skip save"
-                )
+            turn = self._turn()
+            if turn is None:
                 return py_trees.common.Status.SUCCESS
 
-            user_question = getattr(self._client, "user_question", None) or ""
-            answer = getattr(self._client, "answer", None)
-            is_ambiguous = getattr(self._client, "is_ambiguous", None)
-            bot_trace = self.bb.get_bot_trace()
+            return self._set_saved(turn["conversation_id"], insert_turn(**turn))
+        except Exception as e:
+            file_logger.error(f"SaveMessageNode error: {type(e).__name__}: {e}")
+            return py_trees.common.Status.FAILURE
 
-            content = (
-                answer.strip() if answer and str(answer).strip() else None
-            ) or "Error during generation"
-            ambiguous = bool(is_ambiguous)
+    async def async_update(self) -> py_trees.common.Status:
+        try:
+            turn = self._turn()
+            if turn is None:
+                return py_trees.common.Status.SUCCESS
 
-            insert_message(
-                conversation_id=str(conversation_id).strip(),
-                role="user",
-                content=user_question.strip() or "(empty)",
-            )
-            trace_for_db = list(bot_trace) if bot_trace else []
-            insert_message(
-                conversation_id=str(conversation_id).strip(),
-                role="assistant",
-                content=content,
-                ambiguous=ambiguous,
-                bot_trace=trace_for_db,
-            )
-            file_logger.info(
-                f"SaveMessageNode: saved user + assistant for conversation {conversation_id}"
-            )
-            return py_trees.common.Status.SUCCESS
+            rows = await async_db.insert_turn(**turn)
+            return self._set_saved(turn["conversation_id"], rows)
         except Exception as e:
             file_logger.error(f"SaveMessageNode error: {type(e).__name__}: {e}")
             return py_trees.common.Status.FAILURE
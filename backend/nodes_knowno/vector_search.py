@@ -1,20 +1,26 @@
 import asyncio
-from typing import Optional
+from typing import Awaitable, Callable, List, Optional
 
 import py_trees
 from clients import MilvusHybridEntityStore
+from clients.milvus import SearchResultRow
 from logger import file_logger
 
 from .base import BaseNode
 from .black_board import Blackboard
 from .bot_trace_format import retrieving_entities_context, searching_entities_line
 
+SEARCH_KWARGS = dict(top_k=5, dense_weight=0.4, sparse_weight=0.6, min_score=0.6)
+
+SearchMany = Callable[[List[str]], Awaitable[List[List[SearchResultRow]]]]
+
 
 class VectorSearchNode(BaseNode):
     """
     Reads:
       - standalone_question
       - potential_entities
+      - question_related_entities (QuestionSearchNode; fallback when entities ground nothing)
     Writes:
       - current_related_entities (list)
 
@@ -48,26 +54,56 @@ class VectorSearchNode(BaseNode):
         self._client.register_key(
             key="potential_entities", access=py_trees.common.Access.READ
         )
+        self._client.register_key(
+            key="question_related_entities", access=py_trees.common.Access.READ
+        )
 
-    async def _search_one_entity(self, entity: str):
+    async def _search_many(self, queries: List[str]):
         return await asyncio.to_thread(
-            self._vecdb.search,
-            query=entity,
-            top_k=5,
-            dense_weight=0.4,
-            sparse_weight=0.6,
-            min_score=0.6,
+            self._vecdb.search_many, queries, **SEARCH_KWARGS
         )
 
-    async def _search_all_entities(self, potential_entities: list[str]):
-        tasks = [
-            self._search_one_entity(entity)
+    async def _asearch_many(self, queries: List[str]):
+        return await self._vecdb.asearch_many(queries, **SEARCH_KWARGS)
+
+    async def _search_all_entities(
+        self, potential_entities: list[str], search_many: SearchMany
+    ):
+        """
+        One batched embed + hybrid search for all entities (result list per entity).
+        If the batch fails, each entity is searched on its own and only the ones that
+        fail again get no results.
+        """
+        queries = [
+            entity
             for entity in potential_entities
             if isinstance(entity, str) and entity.strip()
         ]
-        if not tasks:
+        if not queries:
             return []
-        return await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            return await search_many(queries)
+        except Exception as e:
+            if len(queries) == 1:
+                raise
+            file_logger.warning(
+                f"VectorSearchNode: batched search failed ({type(e).__name__}: {e}), "
+                "searching each entity separately"
+            )
+        results = await asyncio.gather(
+            *(search_many([query]) for query in queries), return_exceptions=True
+        )
+        out = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                file_logger.error(
+                    f"VectorSearchNode: search for {query!r} failed: "
+                    f"{type(result).__name__}: {result}"
+                )
+                out.append([])
+            else:
+                out.append(result[0])
+        return out
 
     @staticmethod
     def _dedupe_keep_order(items: list[str]) -> list[str]:
@@ -79,7 +115,26 @@ class VectorSearchNode(BaseNode):
                 output.append(item)
         return output
 
+    async def _question_entities(
+        self, standalone_question: str, search_many: SearchMany
+    ) -> List[str]:
+        """QuestionSearchNode's prefetched results, or search the request now."""
+        try:
+            prefetched = getattr(self._client, "question_related_entities", None)
+        except KeyError:
+            prefetched = None
+        if prefetched is not None:
+            return list(prefetched)
+        results = await self._search_all_entities([standalone_question], search_many)
+        return [item.entity for result in results for item in result if item.entity]
+
     def update(self) -> py_trees.common.Status:
+        return asyncio.run(self._run(self._search_many))
+
+    async def async_update(self) -> py_trees.common.Status:
+        return await self._run(self._asearch_many)
+
+    async def _run(self, search_many: SearchMany) -> py_trees.common.Status:
         try:
             standalone_question: Optional[str] = getattr(
                 self._client, "standalone_question", None
@@ -108,37 +163,26 @@ class VectorSearchNode(BaseNode):
                 self.bb.append_bot_trace_step(searching_entities_line(0), "ok")
                 return py_trees.common.Status.SUCCESS
 
-            search_results_per_entity = asyncio.run(
-                self._search_all_entities(potential_entities + [standalone_question])
+            search_results_per_entity = await self._search_all_entities(
+                potential_entities, search_many
             )
 
-            if not search_results_per_entity:
-                file_logger.info(
-                    "VectorSearchNode: Could not ground potential_entities, using safe fallback"
-                )
-                if self._fallback_to_question:
-                    search_results_per_entity = asyncio.run(
-                        self._search_all_entities([standalone_question])
-                    )
-                else:
-                    self._client.current_related_entities = []
-                    self.bb.append_bot_trace_step(searching_entities_line(0), "ok")
-                    return py_trees.common.Status.SUCCESS
-
             related_entities = []
-            for entity_query, result in zip(potential_entities, search_results_per_entity):
-                if isinstance(result, Exception):
-                    file_logger.warning(
-                        f"VectorSearchNode: search failed for '{entity_query}': "
-                        f"{type(result).__name__}: {result}"
-                    )
-                    continue
-
+            for result in search_results_per_entity:
                 for item in result:
                     entity_name = getattr(item, "entity", None)
                     if entity_name:
                         related_entities.append(entity_name)
 
+            if not related_entities and self._fallback_to_question:
+                file_logger.info(
+                    "VectorSearchNode: Could not ground potential_entities, "
+                    "falling back to the standalone request search"
+                )
+                related_entities = await self._question_entities(
+                    standalone_question, search_many
+                )
+
             related_entities = self._dedupe_keep_order(related_entities)
 
             self._client.current_related_entities = related_entities
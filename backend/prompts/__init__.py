@@ -1,7 +1,9 @@
+from .template import PromptTemplate, TurnHistory, history_window
 from .ambiguity_discriminator_prompt import \
     build_ambiguity_discriminator_prompt
 from .ambiguity_prompt import build_ambiguity_prompt
 from .answer_prompt import build_answer_prompt
+from .conversation_summary_prompt import build_conversation_summary_prompt
 from .repair_common_sense_prompt import build_common_sense_repair_prompt
 from .repair_preference_prompt import build_preference_repair_prompt
 from .repair_safety_prompt import build_safety_repair_prompt
@@ -11,6 +13,7 @@ from .action_prompt import build_entity_actions_prompt
 from .knowno_ambig_classify_prompt import build_knowno_ambig_classify_prompt
 from .knowno_ambig_detect_prompt import build_knowno_ambig_detect_prompt
 from .knowno_ambig_type_prompt import build_knowno_ambig_type_prompt
+from .knowno_fused_prompt import build_knowno_fused_prompt
 from .knowno_response_prompt import build_knowno_response_prompt
 from .knowno_viable_object_prompt import build_knowno_viable_object_prompt
 from .entity_resolve_prompt import build_entity_resolve_prompt
@@ -19,6 +22,7 @@ __all__ = [
     "build_ambiguity_prompt",
     "build_ambiguity_discriminator_prompt",
     "build_answer_prompt",
+    "build_conversation_summary_prompt",
     "build_common_sense_repair_prompt",
     "build_preference_repair_prompt",
     "build_safety_repair_prompt",
@@ -28,7 +32,11 @@ __all__ = [
     "build_knowno_ambig_classify_prompt",
     "build_knowno_ambig_detect_prompt",
     "build_knowno_ambig_type_prompt",
+    "build_knowno_fused_prompt",
     "build_knowno_response_prompt",
     "build_knowno_viable_object_prompt",
     "build_entity_resolve_prompt",
+    "PromptTemplate",
+    "TurnHistory",
+    "history_window",
 ]
@@ -1,5 +1,7 @@
 from typing import List
 
+from .template import PromptTemplate
+
 ENTITY_ACTIONS_PROMPT = """
 You are given:
 1. a standalone user request
@@ -36,6 +38,9 @@ RELATED_ENTITIES:
 {related_entities}
 """
 
+_TEMPLATE = PromptTemplate(ENTITY_ACTIONS_PROMPT)
+
+
 def build_entity_actions_prompt(
     user_request: str,
     related_entities: List[str],
@@ -46,7 +51,7 @@ def build_entity_actions_prompt(
         if str(entity).strip()
     ]
 
-    return ENTITY_ACTIONS_PROMPT.format(
+    return _TEMPLATE.render(
         user_request=user_request.strip(),
         related_entities=normalized_entities,
     )
\ No newline at end of file
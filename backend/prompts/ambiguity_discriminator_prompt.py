@@ -1,5 +1,7 @@
 from typing import List
 
+from .template import PromptTemplate, history_window
+
 AMBIGUITY_DISCRIMINATOR_PROMPT = """
 You are a classifier for a kitchen assistant. Use only TURN_HISTORY and USER_REQUEST below. USER_REQUEST is the **current user request** for this turn. Classify the ambiguity into exactly ONE type. Priority: Safety > Common sense > Preference.
 
@@ -35,6 +37,8 @@ Already tried types (avoid repeating if possible; still obey Safety > Common sen
 {used_ambiguous_types}
 """
 
+_TEMPLATE = PromptTemplate(AMBIGUITY_DISCRIMINATOR_PROMPT)
+
 
 def build_ambiguity_discriminator_prompt(
     user_request: str,
@@ -42,9 +46,8 @@ def build_ambiguity_discriminator_prompt(
     max_lines: int = 10,
     used_ambiguous_types: List[str] = [],
 ) -> str:
-    history = (turn_history or [])[-max_lines:]
-    history_text = "\n".join(history) if history else "(empty)"
-    return AMBIGUITY_DISCRIMINATOR_PROMPT.format(
+    history_text = history_window(turn_history, max_lines)
+    return _TEMPLATE.render(
         turn_history=history_text,
         user_request=user_request.strip(),
         used_ambiguous_types=", ".join(used_ambiguous_types),
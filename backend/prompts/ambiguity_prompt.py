@@ -1,5 +1,7 @@
 from typing import List, Optional
 
+from .template import PromptTemplate, history_window
+
 AMBIGUITY_PROMPT = """
 You are an ambiguity detector for a kitchen assistant. Use only the context below.
 
@@ -42,6 +44,8 @@ RELATED_ENTITIES (optional, may be empty):
 {related_entities}
 """
 
+_TEMPLATE = PromptTemplate(AMBIGUITY_PROMPT)
+
 
 def build_ambiguity_prompt(
     user_request: str,
@@ -49,13 +53,12 @@ def build_ambiguity_prompt(
     max_lines: int = 10,
     related_entities: Optional[List[str]] = None,
 ) -> str:
-    history = (turn_history or [])[-max_lines:]
-    history_text = "\n".join(history) if history else "(empty)"
+    history_text = history_window(turn_history, max_lines)
     if related_entities:
         entities_text = "\n".join(f"- {e}" for e in related_entities)
     else:
         entities_text = "(none)"
-    return AMBIGUITY_PROMPT.format(
+    return _TEMPLATE.render(
         turn_history=history_text,
         user_request=user_request.strip(),
         related_entities=entities_text,
@@ -1,5 +1,7 @@
 from typing import List, Optional
 
+from .template import PromptTemplate, history_window
+
 ANSWER_PROMPT = """
 You are a helpful kitchen assistant. Your role is to respond to the user's **request** about kitchen-related topics using the provided related entities and conversation history.
 
@@ -32,6 +34,8 @@ USER_REQUEST:
 {user_request}
 """
 
+_TEMPLATE = PromptTemplate(ANSWER_PROMPT)
+
 
 def build_answer_prompt(
     user_request: str,
@@ -39,12 +43,7 @@ def build_answer_prompt(
     turn_history: Optional[List[str]] = None,
     max_history_lines: int = 10,
 ) -> str:
-    # Format turn history
-    if turn_history:
-        history = (turn_history or [])[-max_history_lines:]
-        history_text = "\n".join(history) if history else "(empty)"
-    else:
-        history_text = "(empty)"
+    history_text = history_window(turn_history, max_history_lines)
 
     # Format related entities
     if related_entities:
@@ -52,7 +51,7 @@ def build_answer_prompt(
     else:
         entities_text = "(no related entities found)"
 
-    return ANSWER_PROMPT.format(
+    return _TEMPLATE.render(
         turn_history=history_text,
         related_entities=entities_text,
         user_request=user_request.strip(),
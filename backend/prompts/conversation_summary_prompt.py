@@ -0,0 +1,50 @@
+from typing import List, Optional
+
+from .template import PromptTemplate
+
+CONVERSATION_SUMMARY_PROMPT = """
+You maintain a running summary of a conversation between a user and a kitchen assistant robot.
+
+Given:
+- PREVIOUS_SUMMARY: the summary of the conversation so far (may be "(none)")
+- NEW_TURNS: the next lines of the conversation ("User: ..." / "Assistant: ..."), oldest first
+
+Goal:
+Return an updated summary that replaces PREVIOUS_SUMMARY and also covers NEW_TURNS. Later turns will only see this summary plus the most recent lines, so keep whatever they may need to resolve references and follow-ups.
+
+Keep (most important first):
+1. The task(s) in progress and their current state (done, pending, waiting for the user's answer).
+2. Objects, tools, locations and quantities the user chose or confirmed (e.g. "the small glass bowl", "3 eggs").
+3. User preferences, constraints and safety concerns (allergies, dietary limits, "no knives").
+4. Questions the assistant asked that are still unanswered.
+
+Rules:
+- Stay factual: only what PREVIOUS_SUMMARY and NEW_TURNS support; do not invent details.
+- Prefer the latest information when a choice was changed.
+- Drop greetings, repetition and resolved clarifications that no longer matter.
+- Write plain sentences in the third person ("The user ...", "The assistant ..."), at most {max_words} words.
+
+PREVIOUS_SUMMARY:
+{previous_summary}
+
+NEW_TURNS:
+{new_turns}
+
+Output:
+Return only the updated summary text (no labels, quotes or bullet points).
+""".strip()
+
+_TEMPLATE = PromptTemplate(CONVERSATION_SUMMARY_PROMPT)
+
+
+def build_conversation_summary_prompt(
+    previous_summary: Optional[str],
+    new_turns: List[str],
+    max_words: int = 150,
+) -> str:
+    """Build prompt that folds ``new_turns`` (turn-history lines) into the running summary."""
+    return _TEMPLATE.render(
+        previous_summary=(previous_summary or "").strip() or "(none)",
+        new_turns="\n".join(new_turns) or "(empty)",
+        max_words=max_words,
+    )
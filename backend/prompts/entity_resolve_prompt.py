@@ -1,6 +1,8 @@
 import json
 from typing import List, Optional
 
+from .template import PromptTemplate, history_window
+
 ENTITY_RESOLVE_PROMPT = """
 You are a **strict filter** for **predicted_entities**. Wrong output causes the robot to **repeat the same question** — treat errors as unacceptable.
 
@@ -59,6 +61,8 @@ Predicted entities (JSON array):
 {predicted_entities_json}
 """
 
+_TEMPLATE = PromptTemplate(ENTITY_RESOLVE_PROMPT)
+
 
 def build_entity_resolve_prompt(
     standalone_request: str,
@@ -66,18 +70,14 @@ def build_entity_resolve_prompt(
     turn_history: Optional[List[str]] = None,
     max_history_lines: int = 24,
 ) -> str:
-    if turn_history:
-        lines = list(turn_history or [])[-max_history_lines:]
-        history_text = "\n".join(lines).strip() if lines else "(empty)"
-    else:
-        history_text = "(empty)"
+    history_text = history_window(turn_history, max_history_lines, strip=True)
 
     normalized = [
         str(x).strip() for x in (predicted_entities or []) if str(x).strip()
     ]
     predicted_json = json.dumps(normalized, ensure_ascii=False)
 
-    return ENTITY_RESOLVE_PROMPT.format(
+    return _TEMPLATE.render(
         turn_history=history_text,
         standalone_request=standalone_request.strip(),
         predicted_entities_json=predicted_json,
@@ -1,6 +1,8 @@
 import json
 from typing import Dict, List
 
+from .template import PromptTemplate, history_window
+
 AMBIG_CLASSIFY_PROMPT = """
 ## ROLE
 You are an ambiguity detection system for a kitchen robot.
@@ -161,6 +163,8 @@ Current Query: {query}
 Entity-action JSON: {entity_action}
 """
 
+_TEMPLATE = PromptTemplate(AMBIG_CLASSIFY_PROMPT)
+
 
 def build_knowno_ambig_classify_prompt(
     query: str,
@@ -168,10 +172,9 @@ def build_knowno_ambig_classify_prompt(
     turn_history: List[str],
     max_history_lines: int = 16,
 ) -> str:
-    history_lines = list(turn_history or [])[-max_history_lines:]
-    history_text = "\n".join(history_lines) if history_lines else "(empty)"
+    history_text = history_window(turn_history, max_history_lines)
     ea_text = json.dumps(entity_action or {}, ensure_ascii=False)
-    return AMBIG_CLASSIFY_PROMPT.format(
+    return _TEMPLATE.render(
         history=history_text,
         query=query.strip(),
         entity_action=ea_text,
@@ -1,6 +1,8 @@
 import json
 from typing import Dict, List
 
+from .template import PromptTemplate, history_window
+
 DETECT_AMBIGUOUS_PROMPT = """
 You are an ambiguity detector for a kitchen robot.
 
@@ -42,17 +44,19 @@ Viable Objects (JSON):
 {viable_objects}
 """
 
+_TEMPLATE = PromptTemplate(DETECT_AMBIGUOUS_PROMPT)
+
+
 def build_knowno_ambig_detect_prompt(
     query: str,
     viable_objects: List[Dict[str, str]],
     turn_history: List[str],
     max_history_lines: int = 16,
 ) -> str:
-    history_lines = list(turn_history or [])[-max_history_lines:]
-    history_text = "\n".join(history_lines) if history_lines else "(empty)"
+    history_text = history_window(turn_history, max_history_lines)
     viable_text = json.dumps(viable_objects or [], ensure_ascii=False)
 
-    return DETECT_AMBIGUOUS_PROMPT.format(
+    return _TEMPLATE.render(
         history=history_text,
         query=(query or "").strip(),
         viable_objects=viable_text,
@@ -1,6 +1,8 @@
 import json
 from typing import Dict, List
 
+from .template import PromptTemplate, history_window
+
 DETECT_AMBIGUITY_TYPE_PROMPT = """
 ## ROLE
 You are an ambiguity type classifier for a kitchen robot.
@@ -110,17 +112,19 @@ Viable Objects:
 {viable_objects}
 """
 
+_TEMPLATE = PromptTemplate(DETECT_AMBIGUITY_TYPE_PROMPT)
+
+
 def build_knowno_ambig_type_prompt(
     query: str,
     viable_objects: List[Dict[str, str]],
     turn_history: List[str],
     max_history_lines: int = 16,
 ) -> str:
-    history_lines = list(turn_history or [])[-max_history_lines:]
-    history_text = "\n".join(history_lines) if history_lines else "(empty)"
+    history_text = history_window(turn_history, max_history_lines)
     viable_objects_text = json.dumps(viable_objects or [], ensure_ascii=False)
 
-    return DETECT_AMBIGUITY_TYPE_PROMPT.format(
+    return _TEMPLATE.render(
         history=history_text,
         query=(query or "").strip(),
         viable_objects=viable_objects_text,
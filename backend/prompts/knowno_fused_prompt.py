@@ -0,0 +1,126 @@
+import json
+from typing import List
+
+from .template import PromptTemplate, history_window
+
+KNOWNO_FUSED_PROMPT = """
+## ROLE
+You are the reasoning step of a kitchen robot. In ONE pass you (1) assign each related entity its role in the request, (2) pick the viable objects, (3) decide whether the request is ambiguous and (4) label the ambiguity type.
+You will receive a user message containing the current query context. Follow the steps below strictly.
+
+## TASK
+
+### Step 0 — Check Conversation History (objects AND non-object details)
+
+**0a — Object / OR-choice clarification**
+If history shows the assistant asked the user to **choose a specific object or tool** among options, AND the Current Query answers that (names the object, short label, or "yes" to the last option), treat it as resolved → **Unambiguous**, with `viable_objects` holding only the chosen object(s).
+
+**0b — Quantity, count, amount, duration, or other parameter**
+If history shows the assistant asked for a **detail that is not object-disambiguation** (how many, how much, what size, how long, doneness, temperature) and the Current Query supplies it, that slot is **resolved**. Do **not** stay Ambiguous just because the task still mentions a generic word like "egg".
+
+Step 0 never skips Step 1: `entity_action` is always filled.
+
+### Step 1 — Entity actions
+
+For every entity in Related Entities, write one short phrase describing its most likely action, role, or intended use for the Current Query.
+- Use the entity names exactly as given as JSON keys.
+- Keep each phrase concise, specific, and grounded in the request.
+- If the request **commits to a specific item** (e.g. "balloon whisk"), omit entities that are only mutually exclusive alternatives to it (e.g. "flat whisk").
+- If Related Entities is empty, `entity_action` is `{{}}`.
+
+### Step 2 — Viable objects
+
+From the entities kept in Step 1, an object is **Viable** if it can fulfil the request safely, hygienically, effectively, and appropriately in a kitchen.
+
+An object is **NOT viable** if it:
+- Is not a physical, selectable object (locations, quantities, abstract concepts)
+- Is unrelated to the Current Query
+- Poses safety or hygiene risks (e.g. dirty item when clean needed, metal in microwave)
+- Contradicts a **specific descriptor** in the Current Query (color, material, type, cleanliness, function)
+  - "clean sponge" ≠ "dirty sponge" | "bread knife" ≠ "butter knife" | "oat milk" ≠ "cow milk"
+  - **Rule**: Specific descriptors express clear user intent — substitution is NOT allowed.
+- Is significantly suboptimal or inappropriate for the task
+
+`viable_objects` lists the viable objects that compete for the same role, as object-action dictionaries copied from `entity_action`.
+
+### Step 3 — Classify
+
+| Viable objects for one role | Result |
+|-----------------------------|--------|
+| 0 or 1 viable               | Unambiguous |
+| 2+ viable                   | **Ambiguous** |
+
+If the result is **Unambiguous**, set `"ambiguity_type"` to `"None"`.
+
+### Step 4 — Type (only if Ambiguous)
+
+Choose one label for the competing viable objects (priority: Safety > Common Sense > Preference):
+- **Safety**: the wrong choice could cause danger, damage, or contamination (e.g. metal vs ceramic bowl in the microwave).
+- **Common Sense**: several work, but everyday practical reasoning strongly favors one (e.g. large bowl vs tiny dipping bowl for leftovers).
+- **Preference**: equally valid options; the choice is purely subjective (e.g. red mug vs blue mug).
+
+## EXAMPLES
+
+**Example 1: Unambiguous — specific material descriptor**
+- Query: "Use the ceramic bowl to melt the chocolate"
+- Related Entities: ["ceramic bowl", "plastic bowl", "dark chocolate", "microwave"]
+
+{{"entity_action": {{"ceramic bowl": "container for melting chocolate", "dark chocolate": "ingredient to melt", "microwave": "heat source for melting"}}, "viable_objects": [{{"ceramic bowl": "container for melting chocolate"}}], "classification": "Unambiguous", "ambiguity_type": "None", "brief_reason": "the ceramic bowl is named explicitly"}}
+
+**Example 2: Ambiguous — Common Sense**
+- Query: "Put the leftovers in the bowl"
+- Related Entities: ["large mixing bowl", "tiny dipping bowl", "plate"]
+
+{{"entity_action": {{"large mixing bowl": "container for leftovers", "tiny dipping bowl": "container for leftovers", "plate": "surface for serving"}}, "viable_objects": [{{"large mixing bowl": "container for leftovers"}}, {{"tiny dipping bowl": "container for leftovers"}}], "classification": "Ambiguous", "ambiguity_type": "Common Sense", "brief_reason": "two bowls fit, size matters"}}
+
+**Example 3: Ambiguous — Preference**
+- Query: "Bring me the mug"
+- Related Entities: ["blue mug", "red mug", "plate"]
+
+{{"entity_action": {{"blue mug": "object to bring to user", "red mug": "object to bring to user"}}, "viable_objects": [{{"blue mug": "object to bring to user"}}, {{"red mug": "object to bring to user"}}], "classification": "Ambiguous", "ambiguity_type": "Preference", "brief_reason": "two mugs, no stated color"}}
+
+**Example 4: Unambiguous — user answered "how many eggs"**
+- Conversation: Assistant asked how many eggs to boil; user said "3 eggs".
+- Query: "Boil 3 eggs"
+- Related Entities: ["egg", "pot", "stove"]
+
+{{"entity_action": {{"egg": "ingredient to boil", "pot": "container for boiling eggs", "stove": "heat source for boiling"}}, "viable_objects": [], "classification": "Unambiguous", "ambiguity_type": "None", "brief_reason": "count already given"}}
+
+## OUTPUT ##
+Return ONLY a JSON object with no extra text or markdown fences.
+
+{{
+  "entity_action": {{"entity": "action"}},
+  "viable_objects": [
+    {{"object1": "action1"}},
+    {{"object2": "action2"}}
+  ],
+  "classification": "Ambiguous | Unambiguous",
+  "ambiguity_type": "None | Safety | Common Sense | Preference",
+  "brief_reason": "one short phrase"
+}}
+
+---USER---
+Conversation History:
+{history}
+
+Current Query: {query}
+Related Entities: {related_entities}
+"""
+
+_TEMPLATE = PromptTemplate(KNOWNO_FUSED_PROMPT)
+
+
+def build_knowno_fused_prompt(
+    query: str,
+    related_entities: List[str],
+    turn_history: List[str],
+    max_history_lines: int = 16,
+) -> str:
+    history_text = history_window(turn_history, max_history_lines)
+    entities = [str(e).strip() for e in related_entities or [] if str(e).strip()]
+    return _TEMPLATE.render(
+        history=history_text,
+        query=query.strip(),
+        related_entities=json.dumps(entities, ensure_ascii=False),
+    )
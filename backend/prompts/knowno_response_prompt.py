@@ -1,18 +1,13 @@
 import json
 from typing import List, Optional
 
+from .template import PromptTemplate, history_window
+
 AMBIGUITY_RESPONSE_PROMPT = """
 
 ## ROLE
 You are a kitchen robot assistant. Generate a short, natural clarification question for an ambiguous user request.
 
-## INPUT
-- Query: {query}
-- Ambiguity Type: {ambiguity_type}
-- Viable Objects: {viable_objects}
-- Conversation History:
-{history}
-
 ## INSTRUCTIONS
 
 - **Read your own last turn in history first.** If you already asked for something (how many, which tool, which option, etc.) and the **Query** or the **latest user message in history** now **contains that answer** (e.g. you asked how many eggs → user said "3 eggs" → Query says "boil 3 eggs"), you **must not** repeat the same ask. **Do not** open with "I need to know…" for information that is already in the Query. **Do not** pair a repeated question with "You mentioned … is that correct?" — pick **one**: either a single acknowledgment you are proceeding, or **one** genuine new question, never both.
@@ -41,8 +36,18 @@ Examples:
 4. If the user has **not** yet picked among **non-empty** Viable Objects: list ALL and ask which to use. If they **have** picked or Query is complete for that slot: **one** short proceed line — **no** duplicate question.
 5. Keep it concise: 1 sentence unless listing distinct object options; max 2 short sentences.
 6. Respond in English.
+
+## INPUT
+- Query: {query}
+- Ambiguity Type: {ambiguity_type}
+- Viable Objects: {viable_objects}
+- Conversation History:
+{history}
 """
 
+_TEMPLATE = PromptTemplate(AMBIGUITY_RESPONSE_PROMPT)
+
+
 def build_knowno_response_prompt(
     query: str,
     ambiguity_type: str,
@@ -50,12 +55,7 @@ def build_knowno_response_prompt(
     turn_history: Optional[List[str]] = None,
     max_history_lines: int = 10,
 ) -> str:
-    # Format turn history
-    if turn_history:
-        history = (turn_history or [])[-max_history_lines:]
-        history_text = "\n".join(history) if history else "(empty)"
-    else:
-        history_text = "(empty)"
+    history_text = history_window(turn_history, max_history_lines)
 
     # Format viable objects as JSON
     if viable_objects:
@@ -63,7 +63,7 @@ def build_knowno_response_prompt(
     else:
         viable_objects_text = "[]"
 
-    return AMBIGUITY_RESPONSE_PROMPT.format(
+    return _TEMPLATE.render(
         query=query.strip(),
         ambiguity_type=ambiguity_type.strip(),
         viable_objects=viable_objects_text,
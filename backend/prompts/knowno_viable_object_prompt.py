@@ -1,6 +1,8 @@
 import json
 from typing import Dict, List
 
+from .template import PromptTemplate, history_window
+
 
 EXTRACT_VIABLE_OBJECTS_PROMPT = """
 ## ROLE
@@ -127,17 +129,19 @@ Current Query: {query}
 Entity-action JSON: {entity_action}
 """
 
+_TEMPLATE = PromptTemplate(EXTRACT_VIABLE_OBJECTS_PROMPT)
+
+
 def build_knowno_viable_object_prompt(
     query: str,
     entity_action: Dict[str, str],
     turn_history: List[str],
     max_history_lines: int = 16,
 ) -> str:
-    history_lines = list(turn_history or [])[-max_history_lines:]
-    history_text = "\n".join(history_lines) if history_lines else "(empty)"
+    history_text = history_window(turn_history, max_history_lines)
     entity_action_text = json.dumps(entity_action or {}, ensure_ascii=False)
 
-    return EXTRACT_VIABLE_OBJECTS_PROMPT.format(
+    return _TEMPLATE.render(
         history=history_text,
         query=(query or "").strip(),
         entity_action=entity_action_text,
@@ -1,5 +1,7 @@
 from typing import List, Optional
 
+from .template import PromptTemplate, history_window
+
 POTENTIAL_ENTITIES_PROMPT = """
 You extract **potential_entities**: physical kitchen objects/tools/ingredients that still need grounding for the **current** turn.
 
@@ -95,6 +97,8 @@ CURRENT_USER_REQUEST:
 {user_request}
 """
 
+_TEMPLATE = PromptTemplate(POTENTIAL_ENTITIES_PROMPT)
+
 
 def build_potential_entities_prompt(
     user_request: str,
@@ -102,13 +106,9 @@ def build_potential_entities_prompt(
     turn_history: Optional[List[str]] = None,
     max_history_lines: int = 24,
 ) -> str:
-    if turn_history:
-        history = (turn_history or [])[-max_history_lines:]
-        history_text = "\n".join(history).strip() if history else "(empty)"
-    else:
-        history_text = "(empty)"
+    history_text = history_window(turn_history, max_history_lines, strip=True)
 
-    return POTENTIAL_ENTITIES_PROMPT.format(
+    return _TEMPLATE.render(
         user_request=user_request.strip(),
         topk=topk,
         turn_history=history_text,
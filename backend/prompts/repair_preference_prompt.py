@@ -1,5 +1,7 @@
 from typing import List
 
+from .template import PromptTemplate, history_window
+
 PREFERENCE_REPAIR_PROMPT = """
 You are a conversation-repair assistant for a kitchen robot.
 
@@ -32,6 +34,8 @@ RELATED_ENTITIES (optional, may be empty):
 {current_related_entities}
 """
 
+_TEMPLATE = PromptTemplate(PREFERENCE_REPAIR_PROMPT)
+
 
 def build_preference_repair_prompt(
     user_request: str,
@@ -39,12 +43,11 @@ def build_preference_repair_prompt(
     related_entities: List[str],
     max_lines: int = 10,
 ) -> str:
-    history = (turn_history or [])[-max_lines:]
-    history_text = "\n".join(history) if history else "(empty)"
+    history_text = history_window(turn_history, max_lines)
     current_related_entities = (
         ", ".join(related_entities) if related_entities else "(none)"
     )
-    return PREFERENCE_REPAIR_PROMPT.format(
+    return _TEMPLATE.render(
         turn_history=history_text,
         user_request=user_request.strip(),
         current_related_entities=current_related_entities,
@@ -1,5 +1,7 @@
 from typing import List
 
+from .template import PromptTemplate, history_window
+
 SAFETY_REPAIR_PROMPT = """
 You are a conversation-repair assistant.
 
@@ -36,6 +38,8 @@ RELATED_ENTITIES (optional, may be empty):
 {current_related_entities}
 """
 
+_TEMPLATE = PromptTemplate(SAFETY_REPAIR_PROMPT)
+
 
 def build_safety_repair_prompt(
     user_request: str,
@@ -43,12 +47,11 @@ def build_safety_repair_prompt(
     related_entities: List[str],
     max_lines: int = 10,
 ) -> str:
-    history = (turn_history or [])[-max_lines:]
-    history_text = "\n".join(history) if history else "(empty)"
+    history_text = history_window(turn_history, max_lines)
     current_related_entities = (
         ", ".join(related_entities) if related_entities else "(none)"
     )
-    return SAFETY_REPAIR_PROMPT.format(
+    return _TEMPLATE.render(
         turn_history=history_text,
         user_request=user_request.strip(),
         current_related_entities=current_related_entities,
@@ -1,5 +1,7 @@
 from typing import List, Optional
 
+from .template import PromptTemplate, history_window
+
 STANDALONE_REQUEST_PROMPT = """
 You rewrite the user's current message into ONE **standalone request**—a single clear instruction of what they want done (or what they need), using conversation context.
 
@@ -66,6 +68,8 @@ Output:
 Return only the standalone request text (one line, no quotes or labels).
 """.strip()
 
+_TEMPLATE = PromptTemplate(STANDALONE_REQUEST_PROMPT)
+
 
 def build_standalone_question_prompt(
     user_request: str,
@@ -73,13 +77,9 @@ def build_standalone_question_prompt(
     max_history_lines: int = 12,
 ) -> str:
     """Build prompt for a single standalone **request** line (blackboard key remains ``standalone_question``)."""
-    if turn_history:
-        history = (turn_history or [])[-max_history_lines:]
-        history_text = "\n".join(history).strip() if history else "(empty)"
-    else:
-        history_text = "(empty)"
+    history_text = history_window(turn_history, max_history_lines, strip=True)
 
-    return STANDALONE_REQUEST_PROMPT.format(
+    return _TEMPLATE.render(
         turn_history=history_text,
         user_request=user_request.strip(),
     )
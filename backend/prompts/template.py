@@ -0,0 +1,98 @@
+"""
+Precompiled prompt templates and per-turn history windows.
+
+- ``PromptTemplate``: a ``str.format`` template parsed once at import; ``render``
+  only joins the literal parts with the values. Every template keeps its static
+  instructions first and the per-turn inputs last, so consecutive requests share
+  a long identical prefix (``static_prefix``), which is what OpenAI's automatic
+  prompt caching keys on (prefixes of 1024+ tokens).
+- ``TurnHistory``: the immutable ``turn_history`` LoadHistory puts on the
+  blackboard. ``history_window`` joins its last N lines once per N and reuses
+  the text for every other node of the turn that asks for the same window.
+  With rolling summaries (utils.conversation_summary) it also carries the
+  conversation ``summary`` and holds only the lines after it; every window then
+  renders as "summary + recent lines", so the ``build_*_prompt`` functions stay
+  bounded however long the conversation gets.
+"""
+
+from string import Formatter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class PromptTemplate:
+    """``template.format(**values)`` with the template parsed once (plain ``{name}`` fields only)."""
+
+    def __init__(self, template: str):
+        self.template = template
+        self._parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            if spec or conversion:
+                raise ValueError(f"Unsupported placeholder {{{field}!{conversion}:{spec}}}")
+            self._parts.append((literal, field))
+        self.fields = frozenset(f for _, f in self._parts if f is not None)
+        # Rendered text before the first placeholder (identical for every render)
+        prefix: List[str] = []
+        for literal, field in self._parts:
+            prefix.append(literal)
+            if field is not None:
+                break
+        self.static_prefix = "".join(prefix)
+
+    def render(self, **values) -> str:
+        out: List[str] = []
+        for literal, field in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(values[field]))
+        return "".join(out)
+
+    def __str__(self) -> str:
+        return self.template
+
+
+SUMMARY_LABEL = "Summary of earlier conversation:"
+
+
+class TurnHistory(tuple):
+    """Turn history lines; joined windows (last N lines) are cached per N."""
+
+    # Summary of the conversation before the first line (None: the lines are all of it)
+    summary: Optional[str] = None
+
+    def __new__(cls, lines: Iterable[str] = (), summary: Optional[str] = None):
+        self = super().__new__(cls, lines)
+        if summary:
+            self.__dict__["summary"] = summary
+        return self
+
+    def window(self, max_lines: int) -> str:
+        cache: Dict[int, str] = self.__dict__.setdefault("_windows", {})
+        text = cache.get(max_lines)
+        if text is None:
+            lines = list(self[-max_lines:])
+            if self.summary:
+                lines.insert(0, f"{SUMMARY_LABEL} {self.summary}")
+            text = cache[max_lines] = "\n".join(lines)
+        return text
+
+
+def history_window(
+    turn_history: Optional[Sequence[str]],
+    max_lines: int,
+    *,
+    strip: bool = False,
+    empty: str = "(empty)",
+) -> str:
+    """
+    Last ``max_lines`` history lines joined by newlines (``empty`` when there are none),
+    after the conversation summary line when ``turn_history`` carries one.
+    """
+    if not turn_history and not getattr(turn_history, "summary", None):
+        return empty
+    if isinstance(turn_history, TurnHistory):
+        text = turn_history.window(max_lines)
+    else:
+        text = "\n".join(list(turn_history)[-max_lines:])
+    if strip:
+        text = text.strip()
+    return text or empty
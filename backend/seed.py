@@ -1,9 +1,30 @@
+"""
+Build the BM25 model from the AmbiK ``environment_short`` column and load every
+unique entity into the entity store (Milvus, or the local index with VECTOR_STORE=local).
+
+    python seed.py [--workers 4] [--batch-size 32] [--recreate]
+
+The CSV is read once, in chunks. Ingestion is a pipeline: batches of entities go
+through a bounded queue to ``--workers`` concurrent dense-embedding tasks (TEI
+``aembed``), and a single writer inserts the embedded batches in order while the
+next ones are being embedded. After each insert the writer records the batch in a
+checkpoint file; if a run fails, running the same command again resumes after the
+last committed batch (the checkpoint is tied to the entity list, batch size and
+collection, and removed when the run completes).
+"""
+
+import argparse
 import asyncio
+import hashlib
+import json
 import os
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import dotenv
 import pandas as pd
-from clients import DenseEmbedder, MilvusHybridEntityStore, SparseEmbedder
+from clients import (DenseEmbedder, LocalHybridEntityStore,
+                     MilvusHybridEntityStore, SparseEmbedder)
 
 dotenv.load_dotenv()
 
@@ -12,26 +33,39 @@ TEXT_EMBEDDING_URL = os.getenv("TEXT_EMBEDDING_URL", "http://text-embedding:2022
 TEXT_EMBEDDING_DIM = int(os.getenv("TEXT_EMBEDDING_DIM", "1024"))
 
 BM25_JSON_PATH = os.getenv("BM25_JSON_PATH", "../data/embedder/sparse.json")
+BM25_BIN_PATH = os.getenv("BM25_BIN_PATH", "../data/embedder/sparse.bm25")
 DATA_PATH = os.getenv("DATA_PATH", "../data/ambik/AmbiK_data.csv")
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "entity")
+VECTOR_STORE = os.getenv("VECTOR_STORE", "milvus").lower()
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "../data/embedder/entity_index.npz")
+SEED_CHECKPOINT_PATH = os.getenv(
+    "SEED_CHECKPOINT_PATH", "../data/embedder/seed_checkpoint.json"
+)
 
+Batch = Tuple[int, List[str]]
 
-def build_corpus_from_environment_short(
-    csv_path: str, col: str = "environment_short", delim: str = ","
-) -> list[str]:
-    df = pd.read_csv(csv_path, index_col=None)
-    if col not in df.columns:
-        raise ValueError(f"Missing column '{col}'. Available: {list(df.columns)}")
 
+def read_entities(
+    csv_path: str,
+    col: str = "environment_short",
+    delim: str = ",",
+    chunksize: int = 10_000,
+) -> List[str]:
+    """Unique entities of ``col`` (one chunked pass over the CSV), sorted case-insensitively."""
     entities = set()
-    for row in df[col].dropna().astype(str).tolist():
-        for e in row.split(delim):
-            e = e.strip()
-            if e:
-                entities.add(e)
+    for chunk in pd.read_csv(csv_path, index_col=None, chunksize=chunksize):
+        if col not in chunk.columns:
+            raise ValueError(f"Missing column '{col}'. Available: {list(chunk.columns)}")
+        for row in chunk[col].dropna().astype(str):
+            for e in row.split(delim):
+                e = e.strip()
+                if e:
+                    entities.add(e)
+    return sorted(entities, key=lambda x: (x.lower(), x))
 
-    entities = sorted(entities, key=lambda x: x.lower())
 
+def build_corpus(entities: List[str]) -> SparseEmbedder:
+    """Fit BM25 on ``entities`` and save it (JSON + binary)."""
     print(f"Corpus size (unique entities): {len(entities)}")
 
     sparse = SparseEmbedder()
@@ -39,16 +73,170 @@ def build_corpus_from_environment_short(
 
     os.makedirs(os.path.dirname(BM25_JSON_PATH) or ".", exist_ok=True)
     sparse.save(BM25_JSON_PATH)
+    sparse.save_binary(BM25_BIN_PATH)
 
-    print(f"Saved BM25 sparse embedder to: {BM25_JSON_PATH}")
+    print(f"Saved BM25 sparse embedder to: {BM25_JSON_PATH} and {BM25_BIN_PATH}")
+    return sparse
 
 
-if __name__ == "__main__":
-    build_corpus_from_environment_short(DATA_PATH)
+def batches(entities: List[str], batch_size: int, start: int = 0) -> Iterator[Batch]:
+    for n in range(start, (len(entities) + batch_size - 1) // batch_size):
+        yield n, entities[n * batch_size : (n + 1) * batch_size]
+
+
+class Checkpoint:
+    """Last committed batch of a run, keyed by a fingerprint of what is being ingested."""
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+
+    @staticmethod
+    def fingerprint_of(entities: List[str], batch_size: int, target: str) -> str:
+        h = hashlib.sha256(f"{target}\x00{batch_size}\x00".encode("utf-8"))
+        h.update("\x00".join(entities).encode("utf-8"))
+        return h.hexdigest()
+
+    def load(self) -> Optional[int]:
+        """Next batch to ingest if the file belongs to this run, else None."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("fingerprint") != self.fingerprint:
+            return None
+        return int(data.get("next_batch", 0))
+
+    def save(self, next_batch: int, inserted: int) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "fingerprint": self.fingerprint,
+                    "next_batch": next_batch,
+                    "inserted": inserted,
+                },
+                f,
+            )
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Progress:
+    def __init__(self, total: int, done: int = 0):
+        self.total = total
+        self.done = done
+        self.start_done = done
+        self.t0 = time.perf_counter()
+        self.embed_s = 0.0
+        self.insert_s = 0.0
+
+    def report(self, n_batch: int, n_batches: int) -> None:
+        elapsed = time.perf_counter() - self.t0
+        rate = (self.done - self.start_done) / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - self.done) / rate if rate > 0 else 0.0
+        print(
+            f"batch {n_batch + 1}/{n_batches}: {self.done}/{self.total} entities, "
+            f"{rate:.1f} entities/s, eta {eta:.0f}s",
+            flush=True,
+        )
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.t0
+        n = self.done - self.start_done
+        return (
+            f"{n} entities in {elapsed:.1f}s ({n / elapsed if elapsed > 0 else 0:.1f}/s); "
+            f"embedding {self.embed_s:.1f}s across workers, inserts {self.insert_s:.1f}s"
+        )
+
+
+async def ingest(
+    store,
+    dense: DenseEmbedder,
+    sparse: SparseEmbedder,
+    entities: List[str],
+    *,
+    batch_size: int,
+    workers: int,
+    checkpoint: Checkpoint,
+    start: int = 0,
+) -> Progress:
+    """
+    Embed and insert ``entities`` from batch ``start`` on. Producer -> bounded
+    queue -> ``workers`` embedders -> writer; the writer inserts in batch order
+    (in a thread, overlapping the embedding of later batches) and checkpoints.
+    """
+    n_batches = (len(entities) + batch_size - 1) // batch_size
+    progress = Progress(len(entities), done=min(start * batch_size, len(entities)))
+    todo: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    embedded: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+
+    async def produce() -> None:
+        for item in batches(entities, batch_size, start):
+            await todo.put(item)
+        for _ in range(workers):
+            await todo.put(None)
+
+    async def embed_worker() -> None:
+        while True:
+            item = await todo.get()
+            if item is None:
+                await embedded.put(None)
+                return
+            n, batch = item
+            t0 = time.perf_counter()
+            dense_vecs = await dense.aembed(batch)
+            sparse_vecs = sparse.embed(batch)
+            progress.embed_s += time.perf_counter() - t0
+            await embedded.put((n, batch, dense_vecs, sparse_vecs))
 
-    dense_embedder = DenseEmbedder(url=TEXT_EMBEDDING_URL)
-    sparse_embedder = SparseEmbedder().load(BM25_JSON_PATH)
+    async def write() -> None:
+        pending: Dict[int, tuple] = {}
+        next_batch, finished = start, 0
+        while finished < workers:
+            item = await embedded.get()
+            if item is None:
+                finished += 1
+                continue
+            pending[item[0]] = item
+            while next_batch in pending:
+                _, batch, dense_vecs, sparse_vecs = pending.pop(next_batch)
+                t0 = time.perf_counter()
+                await asyncio.to_thread(
+                    store.insert_vectors, batch, dense_vecs, sparse_vecs
+                )
+                progress.insert_s += time.perf_counter() - t0
+                next_batch += 1
+                progress.done += len(batch)
+                checkpoint.save(next_batch, progress.done)
+                progress.report(next_batch - 1, n_batches)
 
+    tasks = [asyncio.create_task(produce()), asyncio.create_task(write())]
+    tasks += [asyncio.create_task(embed_worker()) for _ in range(workers)]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return progress
+
+
+def make_store(dense_embedder, sparse_embedder, recreate: bool):
+    if VECTOR_STORE == "local":
+        if recreate and os.path.exists(LOCAL_INDEX_PATH):
+            os.remove(LOCAL_INDEX_PATH)
+        return LocalHybridEntityStore(
+            dense_dim=TEXT_EMBEDDING_DIM,
+            dense_embedder=dense_embedder,
+            sparse_embedder=sparse_embedder,
+            path=LOCAL_INDEX_PATH,
+            collection_name=COLLECTION_NAME,
+        )
     store = MilvusHybridEntityStore(
         uri=MILVUS_URL,
         collection_name=COLLECTION_NAME,
@@ -56,25 +244,79 @@ if __name__ == "__main__":
         dense_embedder=dense_embedder,
         sparse_embedder=sparse_embedder,
     )
+    if recreate and store.client.has_collection(COLLECTION_NAME):
+        store.client.drop_collection(COLLECTION_NAME)
+    return store
 
-    store.ensure_collection()
 
-    # Load data
-    df = pd.read_csv(DATA_PATH, index_col=None)
-    entity_columns = df["environment_short"].tolist()
+async def main(args: argparse.Namespace) -> None:
+    entities = read_entities(args.data, chunksize=args.chunksize)
+    sparse_embedder = build_corpus(entities)
 
-    # Extract unique entities
-    entities = set()
-    for entity_row in entity_columns:
-        for entity in entity_row.split(","):
-            entity = entity.strip()
-            if entity:
-                entities.add(entity)
-    print(len(entities), "unique entities found.")
+    location = LOCAL_INDEX_PATH if VECTOR_STORE == "local" else MILVUS_URL
+    target = f"{VECTOR_STORE}:{location}:{COLLECTION_NAME}"
+    checkpoint = Checkpoint(
+        args.checkpoint,
+        Checkpoint.fingerprint_of(entities, args.batch_size, target),
+    )
+    start = checkpoint.load() or 0
+    if start:
+        print(f"Resuming after batch {start} (checkpoint {args.checkpoint})")
+
+    dense_embedder = DenseEmbedder(
+        url=TEXT_EMBEDDING_URL, batch_window_ms=0, max_connections=args.workers
+    )
+    # A fresh run rebuilds the local index (like a new collection); a resumed one keeps it
+    store = make_store(
+        dense_embedder,
+        sparse_embedder,
+        recreate=not start and (args.recreate or VECTOR_STORE == "local"),
+    )
+    store.ensure_collection()
+    if start:
+        # The batch after the checkpoint may have been inserted before the run died
+        first = entities[start * args.batch_size : (start + 1) * args.batch_size]
+        store.delete_entities(first, update_bm25=False)
+
+    print(f"{len(entities)} unique entities found.")
     try:
-        store.insert_entities(entities, batch_size=32)
-        print(
-            f"Inserted {len(entities)} entities into Milvus collection {COLLECTION_NAME}."
+        progress = await ingest(
+            store,
+            dense_embedder,
+            sparse_embedder,
+            entities,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            checkpoint=checkpoint,
+            start=start,
         )
     except Exception as e:
-        print(f"Error inserting entities: {e}")
+        raise SystemExit(
+            f"Ingestion failed ({type(e).__name__}: {e}); "
+            f"rerun the same command to resume from {args.checkpoint}"
+        )
+    finally:
+        await dense_embedder.aclose()
+
+    checkpoint.clear()
+    print(
+        f"Inserted {len(entities)} entities into {type(store).__name__} {COLLECTION_NAME}: "
+        f"{progress.summary()}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument(
+        "--batch-size", type=int, default=32, help="entities per embed/insert batch"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="concurrent embed calls")
+    parser.add_argument("--chunksize", type=int, default=10_000, help="CSV rows per chunk")
+    parser.add_argument("--checkpoint", default=SEED_CHECKPOINT_PATH)
+    parser.add_argument(
+        "--recreate",
+        action="store_true",
+        help="drop the Milvus collection first (ignored when resuming)",
+    )
+    asyncio.run(main(parser.parse_args()))
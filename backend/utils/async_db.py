@@ -0,0 +1,242 @@
+"""
+Async PostgreSQL access (asyncpg) for the async message pipeline.
+Mirrors the subset of utils.db used per turn; same env vars, same row shapes.
+The rolling-summary queries of utils.conversation_summary (which runs on the
+event loop after a turn) only exist here.
+"""
+
+import json
+import os
+from typing import Any, List, Optional, Tuple
+
+import asyncpg
+
+from utils.db import (DEFAULT_TOP_K, LOAD_HISTORY_SQL, MESSAGE_COLUMNS,
+                      split_history_rows)
+
+_pool: Optional[asyncpg.Pool] = None
+
+
+def _get_dsn() -> str:
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+    return "postgresql://{user}:{password}@{host}:{port}/{dbname}".format(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=int(os.getenv("POSTGRES_PORT", "5432")),
+        dbname=os.getenv("POSTGRES_DB", "karb"),
+        user=os.getenv("POSTGRES_USER", "karb"),
+        password=os.getenv("POSTGRES_PASSWORD", "karb"),
+    )
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    # Decode jsonb (bot_trace) to Python objects like psycopg2 does
+    for typename in ("json", "jsonb"):
+        await conn.set_type_codec(
+            typename, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+async def init_pool() -> asyncpg.Pool:
+    """Create the process-wide pool (call once from the app lifespan)."""
+    global _pool
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            dsn=_get_dsn(),
+            min_size=int(os.getenv("ASYNC_DB_POOL_MIN", "2")),
+            max_size=int(os.getenv("ASYNC_DB_POOL_MAX", "20")),
+            init=_init_connection,
+        )
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def get_pool() -> asyncpg.Pool:
+    return _pool if _pool is not None else await init_pool()
+
+
+async def load_messages(
+    conversation_id: str,
+    top_k: int = DEFAULT_TOP_K,
+) -> List[dict]:
+    """Async utils.db.load_messages: role, content, created_at (oldest first)."""
+    pool = await get_pool()
+    rows = await pool.fetch(
+        """
+        SELECT role, content, created_at
+        FROM (
+          SELECT role, content, created_at
+          FROM message
+          WHERE conversation_id = $1
+          ORDER BY created_at DESC
+          LIMIT $2
+        ) sub
+        ORDER BY created_at ASC
+        """,
+        conversation_id,
+        top_k,
+    )
+    return [dict(r) for r in rows]
+
+
+async def load_history(
+    conversation_id: str,
+    top_k: int = DEFAULT_TOP_K,
+) -> Tuple[Optional[str], List[dict]]:
+    """Async utils.db.load_history: (summary, messages after it, oldest first)."""
+    pool = await get_pool()
+    rows = await pool.fetch(
+        LOAD_HISTORY_SQL.format(limit="$2", conversation_id="$1"),
+        conversation_id,
+        top_k,
+    )
+    return split_history_rows([dict(r) for r in rows])
+
+
+async def load_unsummarized(
+    conversation_id: str,
+    limit: int,
+) -> Tuple[Optional[str], Any, List[dict]]:
+    """
+    (summary, summary_until, the oldest ``limit`` messages after summary_until) of a
+    conversation, for utils.conversation_summary. Messages keep the raw created_at
+    (the next summary_until).
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        head = await conn.fetchrow(
+            "SELECT summary, summary_until FROM conversation WHERE id = $1",
+            conversation_id,
+        )
+        if head is None:
+            return None, None, []
+        rows = await conn.fetch(
+            """
+            SELECT role, content, created_at
+            FROM message
+            WHERE conversation_id = $1
+              AND ($2::timestamptz IS NULL OR created_at > $2)
+            ORDER BY created_at ASC
+            LIMIT $3
+            """,
+            conversation_id,
+            head["summary_until"],
+            limit,
+        )
+    return head["summary"], head["summary_until"], [dict(r) for r in rows]
+
+
+async def update_conversation_summary(
+    conversation_id: str,
+    summary: str,
+    summary_until: Any,
+    previous_until: Any,
+) -> bool:
+    """
+    Store a new rolling summary unless another fold already moved summary_until
+    past ``previous_until``. True if it was stored.
+    """
+    pool = await get_pool()
+    status = await pool.execute(
+        """
+        UPDATE conversation
+        SET summary = $2, summary_until = $3
+        WHERE id = $1 AND summary_until IS NOT DISTINCT FROM $4
+        """,
+        conversation_id,
+        summary,
+        summary_until,
+        previous_until,
+    )
+    return status.endswith(" 1")
+
+
+async def insert_message(
+    conversation_id: str,
+    role: str,
+    content: str,
+    *,
+    ambiguous: bool = False,
+    bot_trace: Optional[List[dict]] = None,
+) -> Optional[str]:
+    """Async utils.db.insert_message. Returns the new message id or None on error."""
+    pool = await get_pool()
+    try:
+        if role == "assistant":
+            return await pool.fetchval(
+                """
+                INSERT INTO message (conversation_id, role, content, ambiguous, bot_trace)
+                VALUES ($1, $2, $3, $4, $5)
+                RETURNING id::text
+                """,
+                conversation_id,
+                role,
+                content,
+                ambiguous,
+                bot_trace if bot_trace else None,
+            )
+        return await pool.fetchval(
+            """
+            INSERT INTO message (conversation_id, role, content)
+            VALUES ($1, $2, $3)
+            RETURNING id::text
+            """,
+            conversation_id,
+            role,
+            content,
+        )
+    except Exception:
+        return None
+
+
+async def insert_turn(
+    conversation_id: str,
+    user_msg: str,
+    assistant_msg: str,
+    trace: Optional[List[dict]] = None,
+    *,
+    ambiguous: bool = False,
+) -> List[dict]:
+    """Async utils.db.insert_turn: both rows of one turn in one round trip ([] on error)."""
+    pool = await get_pool()
+    try:
+        rows = await pool.fetch(
+            f"""
+            INSERT INTO message
+              (conversation_id, role, content, ambiguous, bot_trace, created_at)
+            VALUES
+              ($1, 'user', $2, FALSE, NULL, clock_timestamp()),
+              ($1, 'assistant', $3, $4, $5, clock_timestamp())
+            RETURNING {MESSAGE_COLUMNS}
+            """,
+            conversation_id,
+            user_msg,
+            assistant_msg,
+            ambiguous,
+            trace if trace else None,
+        )
+    except Exception:
+        return []
+    return sorted((dict(r) for r in rows), key=lambda r: r["role"] != "user")
+
+
+async def get_conversation(conversation_id: str, user_id: str) -> Optional[dict]:
+    """Async utils.db.get_conversation: row if it belongs to user_id, else None."""
+    pool = await get_pool()
+    row = await pool.fetchrow(
+        """
+        SELECT id::text, user_id::text, name, created_at, rating, rated_at::text
+        FROM conversation
+        WHERE id = $1 AND user_id = $2
+        """,
+        conversation_id.strip(),
+        user_id.strip(),
+    )
+    return dict(row) if row else None
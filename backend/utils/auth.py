@@ -1,10 +1,21 @@
 """
 JWT and password hashing for API auth.
+
+Argon2 is deliberately slow (tens of ms of CPU and ARGON2_MEMORY_COST KiB per
+hash). The auth endpoints run it through ``ahash_password`` / ``averify_password``:
+a dedicated pool of PASSWORD_HASH_WORKERS threads (argon2-cffi releases the GIL)
+with at most PASSWORD_HASH_QUEUE_SIZE more calls waiting. Beyond that the call
+fails fast with ``PasswordHashPoolBusy`` (HTTP 503) instead of queueing, so a
+login burst cannot occupy the server threadpool or the event loop that message
+traffic uses.
 """
 
+import asyncio
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -14,8 +25,23 @@ SECRET_KEY = os.getenv("JWT_SECRET_KEY", "change-me-in-production-use-env")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "60"))
 
-# Passwords (Argon2; no length limit like bcrypt’s 72 bytes)
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Passwords (Argon2; no length limit like bcrypt’s 72 bytes). Costs apply to new
+# hashes; existing hashes carry their own parameters and still verify.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__time_cost=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST,
+    argon2__parallelism=ARGON2_PARALLELISM,
+)
+
+T = TypeVar("T")
 
 
 def hash_password(password: str) -> str:
@@ -26,6 +52,61 @@ def verify_password(plain_password: str, hashed: str) -> bool:
     return pwd_context.verify(plain_password, hashed)
 
 
+class PasswordHashPoolBusy(RuntimeError):
+    """All hash workers are busy and the wait queue is full."""
+
+
+class PasswordHashPool:
+    """Bounded thread pool for password hashing: ``workers`` running, ``queue_size`` waiting."""
+
+    def __init__(self, workers: int = 2, queue_size: int = 32):
+        self.workers = max(int(workers), 1)
+        self.queue_size = max(int(queue_size), 0)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the pool; PasswordHashPoolBusy if no slot is free."""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashPoolBusy(
+                f"{self.workers} hashing, {self.queue_size} waiting"
+            )
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the hash finishes, even if the request is cancelled
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hash_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
+
+
+async def ahash_password(password: str) -> str:
+    return await password_hash_pool.run(hash_password, password)
+
+
+async def averify_password(plain_password: str, hashed: str) -> bool:
+    return await password_hash_pool.run(verify_password, plain_password, hashed)
+
+
 def create_access_token(
     subject: str | Any, expires_delta: Optional[timedelta] = None
 ) -> str:
@@ -0,0 +1,151 @@
+"""
+In-process TTL cache for the auth checks every authenticated request makes.
+
+- ``user_exists``: api.deps.get_current_user_id used to run ``get_user_by_id`` on
+  every request after decoding the JWT.
+- ``owns_conversation`` / ``aowns_conversation``: the messages endpoints checked
+  (user, conversation) ownership with ``get_conversation`` on every call.
+
+Only positive answers are cached (an unknown user or a foreign conversation is
+always re-checked), for AUTH_CACHE_TTL_SECONDS, in a bounded LRU of
+AUTH_CACHE_SIZE entries per kind (0 disables caching). Code that deletes or
+re-assigns users or conversations must call ``invalidate_user`` /
+``invalidate_conversation``; they only reach this process, so with several
+workers the TTL bounds how long another worker keeps a stale entry.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+from utils import async_db, db
+from utils.metrics import AUTH_CACHE_LOOKUPS
+
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+
+class TTLCache:
+    """Thread-safe LRU set of keys, each valid for ``ttl_seconds`` after it was added."""
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        self.name = name
+        self.max_entries = max(int(max_entries), 0)
+        self.ttl_seconds = max(float(ttl_seconds), 0.0)
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, key: Hashable) -> bool:
+        """True if ``key`` was added less than ``ttl_seconds`` ago (counts a hit or miss)."""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is not None and expires_at <= now:
+                del self._entries[key]
+                expires_at = None
+            if expires_at is not None:
+                self._entries.move_to_end(key)
+        AUTH_CACHE_LOOKUPS.labels(
+            cache=self.name, result="hit" if expires_at is not None else "miss"
+        ).inc()
+        return expires_at is not None
+
+    def add(self, key: Hashable) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl_seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# user_id
+users = TTLCache("user", AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)
+# (user_id, conversation_id)
+conversations = TTLCache("conversation", AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS)
+
+
+def _ownership_key(user_id: str, conversation_id: str) -> Tuple[str, str]:
+    return user_id.strip(), conversation_id.strip()
+
+
+def user_exists(user_id: str) -> bool:
+    """Whether ``user_id`` is a user (Postgres only on a cache miss)."""
+    key = user_id.strip()
+    if users.contains(key):
+        return True
+    if db.get_user_by_id(key) is None:
+        return False
+    users.add(key)
+    return True
+
+
+def owns_conversation(user_id: str, conversation_id: str) -> bool:
+    """Whether ``conversation_id`` belongs to ``user_id`` (Postgres only on a cache miss)."""
+    key = _ownership_key(user_id, conversation_id)
+    if conversations.contains(key):
+        return True
+    if db.get_conversation(conversation_id, user_id) is None:
+        return False
+    conversations.add(key)
+    return True
+
+
+async def aowns_conversation(user_id: str, conversation_id: str) -> bool:
+    """``owns_conversation`` with the asyncpg pool on a cache miss."""
+    key = _ownership_key(user_id, conversation_id)
+    if conversations.contains(key):
+        return True
+    if await async_db.get_conversation(conversation_id, user_id) is None:
+        return False
+    conversations.add(key)
+    return True
+
+
+def remember_conversation(user_id: str, conversation_id: str) -> None:
+    """Record a conversation just created (or loaded) for ``user_id``."""
+    conversations.add(_ownership_key(user_id, conversation_id))
+
+
+def invalidate_user(user_id: str) -> None:
+    """Forget ``user_id`` and every conversation ownership cached for it."""
+    key = user_id.strip()
+    users.discard_where(lambda k: k == key)
+    conversations.discard_where(lambda k: k[0] == key)
+
+
+def invalidate_conversation(conversation_id: str, user_id: Optional[str] = None) -> None:
+    """Forget ownership of ``conversation_id`` (for ``user_id`` only, if given)."""
+    conv = conversation_id.strip()
+    user = user_id.strip() if user_id else None
+    conversations.discard_where(
+        lambda k: k[1] == conv and (user is None or k[0] == user)
+    )
+
+
+def clear() -> None:
+    users.clear()
+    conversations.clear()
@@ -0,0 +1,136 @@
+"""
+Rolling per-conversation summary that bounds the history inlined into prompts.
+
+Every build_*_prompt inlines the last 10-20 turn-history lines, in each of the ~6
+LLM calls of a turn, so prompt tokens grew with the conversation. With
+HISTORY_SUMMARY_ENABLED the conversation row also keeps ``summary``, covering every
+message up to ``summary_until`` (utils.db.SUMMARY_COLUMNS):
+
+- after each saved turn the messages router calls ``ConversationSummarizer.schedule``.
+  In the background, once at least HISTORY_SUMMARY_KEEP_LINES +
+  HISTORY_SUMMARY_BATCH_LINES lines follow the summary, all but the last KEEP lines
+  are folded into it with one LLM call (build_conversation_summary_prompt);
+- LoadHistoryNode(with_summary=True) loads the summary and only the lines after it,
+  so every prompt sees "summary + fewer than KEEP + BATCH recent lines" (see
+  prompts.template.TurnHistory).
+
+One fold per conversation runs at a time (a turn saved meanwhile re-checks after
+it). The UPDATE only applies if ``summary_until`` has not moved, so two workers
+never fold the same lines twice.
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, Set
+
+from logger import file_logger
+from prompts.conversation_summary_prompt import build_conversation_summary_prompt
+from utils import async_db
+from utils.db import messages_to_turn_history
+from utils.history_cache import history_cache
+from utils.metrics import record_node
+
+HISTORY_SUMMARY_ENABLED = os.getenv("HISTORY_SUMMARY_ENABLED", "false").lower() == "true"
+HISTORY_SUMMARY_KEEP_LINES = int(os.getenv("HISTORY_SUMMARY_KEEP_LINES", "6"))
+HISTORY_SUMMARY_BATCH_LINES = int(os.getenv("HISTORY_SUMMARY_BATCH_LINES", "6"))
+HISTORY_SUMMARY_MAX_WORDS = int(os.getenv("HISTORY_SUMMARY_MAX_WORDS", "150"))
+
+# Lines folded by one LLM call at most (a long conversation catches up in several)
+MAX_FOLD_LINES = 200
+
+
+class ConversationSummarizer:
+    """Folds the older turn-history lines of a conversation into its stored summary."""
+
+    def __init__(
+        self,
+        llm,
+        *,
+        keep_lines: int = HISTORY_SUMMARY_KEEP_LINES,
+        batch_lines: int = HISTORY_SUMMARY_BATCH_LINES,
+        max_words: int = HISTORY_SUMMARY_MAX_WORDS,
+    ):
+        self._llm = llm
+        # At least the last exchange stays verbatim for follow-ups ("yes", "the red one")
+        self.keep_lines = max(int(keep_lines), 2)
+        self.batch_lines = max(int(batch_lines), 1)
+        self.max_words = max_words
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._again: Set[str] = set()
+
+    def schedule(self, conversation_id: str) -> None:
+        """Fold ``conversation_id`` in the background if it is due (call on the event loop)."""
+        if conversation_id in self._tasks:
+            self._again.add(conversation_id)
+            return
+        backlog = history_cache.backlog(conversation_id)
+        if backlog is not None and backlog < self.keep_lines + self.batch_lines:
+            return
+        self._tasks[conversation_id] = asyncio.get_running_loop().create_task(
+            self._run(conversation_id)
+        )
+
+    async def _run(self, conversation_id: str) -> None:
+        try:
+            while True:
+                self._again.discard(conversation_id)
+                if not await self.update(conversation_id) and conversation_id not in self._again:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            file_logger.warning(
+                f"ConversationSummarizer: fold failed for conversation {conversation_id}: "
+                f"{type(e).__name__}: {e}"
+            )
+        finally:
+            self._tasks.pop(conversation_id, None)
+            self._again.discard(conversation_id)
+
+    async def update(self, conversation_id: str) -> bool:
+        """Fold the due lines of ``conversation_id`` now; True if the summary changed."""
+        summary, summary_until, messages = await async_db.load_unsummarized(
+            conversation_id, MAX_FOLD_LINES
+        )
+        count = len(messages) - self.keep_lines
+        if count < self.batch_lines:
+            return False
+
+        folded = messages[:count]
+        prompt = build_conversation_summary_prompt(
+            summary, messages_to_turn_history(folded), self.max_words
+        )
+        started = time.perf_counter()
+        outcome, usage = "failure", {}
+        try:
+            response = await self._llm.ainvoke(prompt)
+            usage = dict(getattr(response, "usage_metadata", None) or {})
+            new_summary = str(getattr(response, "content", response) or "").strip()
+            if new_summary:
+                outcome = "success"
+        finally:
+            record_node("ConversationSummary", outcome, time.perf_counter() - started, usage)
+        if outcome != "success":
+            return False
+
+        stored = await async_db.update_conversation_summary(
+            conversation_id, new_summary, folded[-1]["created_at"], summary_until
+        )
+        if not stored:
+            # Another worker folded first; reload the entry with its summary
+            history_cache.invalidate(conversation_id)
+            return False
+        history_cache.fold(conversation_id, count, new_summary, previous_summary=summary)
+        file_logger.info(
+            f"ConversationSummarizer: folded {count} lines into the summary of "
+            f"conversation {conversation_id} ({len(messages) - count} kept)"
+        )
+        return True
+
+    async def aclose(self) -> None:
+        """Cancel folds still running (they are redone after the next turn)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,16 +1,42 @@
 """
 PostgreSQL access for conversations and messages.
 Uses DATABASE_URL or POSTGRES_* env vars for connection.
+Helpers borrow connections from a process-wide pool (DB_POOL_MIN / DB_POOL_MAX).
 """
 
+import base64
+import json
 import os
-from typing import Any, List, Optional
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
 from psycopg2.extras import RealDictCursor
 
 DEFAULT_TOP_K = 20
 
+# Composite indexes behind the keyset pagination of list_conversations / list_messages
+# (a btree serves both scan directions): name -> "table (columns)". Created by
+# ensure_indexes(), once per deployment or at API startup with DB_ENSURE_INDEXES=true.
+INDEXES = {
+    "conversation_user_created_id_idx": "conversation (user_id, created_at, id)",
+    "message_conversation_created_id_idx": "message (conversation_id, created_at, id)",
+}
+# pg_advisory_lock key held while ensure_indexes() runs (one worker builds at a time)
+INDEXES_LOCK_KEY = 0x6B617262
+
+# Rolling conversation summary (utils.conversation_summary): ``summary`` covers every
+# message up to ``summary_until``. Added by ensure_summary_columns() when enabled.
+SUMMARY_COLUMNS = {
+    "summary": "TEXT",
+    "summary_until": "TIMESTAMPTZ",
+}
+
 
 def _get_connection_params():
     url = os.getenv("DATABASE_URL")
@@ -33,6 +59,257 @@ def get_connection():
     return psycopg2.connect(cursor_factory=RealDictCursor, **params)
 
 
+class ConnectionPool:
+    """
+    Thread-safe psycopg2 pool that blocks (up to ``timeout``) when all connections
+    are checked out, instead of raising like ThreadedConnectionPool.
+
+    Health check: a connection idle for more than ``healthcheck_after`` seconds is
+    pinged with ``SELECT 1`` on checkout and replaced if the ping fails (a new
+    connection is always pinged). Connections are rolled back on return so no
+    transaction leaks to the next borrower.
+    """
+
+    def __init__(
+        self,
+        min_size: int = 1,
+        max_size: int = 10,
+        *,
+        timeout: float = 30.0,
+        healthcheck_after: float = 30.0,
+    ):
+        params = _get_connection_params()
+        if "dsn" in params:
+            args, kwargs = (params["dsn"],), {}
+        else:
+            args, kwargs = (), params
+        self._pool = psycopg2.pool.ThreadedConnectionPool(
+            min_size, max_size, *args, cursor_factory=RealDictCursor, **kwargs
+        )
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._max_size = max_size
+        self._timeout = timeout
+        self._healthcheck_after = healthcheck_after
+        # Keyed by the connection itself: an id() can be reused by a later connection
+        self._last_used: "weakref.WeakKeyDictionary[Any, float]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        last = self._last_used.get(conn)
+        if last is not None and time.monotonic() - last < self._healthcheck_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self):
+        if not self._slots.acquire(timeout=self._timeout):
+            raise psycopg2.pool.PoolError(
+                f"no database connection available after {self._timeout}s"
+            )
+        try:
+            # Each failed ping drops a connection, so the last tries get new ones
+            for _ in range(self._max_size + 1):
+                conn = self._pool.getconn()
+                if self._healthy(conn):
+                    return conn
+                self._last_used.pop(conn, None)
+                self._pool.putconn(conn, close=True)
+            raise psycopg2.OperationalError(
+                "database connections keep failing the health check"
+            )
+        except Exception:
+            self._slots.release()
+            raise
+
+    def putconn(self, conn) -> None:
+        try:
+            close = bool(conn.closed)
+            if not close:
+                try:
+                    status = conn.get_transaction_status()
+                    if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                        conn.rollback()
+                except Exception:
+                    close = True
+            if close:
+                self._last_used.pop(conn, None)
+            else:
+                self._last_used[conn] = time.monotonic()
+            self._pool.putconn(conn, close=close)
+        finally:
+            self._slots.release()
+
+    def closeall(self) -> None:
+        self._pool.closeall()
+        self._last_used.clear()
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Process-wide pool, created on first use from DB_POOL_* env vars."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    min_size=int(os.getenv("DB_POOL_MIN", "1")),
+                    max_size=int(os.getenv("DB_POOL_MAX", "20")),
+                    timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+                    healthcheck_after=float(
+                        os.getenv("DB_POOL_HEALTHCHECK_SECONDS", "30")
+                    ),
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+@contextmanager
+def connection() -> Iterator[Any]:
+    """Borrow a pooled connection for one operation; returned (rolled back if needed) on exit."""
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+def ensure_indexes() -> bool:
+    """
+    Create the INDEXES that are missing or INVALID (CONCURRENTLY: writes are not
+    blocked). A failed or cancelled concurrent build leaves an INVALID index that
+    ``IF NOT EXISTS`` would skip forever, so those are dropped and rebuilt. Only one
+    process builds at a time (advisory lock); returns False if another one holds it.
+
+        python -c "from utils import db; db.ensure_indexes()"
+    """
+    conn = get_connection()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_lock(%s) AS locked", (INDEXES_LOCK_KEY,))
+            if not cur.fetchone()["locked"]:
+                return False
+            try:
+                cur.execute(
+                    """
+                    SELECT c.relname AS name, i.indisvalid AS valid
+                    FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = ANY(%s) AND pg_table_is_visible(c.oid)
+                    """,
+                    (list(INDEXES),),
+                )
+                valid = {r["name"]: r["valid"] for r in cur.fetchall()}
+                for name, target in INDEXES.items():
+                    if valid.get(name):
+                        continue
+                    if name in valid:
+                        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                    cur.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (INDEXES_LOCK_KEY,))
+        return True
+    finally:
+        conn.close()
+
+
+def ensure_summary_columns() -> None:
+    """
+    Add the SUMMARY_COLUMNS to the conversation table if they are missing. Columns
+    are looked up in information_schema first: ALTER TABLE takes an ACCESS
+    EXCLUSIVE lock, so it only runs (once, waiting at most 5s for the lock) when a
+    column really is missing, not on every worker start.
+    """
+    with connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT column_name FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'conversation'
+                  AND column_name = ANY(%s)
+                """,
+                (list(SUMMARY_COLUMNS),),
+            )
+            present = {r["column_name"] for r in cur.fetchall()}
+            missing = [name for name in SUMMARY_COLUMNS if name not in present]
+            if not missing:
+                return
+            cur.execute("SET LOCAL lock_timeout = '5s'")
+            cur.execute(
+                "ALTER TABLE conversation "
+                + ", ".join(
+                    f"ADD COLUMN IF NOT EXISTS {name} {SUMMARY_COLUMNS[name]}"
+                    for name in missing
+                )
+            )
+        conn.commit()
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination: an opaque cursor is a row's (created_at, id)
+# ---------------------------------------------------------------------------
+
+Cursor = Tuple[str, str]
+
+
+def encode_cursor(row: dict) -> str:
+    created_at = row["created_at"]
+    if hasattr(created_at, "isoformat"):
+        created_at = created_at.isoformat()
+    raw = json.dumps([str(created_at), str(row["id"])]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """(created_at, id) of an ``encode_cursor`` value; ValueError if it is not one."""
+    try:
+        padded = cursor.strip() + "=" * (-len(cursor.strip()) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(created_at, str) or not isinstance(row_id, str):
+        raise ValueError("invalid cursor")
+    return created_at, row_id
+
+
+def _keyset(
+    alias: str, before: Optional[Cursor], after: Optional[Cursor], newest_first: bool
+) -> Tuple[str, List[Any], str]:
+    """
+    (extra WHERE conditions, their params, ORDER BY) for a (created_at, id) page of
+    table ``alias``. The columns are qualified so ORDER BY uses the table columns
+    (and the index), not the ``::text`` output columns of the same name.
+    """
+    key = f"({alias}.created_at, {alias}.id)"
+    conditions, params = "", []
+    if before:
+        conditions += f" AND {key} < (%s, %s)"
+        params.extend(before)
+    if after:
+        conditions += f" AND {key} > (%s, %s)"
+        params.extend(after)
+    direction = "DESC" if newest_first else "ASC"
+    return conditions, params, f"{alias}.created_at {direction}, {alias}.id {direction}"
+
+
 def load_messages(
     conversation_id: str,
     top_k: int = DEFAULT_TOP_K,
@@ -41,8 +318,7 @@ def load_messages(
     Load the most recent messages for a conversation (newest last for turn_history).
     Returns list of dicts with keys: role, content, created_at (oldest first).
     """
-    conn = get_connection()
-    try:
+    with connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
@@ -60,8 +336,52 @@ def load_messages(
             )
             rows = cur.fetchall()
             return [dict(r) for r in rows]
-    finally:
-        conn.close()
+
+
+# Summary + last messages after it (one row with NULL message columns if there are none)
+LOAD_HISTORY_SQL = """
+    SELECT c.summary, m.role, m.content, m.created_at
+    FROM conversation c
+    LEFT JOIN LATERAL (
+      SELECT role, content, created_at
+      FROM message
+      WHERE conversation_id = c.id
+        AND (c.summary_until IS NULL OR created_at > c.summary_until)
+      ORDER BY created_at DESC
+      LIMIT {limit}
+    ) m ON TRUE
+    WHERE c.id = {conversation_id}
+    ORDER BY m.created_at ASC
+"""
+
+
+def split_history_rows(rows: List[dict]) -> Tuple[Optional[str], List[dict]]:
+    """(summary, messages) of LOAD_HISTORY_SQL rows."""
+    summary = rows[0]["summary"] if rows else None
+    messages = [
+        {"role": r["role"], "content": r["content"], "created_at": r["created_at"]}
+        for r in rows
+        if r["role"] is not None
+    ]
+    return summary, messages
+
+
+def load_history(
+    conversation_id: str,
+    top_k: int = DEFAULT_TOP_K,
+) -> Tuple[Optional[str], List[dict]]:
+    """
+    Like load_messages, with the conversation's rolling summary: (summary, the most
+    recent top_k messages not covered by it, oldest first). summary is None until
+    the first fold.
+    """
+    with connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                LOAD_HISTORY_SQL.format(limit="%s", conversation_id="%s"),
+                (top_k, conversation_id),
+            )
+            return split_history_rows([dict(r) for r in cur.fetchall()])
 
 
 def insert_message(
@@ -75,41 +395,88 @@ def insert_message(
     """
     Insert a message. Returns the new message id (UUID string) or None on error.
     """
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            if role == "assistant":
+    with connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                if role == "assistant":
+                    cur.execute(
+                        """
+                        INSERT INTO message (conversation_id, role, content, ambiguous, bot_trace)
+                        VALUES (%s, %s, %s, %s, %s)
+                        RETURNING id::text
+                        """,
+                        (
+                            conversation_id,
+                            role,
+                            content,
+                            ambiguous,
+                            psycopg2.extras.Json(bot_trace) if bot_trace else None,
+                        ),
+                    )
+                else:
+                    cur.execute(
+                        """
+                        INSERT INTO message (conversation_id, role, content)
+                        VALUES (%s, %s, %s)
+                        RETURNING id::text
+                        """,
+                        (conversation_id, role, content),
+                    )
+                row = cur.fetchone()
+                conn.commit()
+                return row["id"] if row else None
+        except Exception:
+            conn.rollback()
+            return None
+
+
+# Same column list/shape as list_messages
+MESSAGE_COLUMNS = """id::text, conversation_id::text, role, content, created_at::text,
+                     ambiguous, bot_trace, rating, rated_at::text"""
+
+
+def insert_turn(
+    conversation_id: str,
+    user_msg: str,
+    assistant_msg: str,
+    trace: Optional[List[dict]] = None,
+    *,
+    ambiguous: bool = False,
+) -> List[dict]:
+    """
+    Insert the user message and assistant reply of one turn in a single statement.
+    Returns both full rows ([user, assistant]) or [] on error.
+
+    created_at uses clock_timestamp() per row so the pair keeps a stable order
+    (now() would give both rows the same transaction timestamp).
+    """
+    with connection() as conn:
+        try:
+            with conn.cursor() as cur:
                 cur.execute(
-                    """
-                    INSERT INTO message (conversation_id, role, content, ambiguous, bot_trace)
-                    VALUES (%s, %s, %s, %s, %s)
-                    RETURNING id::text
+                    f"""
+                    INSERT INTO message
+                      (conversation_id, role, content, ambiguous, bot_trace, created_at)
+                    VALUES
+                      (%s, 'user', %s, FALSE, NULL, clock_timestamp()),
+                      (%s, 'assistant', %s, %s, %s, clock_timestamp())
+                    RETURNING {MESSAGE_COLUMNS}
                     """,
                     (
                         conversation_id,
-                        role,
-                        content,
+                        user_msg,
+                        conversation_id,
+                        assistant_msg,
                         ambiguous,
-                        psycopg2.extras.Json(bot_trace) if bot_trace else None,
+                        psycopg2.extras.Json(trace) if trace else None,
                     ),
                 )
-            else:
-                cur.execute(
-                    """
-                    INSERT INTO message (conversation_id, role, content)
-                    VALUES (%s, %s, %s)
-                    RETURNING id::text
-                    """,
-                    (conversation_id, role, content),
-                )
-            row = cur.fetchone()
-            conn.commit()
-            return row["id"] if row else None
-    except Exception:
-        conn.rollback()
-        return None
-    finally:
-        conn.close()
+                rows = [dict(r) for r in cur.fetchall()]
+                conn.commit()
+                return sorted(rows, key=lambda r: r["role"] != "user")
+        except Exception:
+            conn.rollback()
+            return []
 
 
 def messages_to_turn_history(messages: List[dict]) -> List[str]:
@@ -134,31 +501,28 @@ def create_user(
     username: str, password_hash: str, email: Optional[str] = None
 ) -> Optional[str]:
     """Create a user. Returns id (UUID string) or None on conflict/error."""
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO app_user (username, email, password_hash)
-                VALUES (%s, %s, %s)
-                RETURNING id::text
-                """,
-                (username.strip(), email.strip() if email else None, password_hash),
-            )
-            row = cur.fetchone()
-            conn.commit()
-            return row["id"] if row else None
-    except Exception:
-        conn.rollback()
-        return None
-    finally:
-        conn.close()
+    with connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO app_user (username, email, password_hash)
+                    VALUES (%s, %s, %s)
+                    RETURNING id::text
+                    """,
+                    (username.strip(), email.strip() if email else None, password_hash),
+                )
+                row = cur.fetchone()
+                conn.commit()
+                return row["id"] if row else None
+        except Exception:
+            conn.rollback()
+            return None
 
 
 def get_user_by_username(username: str) -> Optional[dict]:
     """Return user row (id, username, email, password_hash, created_at) or None."""
-    conn = get_connection()
-    try:
+    with connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT id::text, username, email, password_hash, created_at FROM app_user WHERE username = %s",
@@ -166,14 +530,11 @@ def get_user_by_username(username: str) -> Optional[dict]:
             )
             row = cur.fetchone()
             return dict(row) if row else None
-    finally:
-        conn.close()
 
 
 def get_user_by_id(user_id: str) -> Optional[dict]:
     """Return user row (id, username, email, created_at; no password_hash) or None."""
-    conn = get_connection()
-    try:
+    with connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 "SELECT id::text, username, email, created_at FROM app_user WHERE id = %s",
@@ -181,8 +542,6 @@ def get_user_by_id(user_id: str) -> Optional[dict]:
             )
             row = cur.fetchone()
             return dict(row) if row else None
-    finally:
-        conn.close()
 
 
 # ---------------------------------------------------------------------------
@@ -192,31 +551,28 @@ def get_user_by_id(user_id: str) -> Optional[dict]:
 
 def create_conversation(user_id: str, name: Optional[str] = None) -> Optional[str]:
     """Create a conversation for the user. Returns conversation id or None."""
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO conversation (user_id, name)
-                VALUES (%s, %s)
-                RETURNING id::text
-                """,
-                (user_id.strip(), name.strip() if name else None),
-            )
-            row = cur.fetchone()
-            conn.commit()
-            return row["id"] if row else None
-    except Exception:
-        conn.rollback()
-        return None
-    finally:
-        conn.close()
+    with connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO conversation (user_id, name)
+                    VALUES (%s, %s)
+                    RETURNING id::text
+                    """,
+                    (user_id.strip(), name.strip() if name else None),
+                )
+                row = cur.fetchone()
+                conn.commit()
+                return row["id"] if row else None
+        except Exception:
+            conn.rollback()
+            return None
 
 
 def get_conversation(conversation_id: str, user_id: str) -> Optional[dict]:
     """Return conversation row if it belongs to user_id, else None."""
-    conn = get_connection()
-    try:
+    with connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
@@ -228,53 +584,59 @@ def get_conversation(conversation_id: str, user_id: str) -> Optional[dict]:
             )
             row = cur.fetchone()
             return dict(row) if row else None
-    finally:
-        conn.close()
 
 
-def list_conversations(user_id: str, limit: int = 100) -> List[dict]:
-    """Return conversations for the user, newest first. Keys: id, user_id, name, created_at, rating, rated_at."""
+def list_conversations(
+    user_id: str,
+    limit: int = 100,
+    *,
+    before: Optional[Cursor] = None,
+    after: Optional[Cursor] = None,
+    newest_first: bool = True,
+) -> List[dict]:
+    """
+    Return a page of the user's conversations, newest first by default. Keys: id,
+    user_id, name, created_at, rating, rated_at. ``before`` / ``after`` (decoded
+    cursors) keep only rows older / newer than that row; the next page in the same
+    order continues from the last row (``before`` when newest first, else ``after``).
+    """
     limit = min(max(1, limit), 500)
-    conn = get_connection()
-    try:
+    conditions, params, order_by = _keyset("c", before, after, newest_first)
+    with connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
+                f"""
                 SELECT id::text, user_id::text, name, created_at, rating, rated_at::text
-                FROM conversation
-                WHERE user_id = %s
-                ORDER BY created_at DESC
+                FROM conversation c
+                WHERE c.user_id = %s{conditions}
+                ORDER BY {order_by}
                 LIMIT %s
                 """,
-                (user_id.strip(), limit),
+                (user_id.strip(), *params, limit),
             )
             return [dict(r) for r in cur.fetchall()]
-    finally:
-        conn.close()
 
 
 def update_conversation_rating(conversation_id: str, user_id: str, rating: int) -> bool:
     """Set conversation rating (1-5). Returns True if updated."""
     if not (1 <= rating <= 5):
         return False
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                UPDATE conversation
-                SET rating = %s, rated_at = now()
-                WHERE id = %s AND user_id = %s
-                """,
-                (rating, conversation_id.strip(), user_id.strip()),
-            )
-            conn.commit()
-            return cur.rowcount > 0
-    except Exception:
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+    with connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE conversation
+                    SET rating = %s, rated_at = now()
+                    WHERE id = %s AND user_id = %s
+                    """,
+                    (rating, conversation_id.strip(), user_id.strip()),
+                )
+                conn.commit()
+                return cur.rowcount > 0
+        except Exception:
+            conn.rollback()
+            return False
 
 
 # ---------------------------------------------------------------------------
@@ -284,8 +646,7 @@ def update_conversation_rating(conversation_id: str, user_id: str, rating: int)
 
 def get_message_with_conversation(message_id: str) -> Optional[dict]:
     """Return message row plus conversation user_id for ownership check."""
-    conn = get_connection()
-    try:
+    with connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
@@ -300,75 +661,57 @@ def get_message_with_conversation(message_id: str) -> Optional[dict]:
             )
             row = cur.fetchone()
             return dict(row) if row else None
-    finally:
-        conn.close()
-
-
-def get_latest_messages(conversation_id: str, limit: int = 2) -> List[dict]:
-    """Return the latest messages (newest last)."""
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT id::text, conversation_id::text, role, content, created_at::text,
-                       ambiguous, bot_trace, rating, rated_at::text
-                FROM message
-                WHERE conversation_id = %s
-                ORDER BY created_at DESC
-                LIMIT %s
-                """,
-                (conversation_id.strip(), limit),
-            )
-            rows = cur.fetchall()
-            # Oldest first for [user_msg, assistant_msg]
-            return [dict(r) for r in reversed(rows)]
-    finally:
-        conn.close()
 
 
-def list_messages(conversation_id: str, limit: int = 100) -> List[dict]:
-    """Return messages for a conversation, oldest first (id, conversation_id, role, content, created_at, ambiguous, bot_trace, rating, rated_at)."""
-    conn = get_connection()
-    try:
+def list_messages(
+    conversation_id: str,
+    limit: int = 100,
+    *,
+    before: Optional[Cursor] = None,
+    after: Optional[Cursor] = None,
+    newest_first: bool = False,
+) -> List[dict]:
+    """
+    Return a page of a conversation's messages, oldest first by default (id,
+    conversation_id, role, content, created_at, ambiguous, bot_trace, rating,
+    rated_at). Cursors work as in list_conversations.
+    """
+    conditions, params, order_by = _keyset("m", before, after, newest_first)
+    with connection() as conn:
         with conn.cursor() as cur:
             cur.execute(
-                """
+                f"""
                 SELECT id::text, conversation_id::text, role, content, created_at::text,
                        ambiguous, bot_trace, rating, rated_at::text
-                FROM message
-                WHERE conversation_id = %s
-                ORDER BY created_at ASC
+                FROM message m
+                WHERE m.conversation_id = %s{conditions}
+                ORDER BY {order_by}
                 LIMIT %s
                 """,
-                (conversation_id.strip(), limit),
+                (conversation_id.strip(), *params, limit),
             )
             return [dict(r) for r in cur.fetchall()]
-    finally:
-        conn.close()
 
 
 def update_message_rating(message_id: str, user_id: str, rating: int) -> bool:
     """Set message rating (1-5). Message must be assistant and in user's conversation."""
     if not (1 <= rating <= 5):
         return False
-    conn = get_connection()
-    try:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                UPDATE message m
-                SET rating = %s, rated_at = now()
-                FROM conversation c
-                WHERE m.conversation_id = c.id AND c.user_id = %s
-                  AND m.id = %s AND m.role = 'assistant'
-                """,
-                (rating, user_id.strip(), message_id.strip()),
-            )
-            conn.commit()
-            return cur.rowcount > 0
-    except Exception:
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+    with connection() as conn:
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    UPDATE message m
+                    SET rating = %s, rated_at = now()
+                    FROM conversation c
+                    WHERE m.conversation_id = c.id AND c.user_id = %s
+                      AND m.id = %s AND m.role = 'assistant'
+                    """,
+                    (rating, user_id.strip(), message_id.strip()),
+                )
+                conn.commit()
+                return cur.rowcount > 0
+        except Exception:
+            conn.rollback()
+            return False
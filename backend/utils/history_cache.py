@@ -0,0 +1,228 @@
+"""
+Per-conversation cache of rendered turn-history lines ("User: ...", "Assistant: ...").
+
+LoadHistoryNode used to read the last messages from Postgres on every turn although
+SaveMessageNode in the same process had just written the previous one. Now:
+
+- LoadHistoryNode asks ``get``; on a miss it loads from Postgres and ``put``s.
+- SaveMessageNode ``append``s the lines of the turn it inserted (write-through),
+  only to conversations already cached, so an entry is always a true suffix of the
+  conversation.
+- POST /conversations caches the new, empty conversation; GET /conversations/{id}
+  warms the entry in the background.
+- With rolling summaries (utils.conversation_summary) an entry also holds the
+  conversation summary and only the lines after it; a new summary drops the
+  lines it covers from the entry (``fold``) instead of invalidating it.
+
+Each entry keeps at most HISTORY_CACHE_LINES lines; HISTORY_CACHE_SIZE entries
+are kept, least recently used evicted first (0 disables the cache). Entries are
+dropped HISTORY_CACHE_TTL_SECONDS after they were loaded (reads do not extend
+that): with several workers, turns of one conversation served by another process
+are seen at most that late.
+
+A loader reads ``generation`` before its Postgres query and passes it to ``put``;
+every write to a conversation (even one that is not cached) bumps it, so a turn
+appended while the query ran is not overwritten by the older rows.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+from utils import db
+from utils.metrics import HISTORY_CACHE_LOOKUPS
+
+HISTORY_CACHE_SIZE = int(os.getenv("HISTORY_CACHE_SIZE", "1024"))
+HISTORY_CACHE_LINES = int(os.getenv("HISTORY_CACHE_LINES", "30"))
+HISTORY_CACHE_TTL_SECONDS = float(os.getenv("HISTORY_CACHE_TTL_SECONDS", "300"))
+
+
+class _Entry:
+    __slots__ = ("lines", "complete", "summary", "loaded")
+
+    def __init__(
+        self, lines: Iterable[str], max_lines: int, complete: bool, summary: Optional[str]
+    ):
+        self.lines: Deque[str] = deque(lines, maxlen=max_lines)
+        # True when ``lines`` is the whole conversation after ``summary`` (it had fewer
+        # lines than were loaded)
+        self.complete = complete
+        self.summary = summary
+        self.loaded = time.monotonic()
+
+
+class TurnHistoryCache:
+    """Thread-safe LRU of conversation_id -> last ``max_lines`` turn-history lines."""
+
+    def __init__(self, max_conversations: int, max_lines: int, ttl_seconds: float):
+        self.max_conversations = max(int(max_conversations), 0)
+        self.max_lines = max(int(max_lines), 1)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # conversation_id -> sequence number of its last write, for the most recently
+        # written conversations; older ones report the highest sequence forgotten
+        self._writes = 0
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._generation_floor = 0
+        self._max_generations = max(self.max_conversations * 4, 1)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_conversations > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry.loaded > self.ttl_seconds
+
+    def _live(self, conversation_id: str, now: float) -> Optional[_Entry]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+        if self._expired(entry, now):
+            del self._entries[conversation_id]
+            return None
+        self._entries.move_to_end(conversation_id)
+        return entry
+
+    def _written(self, conversation_id: str) -> None:
+        self._writes += 1
+        self._generations[conversation_id] = self._writes
+        self._generations.move_to_end(conversation_id)
+        while len(self._generations) > self._max_generations:
+            _, seq = self._generations.popitem(last=False)
+            self._generation_floor = max(self._generation_floor, seq)
+
+    def generation(self, conversation_id: str) -> int:
+        """Changes on every write to the conversation; read it before loading for ``put``."""
+        with self._lock:
+            return self._generations.get(conversation_id, self._generation_floor)
+
+    def get(
+        self, conversation_id: str, top_k: int
+    ) -> Optional[Tuple[Optional[str], List[str]]]:
+        """(summary, last ``top_k`` lines), or None if the cache cannot answer that exactly."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._live(conversation_id, time.monotonic())
+            found: Optional[Tuple[Optional[str], List[str]]] = None
+            if entry is not None and (entry.complete or len(entry.lines) >= top_k):
+                found = entry.summary, list(entry.lines)[-top_k:] if top_k > 0 else []
+        HISTORY_CACHE_LOOKUPS.labels(result="hit" if found is not None else "miss").inc()
+        return found
+
+    def put(
+        self,
+        conversation_id: str,
+        lines: List[str],
+        *,
+        complete: bool,
+        summary: Optional[str] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache the conversation's last lines (``complete``: these are all of them after
+        ``summary``). With ``generation`` (read before loading them) nothing is cached
+        if the conversation was written to since.
+        """
+        if not self.enabled:
+            return
+        complete = complete and len(lines) <= self.max_lines
+        with self._lock:
+            current = self._generations.get(conversation_id, self._generation_floor)
+            if generation is not None and generation != current:
+                return
+            self._written(conversation_id)
+            self._entries[conversation_id] = _Entry(
+                lines, self.max_lines, complete, summary
+            )
+            self._entries.move_to_end(conversation_id)
+            while len(self._entries) > self.max_conversations:
+                self._entries.popitem(last=False)
+
+    def append(self, conversation_id: str, lines: List[str]) -> bool:
+        """Append new lines to a cached conversation; False (nothing cached) otherwise."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._written(conversation_id)
+            entry = self._live(conversation_id, time.monotonic())
+            if entry is None:
+                return False
+            if len(entry.lines) + len(lines) > self.max_lines:
+                entry.complete = False
+            entry.lines.extend(lines)
+            return True
+
+    def backlog(self, conversation_id: str) -> Optional[int]:
+        """Number of lines after the summary if the cache holds all of them, else None."""
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry is None or not entry.complete:
+                return None
+            if self._expired(entry, time.monotonic()):
+                return None
+            return len(entry.lines)
+
+    def fold(
+        self,
+        conversation_id: str,
+        count: int,
+        summary: str,
+        *,
+        previous_summary: Optional[str],
+    ) -> None:
+        """
+        Record that the oldest ``count`` lines after ``previous_summary`` are now covered
+        by ``summary``. An entry loaded with another summary is left alone; one that
+        may not start at the previous summary is dropped.
+        """
+        with self._lock:
+            self._written(conversation_id)
+            entry = self._entries.get(conversation_id)
+            if entry is None or entry.summary != previous_summary:
+                return
+            if not entry.complete or len(entry.lines) < count:
+                del self._entries[conversation_id]
+                return
+            for _ in range(count):
+                entry.lines.popleft()
+            entry.summary = summary
+
+    def invalidate(self, conversation_id: str) -> None:
+        with self._lock:
+            self._written(conversation_id)
+            self._entries.pop(conversation_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._generation_floor = self._writes
+
+    def warm(self, conversation_id: str, *, with_summary: bool = False) -> None:
+        """Load the conversation's last lines (and summary) from Postgres unless they are cached."""
+        if not self.enabled or self.get(conversation_id, self.max_lines) is not None:
+            return
+        generation = self.generation(conversation_id)
+        if with_summary:
+            summary, messages = db.load_history(conversation_id, top_k=self.max_lines)
+        else:
+            summary, messages = None, db.load_messages(conversation_id, top_k=self.max_lines)
+        self.put(
+            conversation_id,
+            db.messages_to_turn_history(messages),
+            complete=len(messages) < self.max_lines,
+            summary=summary,
+            generation=generation,
+        )
+
+
+history_cache = TurnHistoryCache(
+    HISTORY_CACHE_SIZE, HISTORY_CACHE_LINES, HISTORY_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,72 @@
+"""
+Prometheus metrics for the behavior tree (served by api/app.py at /metrics).
+
+BaseNode records every node run (initialise -> terminate): wall time by node and
+outcome, and the LLM tokens the node used; the messages router records the whole
+turn. With several uvicorn workers each process keeps its own registry (scrape
+them individually or set up prometheus_client multiprocess mode).
+"""
+
+from typing import Dict
+
+from prometheus_client import (CONTENT_TYPE_LATEST, Counter, Histogram,
+                               generate_latest)
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+NODE_DURATION = Histogram(
+    "bt_node_duration_seconds",
+    "Wall time of one behavior tree node run (initialise to terminate)",
+    ["node", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+NODE_LLM_TOKENS = Histogram(
+    "bt_node_llm_tokens",
+    "LLM tokens used by one node run (runs without usage data, e.g. cached answers, are skipped)",
+    ["node", "kind"],
+    buckets=TOKEN_BUCKETS,
+)
+TURN_DURATION = Histogram(
+    "bt_turn_duration_seconds",
+    "Wall time of one conversation turn (tree tick, excluding the wait for a pooled tree)",
+    ["execution"],
+    buckets=LATENCY_BUCKETS,
+)
+AUTH_CACHE_LOOKUPS = Counter(
+    "auth_cache_lookups_total",
+    "User / conversation-ownership auth checks answered by utils.auth_cache (hit) or Postgres (miss)",
+    ["cache", "result"],
+)
+HISTORY_CACHE_LOOKUPS = Counter(
+    "history_cache_lookups_total",
+    "LoadHistory turn-history reads answered by utils.history_cache (hit) or Postgres (miss)",
+    ["result"],
+)
+EMBEDDING_CACHE_LOOKUPS = Counter(
+    "embedding_cache_lookups_total",
+    "Texts answered by clients.embedding_cache from memory (hit), its disk tier (disk_hit) or the embedder (miss)",
+    ["cache", "result"],
+)
+LLM_CACHE_LOOKUPS = Counter(
+    "llm_cache_lookups_total",
+    "Chat model prompts answered by clients.llm_cache (hit) or the LLM (miss), and responses stored",
+    ["result"],
+)
+
+
+def record_node(node: str, outcome: str, seconds: float, usage: Dict[str, int]) -> None:
+    NODE_DURATION.labels(node=node, outcome=outcome).observe(seconds)
+    for kind in ("input_tokens", "output_tokens"):
+        if kind in usage:
+            NODE_LLM_TOKENS.labels(node=node, kind=kind).observe(usage[kind])
+
+
+def render() -> bytes:
+    """Current metrics in the Prometheus text format (``CONTENT_TYPE``)."""
+    return generate_latest()
+
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
@@ -18,10 +18,14 @@ function formatConversationLabel(createdAt: string | null | undefined): string {
   }
 }
 
-/** Backend bot_trace entry: explainable { step, status } or legacy { node, status } */
+/**
+ * Backend bot_trace entry: explainable { step, status }, legacy { node, status }, or
+ * per-node timing { timing: { node, outcome, elapsed_ms, ... } } (not shown as a line)
+ */
 type BotTraceEntry =
   | { step: string; status?: string }
   | { node: string; status?: string }
+  | { timing: { node: string; outcome: string; elapsed_ms: number } }
 
 interface Message {
   id: string
@@ -34,6 +38,7 @@ interface Message {
 function formatTraceLines(trace: BotTraceEntry[] | null | undefined): string {
   if (!trace || !Array.isArray(trace) || trace.length === 0) return ''
   return trace
+    .filter((t) => !('timing' in t))
     .map((t) => {
       if ('step' in t && t.step) return t.step
       if ('node' in t && t.node) return t.node
@@ -42,6 +47,22 @@ function formatTraceLines(trace: BotTraceEntry[] | null | undefined): string {
     .join('\n')
 }
 
+/** Parse one Server-Sent Events block ("event: x\ndata: {...}") */
+function parseSseEvent(block: string): { event: string; data: unknown } | null {
+  let event = 'message'
+  const dataLines: string[] = []
+  for (const line of block.split('\n')) {
+    if (line.startsWith('event:')) event = line.slice(6).trim()
+    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim())
+  }
+  if (dataLines.length === 0) return null
+  try {
+    return { event, data: JSON.parse(dataLines.join('\n')) }
+  } catch {
+    return null
+  }
+}
+
 interface ChatScreenProps {
   apiBaseUrl: string
   token: string
@@ -81,6 +102,11 @@ export function ChatScreen({ apiBaseUrl, token, tokenType, onLogout }: ChatScree
   const [loadingConversations, setLoadingConversations] = useState(false)
   const [loadingMessages, setLoadingMessages] = useState(false)
   const [sending, setSending] = useState(false)
+  /** Live assistant reply while the streaming endpoint runs (trace steps + tokens) */
+  const [streamingReply, setStreamingReply] = useState<{
+    content: string
+    trace: BotTraceEntry[]
+  } | null>(null)
   const [error, setError] = useState<string | null>(null)
   const [conversationRating, setConversationRating] = useState<number | null>(null)
   /** Assistant message id whose reasoning trace is shown in the bottom-left panel */
@@ -187,20 +213,54 @@ export function ChatScreen({ apiBaseUrl, token, tokenType, onLogout }: ChatScree
     setNewMessage('')
     setError(null)
     setSending(true)
+    setStreamingReply({ content: '', trace: [] })
     try {
-      const response = await fetch(`${apiBaseUrl}/conversations/${selectedConversationId}/messages`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-          Authorization: authHeader,
+      const response = await fetch(
+        `${apiBaseUrl}/conversations/${selectedConversationId}/messages/stream`,
+        {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+            Accept: 'text/event-stream',
+            Authorization: authHeader,
+          },
+          body: JSON.stringify({ content }),
         },
-        body: JSON.stringify({ content }),
-      })
-      if (!response.ok) {
+      )
+      if (!response.ok || !response.body) {
         throw new Error('Failed to send message.')
       }
-      const data = await response.json()
-      const { user_message, assistant_message } = data
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      let result: { user_message: Message; assistant_message: Message } | null = null
+      for (;;) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        const blocks = buffer.split('\n\n')
+        buffer = blocks.pop() ?? ''
+        for (const block of blocks) {
+          const parsed = parseSseEvent(block)
+          if (!parsed) continue
+          if (parsed.event === 'trace') {
+            const step = parsed.data as BotTraceEntry
+            setStreamingReply((prev) => prev && { ...prev, trace: [...prev.trace, step] })
+          } else if (parsed.event === 'token') {
+            const text = String(parsed.data)
+            setStreamingReply((prev) => prev && { ...prev, content: prev.content + text })
+          } else if (parsed.event === 'message') {
+            result = parsed.data as { user_message: Message; assistant_message: Message }
+          } else if (parsed.event === 'error') {
+            const detail = (parsed.data as { detail?: string }).detail
+            throw new Error(detail || 'Failed to send message.')
+          }
+        }
+      }
+      if (!result) {
+        throw new Error('Failed to send message.')
+      }
+      const { user_message, assistant_message } = result
       setMessages((prev) => [
         ...prev.filter((m) => !m.id.startsWith('opt-')),
         user_message,
@@ -212,6 +272,7 @@ export function ChatScreen({ apiBaseUrl, token, tokenType, onLogout }: ChatScree
       setNewMessage(content)
     } finally {
       setSending(false)
+      setStreamingReply(null)
     }
   }
 
@@ -391,11 +452,20 @@ export function ChatScreen({ apiBaseUrl, token, tokenType, onLogout }: ChatScree
                     <div className="chat-message-meta">
                       <span className="chat-message-role">Assistant</span>
                     </div>
-                    <div className="chat-typing-dots">
-                      <span className="chat-typing-dot" />
-                      <span className="chat-typing-dot" />
-                      <span className="chat-typing-dot" />
-                    </div>
+                    {streamingReply?.content ? (
+                      <p className="chat-message-content">{streamingReply.content}</p>
+                    ) : (
+                      <div className="chat-typing-dots">
+                        <span className="chat-typing-dot" />
+                        <span className="chat-typing-dot" />
+                        <span className="chat-typing-dot" />
+                      </div>
+                    )}
+                    {streamingReply && streamingReply.trace.length > 0 && (
+                      <p className="chat-muted-small">
+                        {formatTraceLines(streamingReply.trace.slice(-1))}
+                      </p>
+                    )}
                   </div>
                 )}
               </div>